@@ -7,41 +7,15 @@ course data, adds year and semester, and writes out 'final_schedule.csv'.
 """
 
 import pandas as pd
-import re
 import sys
 import os
 from datetime import datetime, timedelta
 
-DEFAULT_PREREQ = "No restrictions, except that any prerequisites must already be completed"
+# make the repository root importable when run as a script from this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.course_classification import course_levels, course_types
 
-MAJOR_MAP = {
-    "BSN": "Nursing Program's core or track elective course",
-    "BUS": "Business Program's core or track elective course",
-    "CHSS": "General Education course",
-    "CS": "Computer Science Program's core or track elective course",
-    "DS": "Data Science Program's core or track elective course",
-    "CSE": "General Education course",
-    "EC": "English and Communications Program's core or track elective course",
-    "ECM": "ECM Program's core or track elective course",
-    "ECON": "Economics Program's core or track elective course",
-    "ENGS": "Engineering Sciences Program's core or track elective course",
-    "ENV": "Environmental and Sustainability Sciences Program's core or track elective course",
-    "ESS": "Environmental and Sustainability Sciences Program's core or track elective course",
-    "FND": "General Education course",
-    "HHM": "HHM Program's core or track elective course",
-    "HRSJ": "Human Rights and Social Justice Program's core or track elective course",
-    "IESM": "Industrial Engineering and Systems Management Program's core or track elective course",
-    "IRD": "International Relations and Diplomacy Program's core or track elective course",
-    "LAW": "Laws Program's core or track elective course",
-    "MGMT": "MGMT Program's core or track elective course",
-    "PA": "Public Affairs Program's core or track elective course",
-    "PEER": "Peer Mentoring course",
-    "PG": "Politics and Governance Program's core or track elective course",
-    "PH": "Public Health Program's core or track elective course",
-    "PSIA": "Political Science and International Affairs Program's core or track elective course",
-    "TEFL": "Teaching English as a Foreign Language Program's core or track elective course",
-    "CBE": "CBE Program's core or track elective course"
-}
+DEFAULT_PREREQ = "No restrictions, except that any prerequisites must already be completed"
 
 def get_school_year_and_semester():
     """
@@ -70,19 +44,6 @@ def get_school_year_and_semester():
 
     return school_year_str, sem_value
 
-def get_course_level(code: str) -> str:
-    m = re.search(r'(\d+)', str(code))
-    if not m:
-        return 'Unknown'
-    first_digit = m.group(1)[0]
-    return {'1': 'Lower level', '2': 'Upper level', '3': 'Masters level'}.get(first_digit, 'Unknown')
-
-def get_course_type(code: str) -> str:
-    m = re.match(r'^([A-Za-z]+)', str(code))
-    if not m:
-        return 'Unknown'
-    return MAJOR_MAP.get(m.group(1).upper(), 'Unknown')
-
 def main():
     input_csv = 'automated_scrape_jenzabar.csv'
     output_csv = 'final_schedule.csv'
@@ -111,8 +72,8 @@ def main():
     )
 
     # 4) Compute level & type
-    df['course_level'] = df['course_code'].apply(get_course_level)
-    df['course_type']  = df['course_code'].apply(get_course_type)
+    df['course_level'] = course_levels(df['course_code'])
+    df['course_type']  = course_types(df['course_code'])
 
     # 5) Populate 'prerequisites'
     col = 'prerequisites'
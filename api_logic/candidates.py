@@ -0,0 +1,125 @@
+# api_logic/candidates.py
+"""
+Pre-prompt candidate pruning.
+
+Drops catalog sections the student cannot or should not take before anything
+is serialized into a prompt or handed to the local engine:
+
+  - courses already on the transcript
+  - sections with unmet prerequisites
+  - courses outside the student's program prefixes (General Education and
+    theme courses are kept for undergraduates)
+  - sections at the wrong level (undergraduate vs. Masters)
+  - avoided instructors and explicitly excluded courses
+
+Courses the student asked for are kept even outside the program, but only
+if they pass the other checks; `blocked_requests` says why the rest can't be
+scheduled.
+"""
+
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+from api_logic.preferences import Preferences
+from api_logic.prompt_catalog import catalog_prompt
+from data.catalog import CourseCatalog, codes_in_text
+
+logger = logging.getLogger(__name__)
+
+UNDERGRAD_LEVELS = ("Lower level", "Upper level")
+GRAD_LEVELS = ("Masters level",)
+
+
+def _row_filters(catalog: CourseCatalog, completed: set[str], prefs: Preferences) -> tuple[np.ndarray, ...]:
+    """Per catalog row: (prerequisites met, right level, not taught by an avoided instructor)."""
+    df = catalog.df
+
+    # prerequisites: one bitset test per distinct course against the compiled DAG
+    graph = catalog.prereqs
+    done = graph.mask_of(completed)
+    eligible = np.array([graph.eligible(code, done) for code in catalog.course_codes], dtype=bool)
+
+    # level
+    if prefs.program:
+        levels = GRAD_LEVELS if prefs.is_graduate else UNDERGRAD_LEVELS
+    else:
+        levels = UNDERGRAD_LEVELS + GRAD_LEVELS
+    level_ok = df["course_level"].isin(levels).to_numpy()
+
+    # instructors
+    allowed = np.ones(len(df), dtype=bool)
+    if prefs.avoid_instructors:
+        pattern = "|".join(re.escape(n) for n in prefs.avoid_instructors)
+        allowed = ~df["instructor"].astype(str).str.contains(pattern, case=False, regex=True).to_numpy()
+
+    return eligible[catalog.course_ids], level_ok, allowed
+
+
+def candidate_mask(catalog: CourseCatalog, completed: set[str], prefs: Preferences,
+                   degree_requirements: str = "") -> np.ndarray:
+    """Boolean mask over catalog rows of the sections that survive pruning."""
+    df = catalog.df
+    codes = df["course_code"]
+    completed = set(completed)
+
+    open_rows = (~codes.isin(completed) & ~codes.isin(prefs.excluded_codes)).to_numpy()
+    eligible, level_ok, allowed = _row_filters(catalog, completed, prefs)
+    takeable = open_rows & eligible & level_ok & allowed
+    keep = takeable.copy()
+
+    # program / prefix
+    required = codes_in_text(degree_requirements)
+    prefixes = {re.match(r'[A-Z]+', c).group(0) for c in required}
+    if prefixes:
+        in_program = codes.str.extract(r'^([A-Z]+)', expand=False).isin(prefixes)
+        if not prefs.is_graduate:
+            in_program |= df["course_type"].eq("General Education course")
+            in_program |= ~df["themes"].eq("Not part of any theme")
+        keep &= (in_program | codes.isin(required)).to_numpy()
+
+    # requested courses survive the program filter, never the eligibility checks
+    # (those that fail them are reported by blocked_requests instead)
+    wanted = codes.isin(prefs.wanted_codes).to_numpy()
+    return keep | (wanted & takeable)
+
+
+def blocked_requests(catalog: CourseCatalog, completed: set[str], prefs: Preferences) -> dict[str, str]:
+    """Requested courses that can't be scheduled for this student → the reason, to tell them."""
+    completed = set(completed)
+    eligible, level_ok, allowed = _row_filters(catalog, completed, prefs)
+    blocked = {}
+    for code in sorted(prefs.wanted_codes - completed - prefs.excluded_codes):
+        rows = catalog.sections_of(code)
+        if not len(rows):
+            continue
+        if not eligible[rows].any():
+            blocked[code] = "prerequisites not completed"
+        elif not level_ok[rows].any():
+            blocked[code] = "not offered at your level"
+        elif not (level_ok & allowed)[rows].any():
+            blocked[code] = "only taught by instructors you asked to avoid"
+    return blocked
+
+
+def prune_catalog(catalog: CourseCatalog, completed: set[str], prefs: Preferences,
+                  degree_requirements: str = "") -> pd.DataFrame:
+    """The surviving candidate sections (a new frame; the catalog is untouched)."""
+    mask = candidate_mask(catalog, completed, prefs, degree_requirements)
+    survivors = catalog.df[mask]
+    logger.info("Pruned catalog %d → %d sections", len(catalog.df), len(survivors))
+    return survivors
+
+
+def candidates_text(catalog: CourseCatalog, completed: set[str], prefs: Preferences,
+                    degree_requirements: str = "") -> str:
+    """
+    Serialize only the surviving candidates for the prompt, in the compact
+    prompt format (api_logic.prompt_catalog); falls back to the whole
+    catalog if pruning leaves nothing.
+    """
+    survivors = prune_catalog(catalog, completed, prefs, degree_requirements)
+    rows = survivors.index if not survivors.empty else range(len(catalog.df))
+    return catalog_prompt(catalog, rows).text
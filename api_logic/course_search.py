@@ -0,0 +1,183 @@
+# api_logic/course_search.py
+"""
+In-process full-text search over the catalog.
+
+One BM25 document per course (all of its sections), built from the course
+title (counted twice, so title hits outrank passing mentions), description
+and themes. The inverted index is stored as CSR arrays (term → course IDs and
+term frequencies) and built once per catalog version; a query is a few numpy
+gathers, well under a millisecond.
+
+Used to resolve free-text answers such as "something on machine learning" to
+concrete course codes before anything is sent to Gemini.
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from data.catalog import CourseCatalog, codes_in_text
+from data.prerequisites import CODE_RE
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+MAX_MATCHES = 5
+MIN_RELATIVE_SCORE = 0.5   # keep hits scoring at least half of the best one
+MIN_SCORE = 3.0            # ... and at least this much (about one rare title word)
+MIN_TERM_COVERAGE = 0.5    # a hit must contain at least half of the query's terms
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset("""
+    a an and are as at be by course courses for from i in into is it of on or
+    something students the this to with about some any want like take taking
+    hoping would interested belongs theme themes part not maybe also
+    no none nothing nope thanks thank particular specific anything open really
+    sure yet else just all whatever preference preferences idea
+""".split())
+
+
+def _stem(token: str) -> str:
+    """Very light suffix stripping so "systems"/"system" and "learning"/"learn" meet."""
+    for suffix in ("ing", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4 and not token.endswith("ss"):
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall(str(text).lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    Attributes:
+        terms:    Term → term ID.
+        offsets:  CSR offsets; postings of term t are [offsets[t], offsets[t + 1]).
+        docs:     Course ID of each posting.
+        tf:       Term frequency of each posting.
+        doc_len:  Token count of each course document.
+        idf:      BM25 idf of each term.
+    """
+    terms: dict[str, int]
+    offsets: np.ndarray
+    docs: np.ndarray
+    tf: np.ndarray
+    doc_len: np.ndarray
+    idf: np.ndarray
+
+    @classmethod
+    def build(cls, catalog: CourseCatalog) -> "SearchIndex":
+        n_docs = len(catalog.course_codes)
+        seen_text: list[set[str]] = [set() for _ in range(n_docs)]
+        counts: list[dict[str, int]] = [{} for _ in range(n_docs)]
+        for sec in catalog.sections:
+            fields = ((sec.title, TITLE_WEIGHT),
+                      (catalog.df.at[sec.id, "course_description"], 1),
+                      (sec.themes, 1))
+            for text, weight in fields:
+                # sections of one course repeat the same texts; count each once
+                if not isinstance(text, str) or text in seen_text[sec.course_id]:
+                    continue
+                seen_text[sec.course_id].add(text)
+                doc = counts[sec.course_id]
+                for token in tokenize(text):
+                    doc[token] = doc.get(token, 0) + weight
+
+        terms: dict[str, int] = {}
+        postings: list[list[tuple[int, int]]] = []
+        for doc_id, doc in enumerate(counts):
+            for token, tf in doc.items():
+                tid = terms.setdefault(token, len(terms))
+                if tid == len(postings):
+                    postings.append([])
+                postings[tid].append((doc_id, tf))
+
+        offsets = np.zeros(len(terms) + 1, dtype=np.int32)
+        np.cumsum([len(p) for p in postings], out=offsets[1:])
+        docs = np.fromiter((d for p in postings for d, _ in p), dtype=np.int32, count=offsets[-1])
+        tf = np.fromiter((f for p in postings for _, f in p), dtype=np.float32, count=offsets[-1])
+        df_t = np.diff(offsets).astype(np.float64)
+        idf = np.log(1 + (n_docs - df_t + 0.5) / (df_t + 0.5)).astype(np.float32)
+        doc_len = np.array([sum(doc.values()) for doc in counts], dtype=np.float32)
+        return cls(terms=terms, offsets=offsets, docs=docs, tf=tf, doc_len=doc_len, idf=idf)
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every course for `query`. Courses containing fewer than
+        MIN_TERM_COVERAGE of the query's terms score zero, so a single generic
+        word ("relevant", "advanced") can't produce a match on its own.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        out = np.zeros(len(self.doc_len), dtype=np.float32)
+        matched = np.zeros(len(self.doc_len), dtype=np.int32)
+        avg_len = float(self.doc_len.mean()) if len(self.doc_len) else 1.0
+        for token in tokens:
+            tid = self.terms.get(token)
+            if tid is None:
+                continue
+            lo, hi = self.offsets[tid], self.offsets[tid + 1]
+            docs, tf = self.docs[lo:hi], self.tf[lo:hi]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[docs] / avg_len)
+            out[docs] += self.idf[tid] * tf * (BM25_K1 + 1) / (tf + norm)
+            matched[docs] += 1
+        out[matched < math.ceil(len(tokens) * MIN_TERM_COVERAGE)] = 0
+        return out
+
+    def search(self, query: str, k: int = MAX_MATCHES) -> list[tuple[int, float]]:
+        """Top-k (course ID, score) pairs with a positive score, best first."""
+        scores = self.scores(query)
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+_indexes: dict[str, SearchIndex] = {}
+_lock = threading.Lock()
+
+
+def get_search_index(catalog: CourseCatalog) -> SearchIndex:
+    """The search index for this catalog version (built on first use)."""
+    index = _indexes.get(catalog.version)
+    if index is None:
+        with _lock:
+            index = _indexes.get(catalog.version)
+            if index is None:
+                index = SearchIndex.build(catalog)
+                _indexes.clear()       # only the current catalog version is kept
+                _indexes[catalog.version] = index
+    return index
+
+
+def resolve_courses(catalog: CourseCatalog, text: str, k: int = MAX_MATCHES) -> list[str]:
+    """
+    Course codes a free-text answer refers to: codes named explicitly, then
+    the best BM25 matches (those scoring at least MIN_SCORE and at least
+    MIN_RELATIVE_SCORE of the top hit). An answer with no content words
+    ("No, thanks", "Open to anything") matches nothing.
+    """
+    text = str(text)
+    explicit = [c for c in sorted(codes_in_text(text.upper())) if c in catalog.code_ids]
+    hits = get_search_index(catalog).search(CODE_RE.sub(" ", text.upper()), k)
+    if not hits:
+        return explicit
+    floor = max(MIN_SCORE, hits[0][1] * MIN_RELATIVE_SCORE)
+    matched = [catalog.course_codes[cid] for cid, score in hits if score >= floor]
+    return list(dict.fromkeys(explicit + matched))
+
+
+def describe_courses(catalog: CourseCatalog, codes) -> str:
+    """'CS340 Machine Learning, BUS265 International Marketing' for the prompt."""
+    out = []
+    for code in codes:
+        rows = catalog.sections_of(code)
+        if len(rows):
+            out.append(f"{code} {str(catalog.sections[rows[0]].title).title()}")
+    return ", ".join(out)
@@ -0,0 +1,281 @@
+# api_logic/degree_audit.py
+"""
+Degree audit: which requirement groups a transcript already satisfies and
+which courses / GE clusters are still outstanding.
+
+A program's requirement tree (data.requirements) is compiled once per
+(program, catalog version): every course code is interned to a bit, each
+course option ("CS 100" or "BUS 109 or CS 100") becomes an int mask, and
+course titles listed without a code are resolved to codes through the
+catalog. Auditing a transcript is then a handful of AND / popcount
+operations, memoized by (program, catalog version, transcript hash).
+
+GE clusters are derived from the catalog's theme numbers (themes 1-3 are
+Arts & Humanities, 4-6 Social Sciences, 7-9 Quantitative Sciences). The
+"same theme" / "one upper division" cluster rules are not checked; a
+cluster group counts any completed course in the cluster.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from data.catalog import CourseCatalog, canonical_code
+from data.requirements import Program, RequirementGroup
+
+AUDIT_CACHE_SIZE = 256
+COMPILED_CACHE_SIZE = 64
+THEME_CLUSTERS = {
+    1: "GE-AH", 2: "GE-AH", 3: "GE-AH",
+    4: "GE-SS", 5: "GE-SS", 6: "GE-SS",
+    7: "GE-QS", 8: "GE-QS", 9: "GE-QS",
+}
+
+
+_compiled: OrderedDict[tuple, object] = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def _memo(key: tuple, build):
+    """Per-process memo for compiled programs and catalog lookups (keyed by catalog version)."""
+    with _compiled_lock:
+        if key in _compiled:
+            _compiled.move_to_end(key)
+            return _compiled[key]
+    value = build()
+    with _compiled_lock:
+        _compiled[key] = value
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return value
+
+
+@dataclass(frozen=True)
+class GroupAudit:
+    """
+    Attributes:
+        path:      Group name with its parents, e.g. "CS Tracks › Track Requirements".
+        required:  Courses the group asks for.
+        completed: Completed codes counted towards the group.
+        remaining: Options still open, each a tuple of interchangeable codes.
+        clusters:  Cluster rules that can fill the group, e.g. ("GE-QS",).
+        titles:    Listed course titles that could not be resolved to a code.
+    """
+    path: str
+    required: int
+    completed: tuple[str, ...]
+    remaining: tuple[tuple[str, ...], ...]
+    clusters: tuple[str, ...]
+    titles: tuple[str, ...]
+
+    @property
+    def outstanding(self) -> int:
+        return max(self.required - len(self.completed), 0)
+
+    @property
+    def satisfied(self) -> bool:
+        return self.outstanding == 0
+
+
+@dataclass(frozen=True)
+class DegreeAudit:
+    program_id: str
+    groups: tuple[GroupAudit, ...]
+
+    @property
+    def open_groups(self) -> list[GroupAudit]:
+        return [g for g in self.groups if not g.satisfied]
+
+    @property
+    def remaining_codes(self) -> set[str]:
+        """Every code that would still count towards an unsatisfied group."""
+        return {code for g in self.open_groups for option in g.remaining for code in option}
+
+    @property
+    def remaining_clusters(self) -> set[str]:
+        return {c for g in self.open_groups for c in g.clusters}
+
+    def summary(self) -> str:
+        """Plain-text progress report for the prompt."""
+        lines = []
+        for g in self.groups:
+            done = ", ".join(g.completed) or "none"
+            if g.satisfied:
+                lines.append(f"- {g.path}: satisfied ({done})")
+                continue
+            still = [" or ".join(option) for option in g.remaining]
+            still += [f"any {c} course" for c in g.clusters]
+            still += list(g.titles)
+            lines.append(
+                f"- {g.path}: {g.outstanding} of {g.required} still needed "
+                f"(done: {done}; options: {', '.join(still) or 'any course'})"
+            )
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class _CompiledGroup:
+    path: str
+    required: int
+    option_masks: tuple[int, ...]
+    option_codes: tuple[tuple[str, ...], ...]
+    clusters: tuple[str, ...]
+    titles: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _CompiledProgram:
+    ids: dict[str, int]
+    groups: tuple[_CompiledGroup, ...]
+
+
+def _themes(text: str) -> set[int]:
+    return {int(n) for n in re.findall(r'\d+', str(text))}
+
+
+def _clusters_by_code(catalog: CourseCatalog) -> dict[str, frozenset[str]]:
+    clusters = {}
+    for code, first in zip(catalog.course_codes, catalog.course_rows[catalog.course_index[:-1]]):
+        themes = _themes(catalog.sections[first].themes)
+        found = frozenset(THEME_CLUSTERS[t] for t in themes if t in THEME_CLUSTERS)
+        if found:
+            clusters[code] = found
+    return clusters
+
+
+def course_clusters(catalog: CourseCatalog) -> dict[str, frozenset[str]]:
+    """Catalog course code → GE clusters its themes belong to."""
+    return _memo(("clusters", catalog.version), lambda: _clusters_by_code(catalog))
+
+
+def _codes_by_title(catalog: CourseCatalog) -> dict[str, tuple[str, ...]]:
+    titles: dict[str, tuple[str, ...]] = {}
+    for sec in catalog.sections:
+        key = str(sec.title).upper()
+        if sec.code not in titles.get(key, ()):
+            titles[key] = titles.get(key, ()) + (sec.code,)
+    return titles
+
+
+def _leaves(groups: list[RequirementGroup], parents: tuple[str, ...] = ()):
+    for g in groups:
+        path = parents + (g.name,)
+        if g.has_content:
+            yield " › ".join(path), g
+        yield from _leaves(g.children, path)
+
+
+def _compile(program: Program, catalog: CourseCatalog) -> _CompiledProgram:
+    by_title = _memo(("titles", catalog.version), lambda: _codes_by_title(catalog))
+    ids: dict[str, int] = {}
+
+    def mask(codes) -> int:
+        m = 0
+        for code in codes:
+            m |= 1 << ids.setdefault(code, len(ids))
+        return m
+
+    groups = []
+    for path, g in _leaves(program.groups):
+        options = [tuple(canonical_code(c) for c in option) for option in g.courses]
+        unresolved = []
+        for title in g.titles:
+            codes = by_title.get(title.upper())
+            if codes:
+                options.append(codes)
+            else:
+                unresolved.append(title)
+        options = list(dict.fromkeys(options))
+        if g.count is not None:
+            required = g.count
+        elif options and not g.clusters:
+            required = len(options)
+        else:
+            required = 1
+        groups.append(_CompiledGroup(
+            path=path,
+            required=required,
+            option_masks=tuple(mask(o) for o in options),
+            option_codes=tuple(options),
+            clusters=tuple(g.clusters),
+            titles=tuple(unresolved),
+        ))
+    return _CompiledProgram(ids=ids, groups=tuple(groups))
+
+
+def transcript_hash(completed_codes) -> str:
+    """Order-independent fingerprint of a set of completed course codes."""
+    return hashlib.sha1("\n".join(sorted(completed_codes)).encode()).hexdigest()
+
+
+_cache: OrderedDict[tuple[str, str, str], DegreeAudit] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _audit(compiled: _CompiledProgram, program_id: str, completed: set[str],
+           clusters_of: dict[str, frozenset[str]]) -> DegreeAudit:
+    done = 0
+    for code in completed:
+        bit = compiled.ids.get(code)
+        if bit is not None:
+            done |= 1 << bit
+
+    # courses named explicitly by the program are not reused for cluster groups
+    spare = sorted(c for c in completed if c not in compiled.ids and c in clusters_of)
+    used: set[str] = set()
+
+    groups = []
+    for g in compiled.groups:
+        finished, remaining = [], []
+        for m, codes in zip(g.option_masks, g.option_codes):
+            if m & done:
+                finished.append(next(c for c in codes if c in completed))
+            else:
+                remaining.append(codes)
+        for code in spare:
+            if len(finished) >= g.required:
+                break
+            if code not in used and clusters_of[code] & set(g.clusters):
+                finished.append(code)
+                used.add(code)
+        groups.append(GroupAudit(
+            path=g.path,
+            required=g.required,
+            completed=tuple(finished),
+            remaining=tuple(remaining),
+            clusters=g.clusters,
+            titles=g.titles,
+        ))
+    return DegreeAudit(program_id=program_id, groups=tuple(groups))
+
+
+def degree_audit(program: Program, completed_codes, catalog: CourseCatalog) -> DegreeAudit:
+    """
+    Audit a program against a transcript.
+
+    Args:
+        program:         Compiled program from the requirements index.
+        completed_codes: Course codes already taken (any spacing / case).
+        catalog:         Shared catalog snapshot (titles and GE themes).
+
+    Returns:
+        The per-group audit; repeated calls for the same program, catalog and
+        transcript return the memoized result.
+    """
+    completed = {canonical_code(c) for c in completed_codes}
+    key = (program.id, catalog.version, transcript_hash(completed))
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+
+    compiled = _memo(("program", program.id, catalog.version), lambda: _compile(program, catalog))
+    result = _audit(compiled, program.id, completed, course_clusters(catalog))
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > AUDIT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
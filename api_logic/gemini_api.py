@@ -1,49 +1,636 @@
 # api_logic/gemini_api.py
+"""
+Gemini REST client.
 
+Every call goes through one process-wide `GeminiClient` (see `get_client`),
+shared by all Streamlit sessions. It keeps a pooled keep-alive
+`requests.Session`, so DNS, TCP and TLS setup is paid once per pooled
+connection instead of once per call.
+
+Configuration (environment / .env):
+    GEMINI_API_KEY          API key (required)
+    GEMINI_BASE_URL         models endpoint, default BASE
+    GEMINI_MODEL            default model, default DEFAULT_MODEL
+    GEMINI_POOL_SIZE        keep-alive connections kept in the pool
+    GEMINI_CONNECT_TIMEOUT  seconds to establish a connection
+    GEMINI_RETRIES          retries on connection errors / 429 / 5xx
+    GEMINI_HEDGE            0 disables hedged requests
+    GEMINI_BREAKER_FAILURES consecutive failures that open the circuit breaker
+    GEMINI_BREAKER_RESET    seconds the breaker stays open before a trial call
+
+Each call records how long was spent opening a connection (zero when a pooled
+one is reused) separately from the generation time (request sent → response
+read); per-call metrics are logged and running totals are in `client.stats`.
+
+Successful answers are cached by (model, prompt hash), see
+api_logic.response_cache; a repeated prompt never reaches the network.
+
+`stream_with_gemini` / `GeminiClient.stream` use streamGenerateContent with
+server-sent events and yield text as it is generated, so the first words
+reach the page after about a second instead of after the whole answer. For a
+local end-to-end run without an API key, start api_logic.mock_gemini and set
+GEMINI_BASE_URL to its address.
+
+Resilience: failures raise `GeminiError` (never an error string that could
+end up saved as a schedule).
+  - 429/5xx answers and connection errors are retried with jittered
+    exponential backoff (full jitter; Retry-After is honoured), all within
+    one overall deadline per call
+  - once enough latencies have been observed, a call still unanswered after
+    the p95 latency gets a hedged second request; the first answer wins
+  - a circuit breaker opens after consecutive failures and fails fast
+    (`CircuitOpenError`) until a trial call succeeds
+api_logic.mock_gemini can inject errors and slow answers to exercise this.
+"""
+
+import json
+import logging
 import os
+import random
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from api_logic.response_cache import ResponseCache, cache_from_env, cache_key
 
 load_dotenv()
 API_KEY = os.getenv("GEMINI_API_KEY")
 BASE = "https://generativelanguage.googleapis.com/v1beta/models"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 10.0
+RETRIES = 2
+TRANSCRIPT_TIMEOUT = 60.0
+PROMPT_TIMEOUT = 90.0
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.5          # seconds; attempt n sleeps uniform(0, min(cap, base * 2**n))
+BACKOFF_CAP = 8.0
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20      # latencies needed before hedging starts
+HEDGE_MIN_DELAY = 1.0       # never hedge sooner than this
+LATENCY_WINDOW = 200        # recent successful latencies kept for the quantile
+BREAKER_FAILURES = 5
+BREAKER_RESET = 30.0
+
+logger = logging.getLogger(__name__)
+
+# seconds spent in connect() by the current thread since the last reset
+_connect_time = threading.local()
+
+
+def _timed_connect(connect):
+    def wrapper(self):
+        t0 = time.perf_counter()
+        try:
+            return connect(self)
+        finally:
+            _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + time.perf_counter() - t0
+            _connect_time.count = getattr(_connect_time, "count", 0) + 1
+    return wrapper
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    connect = _timed_connect(HTTPConnection.connect)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    connect = _timed_connect(HTTPSConnection.connect)
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report their connect() time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPPool, "https": _TimedHTTPSPool}
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Parse a server-sent-event stream (one text line per item) into the JSON
+    payloads of its events. Multi-line `data:` fields are joined; comments and
+    other fields are ignored.
+    """
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        if name == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield json.loads("\n".join(data))
+
+
+def _event_text(event: dict) -> str:
+    """Text of the first candidate in one generateContent (stream) response."""
+    candidates = event.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(p.get("text", "") for p in parts)
+
+
+class GeminiError(Exception):
+    """
+    A Gemini call that produced no answer.
+
+    Attributes:
+        status:       HTTP status, or 0 when no response arrived.
+        message:      Error detail.
+        retryable:    Whether trying again later may succeed (429, 5xx, network).
+        retry_after:  Server-suggested wait in seconds, if any.
+    """
+
+    def __init__(self, status: int, message: str, retryable: bool = False, retry_after: float | None = None):
+        super().__init__(f"Gemini Error ({status}): {message}")
+        self.status = status
+        self.message = message
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(GeminiError):
+    """The circuit breaker is open: Gemini has been failing, so the call was not sent."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(0, f"Gemini is temporarily unavailable, retry in {retry_in:.0f}s", retryable=True,
+                         retry_after=retry_in)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed → open after `failures` retryable failures in a row; open → half-open
+    after `reset` seconds, when a single trial call is let through; its success
+    closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, reset: float = BREAKER_RESET):
+        self.failures = failures
+        self.reset = reset
+        self._consecutive = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset else "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset or self._trial:
+                raise CircuitOpenError(max(self.reset - waited, 1.0))
+            self._trial = True
+
+    def success(self) -> None:
+        with self._lock:
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial = False
+
+    def failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self._trial or self._consecutive >= self.failures:
+                if self._opened_at is None or self._trial:
+                    logger.warning("Gemini circuit breaker open after %d failures", self._consecutive)
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class LatencyTracker:
+    """Recent successful call latencies, for the hedging threshold."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """The q-quantile of recent latencies; None until HEDGE_MIN_SAMPLES are known."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class CallMetrics:
+    """Timings of one HTTP request to Gemini, in seconds."""
+    model: str
+    status: int
+    connect_s: float        # DNS + TCP + TLS for new connections; 0 on a reused one
+    generation_s: float     # request sent → response body read, minus connect time
+    new_connections: int
+    first_token_s: float | None = None      # request sent → first streamed text (streaming only)
+
+    @property
+    def total_s(self) -> float:
+        return self.connect_s + self.generation_s
+
+
+@dataclass
+class ClientStats:
+    """Running totals over every request made by a client."""
+    calls: int = 0
+    errors: int = 0
+    new_connections: int = 0
+    connect_s: float = 0.0
+    generation_s: float = 0.0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    rejected: int = 0           # calls failed fast by the open circuit breaker
+    last: CallMetrics | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, m: CallMetrics) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += m.status != 200
+            self.new_connections += m.new_connections
+            self.connect_s += m.connect_s
+            self.generation_s += m.generation_s
+            self.last = m
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def summary(self) -> dict:
+        with self._lock:
+            calls = max(self.calls, 1)
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "new_connections": self.new_connections,
+                "avg_connect_ms": round(self.connect_s / calls * 1000, 1),
+                "avg_generation_ms": round(self.generation_s / calls * 1000, 1),
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "rejected": self.rejected,
+            }
+
+
+class GeminiClient:
+    """
+    Pooled, resilient Gemini client; thread-safe, meant to be shared (see `get_client`).
+
+    Args:
+        api_key:          Gemini API key.
+        base_url:         Models endpoint.
+        model:            Default model for `generate`.
+        pool_size:        Keep-alive connections kept in the pool.
+        connect_timeout:  Seconds to establish a connection.
+        retries:          Retries on connection errors and 429/5xx answers.
+        cache:            Response cache; None disables caching.
+        hedge:            Send a hedged request when a call exceeds the p95 latency.
+        breaker:          Circuit breaker; a default one if None.
+    """
+
+    def __init__(self, api_key: str | None = API_KEY, base_url: str = BASE, model: str = DEFAULT_MODEL,
+                 pool_size: int = POOL_SIZE, connect_timeout: float = CONNECT_TIMEOUT, retries: int = RETRIES,
+                 cache: ResponseCache | None = None, hedge: bool = True, breaker: CircuitBreaker | None = None):
+        self.api_key = api_key
+        self.cache = cache
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.hedge = hedge
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.stats = ClientStats()
+        # hedged requests run here; twice the pool so a hedge never waits for a worker
+        self._executor = ThreadPoolExecutor(max_workers=2 * pool_size, thread_name_prefix="gemini")
+
+        # retries are done by _call (backoff, deadline, breaker), not by urllib3
+        adapter = _TimedAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0, pool_block=False)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _lookup(self, model: str, prompt: str, config: dict | None,
+                use_cache: bool) -> tuple[str | None, str | None]:
+        """(cache key or None when not caching, cached answer or None)."""
+        if not use_cache or self.cache is None:
+            return None, None
+        key = cache_key(model, prompt, json.dumps(config, sort_keys=True)) if config else cache_key(model, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Gemini %s → cache hit", model)
+        return key, cached
+
+    def _record(self, model: str, status: int, elapsed: float, first_token_s: float | None = None) -> None:
+        connect_s = _connect_time.seconds
+        metrics = CallMetrics(model=model, status=status, connect_s=connect_s,
+                              generation_s=max(elapsed - connect_s, 0.0), new_connections=_connect_time.count,
+                              first_token_s=first_token_s)
+        self.stats.record(metrics)
+        logger.info("Gemini %s → %s: connect %.0f ms (%d new), %sgeneration %.0f ms",
+                    model, status or "no response", metrics.connect_s * 1000, metrics.new_connections,
+                    f"first token {first_token_s * 1000:.0f} ms, " if first_token_s is not None else "",
+                    metrics.generation_s * 1000)
+
+    def _attempt(self, model: str, prompt: str, config: dict | None, timeout: float,
+                 stream: bool = False) -> requests.Response:
+        """
+        One HTTP request. Returns the 200 response (body already read unless
+        streaming) or raises GeminiError.
+        """
+        method = "streamGenerateContent" if stream else "generateContent"
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        if config:
+            payload["generationConfig"] = config
+
+        _connect_time.seconds, _connect_time.count = 0.0, 0
+        t0 = time.perf_counter()
+        try:
+            resp = self.session.post(f"{self.base_url}/{model}:{method}", json=payload,
+                                     headers={"x-goog-api-key": self.api_key},
+                                     params={"alt": "sse"} if stream else None,
+                                     timeout=(min(self.connect_timeout, timeout), timeout), stream=stream)
+        except requests.RequestException as exc:
+            self._record(model, 0, time.perf_counter() - t0)
+            raise GeminiError(0, str(exc), retryable=True) from exc
+        elapsed = time.perf_counter() - t0
+
+        if resp.status_code != 200:
+            self._record(model, resp.status_code, elapsed)
+            raise GeminiError(resp.status_code, resp.text, retryable=resp.status_code in RETRYABLE_STATUS,
+                              retry_after=_retry_after(resp))
+        if not stream:
+            self._record(model, 200, elapsed)
+            self.latency.add(elapsed)
+        return resp
+
+    def _hedged(self, model: str, prompt: str, config: dict | None, end: float) -> requests.Response:
+        """
+        One attempt, plus a hedged duplicate if it is still unanswered after
+        the p95 latency; the first successful response wins.
+        """
+        left = end - time.monotonic()
+        threshold = self.latency.quantile(HEDGE_QUANTILE) if self.hedge else None
+        if threshold is None or max(threshold, HEDGE_MIN_DELAY) >= left:
+            return self._attempt(model, prompt, config, left)
+
+        primary = self._executor.submit(self._attempt, model, prompt, config, left)
+        done, _ = wait([primary], timeout=max(threshold, HEDGE_MIN_DELAY))
+        if done or self.breaker.state != "closed":
+            try:
+                return primary.result(timeout=max(end - time.monotonic(), 0))
+            except FuturesTimeout:
+                raise GeminiError(0, "no answer before the deadline", retryable=True) from None
+
+        self.stats.count("hedges")
+        logger.info("Gemini %s: no answer after p95 (%.1fs), sending a hedged request", model, threshold)
+        hedge = self._executor.submit(self._attempt, model, prompt, config, end - time.monotonic())
+        pending, error = {primary, hedge}, None
+        while pending:
+            done, pending = wait(pending, timeout=max(end - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    resp = future.result()
+                except GeminiError as exc:
+                    error = exc
+                    continue
+                if future is hedge:
+                    self.stats.count("hedge_wins")
+                return resp
+        raise error or GeminiError(0, "no answer before the deadline", retryable=True)
+
+    def _call(self, model: str, prompt: str, config: dict | None, deadline: float,
+              stream: bool = False) -> requests.Response:
+        """
+        Send with retries (jittered exponential backoff on retryable errors),
+        hedging and the circuit breaker, all within `deadline` seconds.
+        """
+        end = time.monotonic() + deadline
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self.stats.count("rejected")
+                raise
+            if end - time.monotonic() <= 0:
+                raise GeminiError(0, f"no answer within {deadline:.0f}s", retryable=True)
+            try:
+                if stream:
+                    resp = self._attempt(model, prompt, config, end - time.monotonic(), stream=True)
+                else:
+                    resp = self._hedged(model, prompt, config, end)
+            except GeminiError as exc:
+                if exc.retryable:
+                    self.breaker.failure()
+                else:
+                    self.breaker.success()      # the service answered; the request was at fault
+                delay = exc.retry_after if exc.retry_after is not None else backoff_delay(attempt)
+                if not exc.retryable or attempt >= self.retries or time.monotonic() + delay >= end:
+                    raise
+                attempt += 1
+                self.stats.count("retries")
+                logger.info("Gemini %s: %s, retry %d in %.2fs", model, exc, attempt, delay)
+                time.sleep(delay)
+                continue
+            self.breaker.success()
+            return resp
+
+    def generate(self, prompt: str, timeout: float = PROMPT_TIMEOUT, model: str | None = None,
+                 config: dict | None = None, use_cache: bool = True) -> str:
+        """
+        Send one text prompt and return the first candidate's text.
+
+        Args:
+            prompt:     Prompt text.
+            timeout:    Overall deadline in seconds, retries and hedges included.
+            model:      Model name; defaults to the client's model.
+            config:     generationConfig (temperature, seed, …); part of the cache key.
+            use_cache:  Look the prompt up in (and store the answer into) the cache.
+
+        Raises:
+            GeminiError: no answer (CircuitOpenError when failing fast).
+        """
+        model = model or self.model
+        key, cached = self._lookup(model, prompt, config, use_cache)
+        if cached is not None:
+            return cached
+        if not self.configured:
+            raise GeminiError(0, "Gemini API key not configured")
+
+        resp = self._call(model, prompt, config, timeout)
+        text = _event_text(resp.json()).strip()
+        if not text:
+            raise GeminiError(200, "Gemini returned no candidates.")
+        if key is not None:
+            self.cache.put(key, model, text)
+        return text
+
+    def stream(self, prompt: str, timeout: float = PROMPT_TIMEOUT, model: str | None = None,
+               config: dict | None = None, use_cache: bool = True) -> Iterator[str]:
+        """
+        Like `generate`, but yields the answer text as it is generated
+        (streamGenerateContent over server-sent events).
+
+        Retries, backoff and the circuit breaker apply until the stream opens;
+        streams are not hedged. `timeout` is the overall deadline. A cached
+        answer is yielded in one piece, and only a completely received answer
+        is stored in the cache.
+
+        Raises:
+            GeminiError: no answer, or the stream broke off.
+        """
+        model = model or self.model
+        key, cached = self._lookup(model, prompt, config, use_cache)
+        if cached is not None:
+            yield cached
+            return
+        if not self.configured:
+            raise GeminiError(0, "Gemini API key not configured")
+
+        t0 = time.perf_counter()
+        end = time.monotonic() + timeout
+        resp = self._call(model, prompt, config, timeout, stream=True)
+        chunks, first_token_s = [], None
+        try:
+            # text/event-stream is UTF-8 (it carries no charset, and requests would assume ISO-8859-1)
+            resp.encoding = "utf-8"
+            with resp:
+                for event in iter_sse(resp.iter_lines(chunk_size=None, decode_unicode=True)):
+                    text = _event_text(event)
+                    if not text:
+                        continue
+                    if first_token_s is None:
+                        first_token_s = time.perf_counter() - t0
+                    chunks.append(text)
+                    yield text
+                    if time.monotonic() > end:
+                        raise GeminiError(0, f"answer not finished within {timeout:.0f}s", retryable=True)
+        except (requests.RequestException, GeminiError) as exc:
+            # a broken or too slow stream counts as a failed call (latency log, breaker)
+            self._record(model, 0, time.perf_counter() - t0, first_token_s)
+            self.breaker.failure()
+            if isinstance(exc, GeminiError):
+                raise
+            raise GeminiError(0, f"stream interrupted: {exc}", retryable=True) from exc
+
+        self._record(model, 200, time.perf_counter() - t0, first_token_s)
+        if not chunks:
+            raise GeminiError(200, "Gemini returned no candidates.")
+        if key is not None:
+            self.cache.put(key, model, "".join(chunks).strip())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_client: GeminiClient | None = None
+_lock = threading.Lock()
+
+
+def get_client() -> GeminiClient:
+    """The process-wide client, configured from the environment on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = GeminiClient(
+                    api_key=API_KEY,
+                    base_url=os.getenv("GEMINI_BASE_URL", BASE),
+                    model=os.getenv("GEMINI_MODEL", DEFAULT_MODEL),
+                    pool_size=int(os.getenv("GEMINI_POOL_SIZE", POOL_SIZE)),
+                    connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", CONNECT_TIMEOUT)),
+                    retries=int(os.getenv("GEMINI_RETRIES", RETRIES)),
+                    cache=cache_from_env(),
+                    hedge=os.getenv("GEMINI_HEDGE", "1") != "0",
+                    breaker=CircuitBreaker(
+                        failures=int(os.getenv("GEMINI_BREAKER_FAILURES", BREAKER_FAILURES)),
+                        reset=float(os.getenv("GEMINI_BREAKER_RESET", BREAKER_RESET)),
+                    ),
+                )
+    return _client
 
 
 def process_pdf_with_gemini(pdf_text: str) -> str:
     """
     Extract a numbered list of courses from the transcript text using Gemini Flash.
+    Falls back to the raw text when Gemini is unavailable.
     """
-    if not API_KEY:
+    client = get_client()
+    if not client.configured:
         return pdf_text
 
-    url = f"{BASE}/gemini-2.0-flash:generateContent?key={API_KEY}"
     prompt = (
         "Extract a numbered list of course codes and names from the following transcript text. "
         "Respond with only the list (no additional sentences or headings):\n\n"
         f"{pdf_text}"
     )
-    payload = {
-        "contents": [
-            {
-                "parts": [
-                    {"text": prompt}
-                ]
-            }
-        ]
-    }
-    headers = {"Content-Type": "application/json"}
-
-    resp = requests.post(url, headers=headers, json=payload, timeout=60)
-    if resp.status_code != 200:
-        # return the raw error for debugging
-        return f"Gemini Error ({resp.status_code}): {resp.text}"
-
-    data = resp.json().get("candidates", [])
-    if not data:
-        return "Gemini returned no candidates."
-
-    raw = data[0]["content"]["parts"][0]["text"]
+    try:
+        raw = client.generate(prompt, timeout=TRANSCRIPT_TIMEOUT)
+    except GeminiError as exc:
+        logger.warning("Transcript extraction failed, keeping the raw text: %s", exc)
+        return pdf_text
 
     # drop everything before "1."
     lines = raw.splitlines()
@@ -54,31 +641,23 @@ def process_pdf_with_gemini(pdf_text: str) -> str:
     return raw.strip()
 
 
-def process_with_gemini(prompt: str) -> str:
+def process_with_gemini(prompt: str, config: dict | None = None) -> str:
     """
-    Send a prompt to Gemini Flash to get a text answer.
+    Send a prompt to Gemini Flash to get a text answer (`config` is an
+    optional generationConfig, e.g. JSON mode).
+
+    Raises:
+        GeminiError: no answer.
     """
-    if not API_KEY:
-        return "Error: Gemini API key not configured"
-
-    url = f"{BASE}/gemini-2.0-flash:generateContent?key={API_KEY}"
-    payload = {
-        "contents": [
-            {
-                "parts": [
-                    {"text": prompt}
-                ]
-            }
-        ]
-    }
-    headers = {"Content-Type": "application/json"}
+    return get_client().generate(prompt, timeout=PROMPT_TIMEOUT, config=config)
 
-    resp = requests.post(url, headers=headers, json=payload, timeout=90)
-    if resp.status_code != 200:
-        return f"Gemini Error ({resp.status_code}): {resp.text}"
 
-    data = resp.json().get("candidates", [])
-    if not data:
-        return "Gemini returned no candidates."
+def stream_with_gemini(prompt: str, config: dict | None = None) -> Iterator[str]:
+    """
+    Send a prompt to Gemini Flash and yield the answer as it is generated
+    (for `st.write_stream`).
 
-    return data[0]["content"]["parts"][0]["text"].strip()
+    Raises:
+        GeminiError: no answer, or the stream broke off.
+    """
+    yield from get_client().stream(prompt, timeout=PROMPT_TIMEOUT, config=config)
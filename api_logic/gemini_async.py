@@ -0,0 +1,132 @@
+# api_logic/gemini_async.py
+"""
+Concurrent multi-candidate generation.
+
+`AsyncGeminiClient` fires several prompts at once (different temperatures,
+seeds or preference emphases) and gathers them under one deadline, so N
+alternatives cost about the wall-clock time of the slowest one instead of N
+sequential calls.
+
+Calls run on worker threads over the shared pooled `GeminiClient`, so they
+reuse its keep-alive connections, retries, metrics and response cache.
+Concurrency is bounded by a semaphore (at most `max_concurrency` requests in
+flight). When the deadline hits, unfinished candidates are cancelled and
+reported as timed out, and `gather` returns without waiting for their
+threads; each request's read timeout is capped at the time left, so those
+threads end shortly after the deadline instead of lingering.
+
+Streamlit scripts have no running event loop; use the synchronous
+`generate_candidates` wrapper there.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Sequence
+
+from api_logic.gemini_api import PROMPT_TIMEOUT, GeminiClient, GeminiError, get_client
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = 4
+DEADLINE = PROMPT_TIMEOUT
+MIN_CALL_TIMEOUT = 1.0      # don't start a request with less time than this left
+
+
+@dataclass(frozen=True)
+class CandidateRequest:
+    """One prompt to generate; `config` is its generationConfig (temperature, seed…)."""
+    prompt: str
+    config: dict | None = None
+    label: str = ""
+
+
+@dataclass(frozen=True)
+class CandidateResult:
+    label: str
+    text: str | None        # None when the call failed or missed the deadline
+    error: str | None
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.text is not None
+
+
+class AsyncGeminiClient:
+    """
+    Async front end of a `GeminiClient`.
+
+    Args:
+        client:           Client to send through; the process-wide one by default.
+        max_concurrency:  Requests in flight at once.
+    """
+
+    def __init__(self, client: GeminiClient | None = None, max_concurrency: int = MAX_CONCURRENCY):
+        self.client = client or get_client()
+        self.max_concurrency = max_concurrency
+
+    async def generate(self, prompt: str, config: dict | None = None, timeout: float = PROMPT_TIMEOUT,
+                       executor: Executor | None = None) -> str:
+        """One prompt, on a worker thread; raises GeminiError like `GeminiClient.generate`."""
+        call = partial(self.client.generate, prompt, timeout=timeout, config=config)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def gather(self, requests: Sequence[CandidateRequest],
+                     deadline: float = DEADLINE) -> list[CandidateResult]:
+        """
+        Generate every request concurrently and wait at most `deadline` seconds.
+
+        Returns:
+            One result per request, in request order. Failed and timed-out
+            candidates have `text=None` and an `error`.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # own executor, so returning at the deadline doesn't wait for running calls
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gemini")
+        t0 = time.monotonic()
+        end = t0 + deadline
+
+        async def run(req: CandidateRequest) -> CandidateResult:
+            async with semaphore:
+                left = end - time.monotonic()
+                if left < MIN_CALL_TIMEOUT:
+                    return CandidateResult(req.label, None, "deadline reached before start", 0.0)
+                started = time.monotonic()
+                try:
+                    text = await self.generate(req.prompt, req.config, timeout=left, executor=executor)
+                except GeminiError as exc:
+                    return CandidateResult(req.label, None, str(exc), time.monotonic() - started)
+            return CandidateResult(req.label, text, None, time.monotonic() - started)
+
+        tasks = [asyncio.create_task(run(req)) for req in requests]
+        done, pending = await asyncio.wait(tasks, timeout=deadline) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for req, task in zip(requests, tasks):
+            if task in done and task.exception() is None:
+                results.append(task.result())
+            elif task in done:
+                results.append(CandidateResult(req.label, None, str(task.exception()), time.monotonic() - t0))
+            else:
+                results.append(CandidateResult(req.label, None, f"timed out after {deadline:.0f}s", deadline))
+        logger.info("Gemini candidates: %d/%d ok in %.1fs",
+                    sum(r.ok for r in results), len(results), time.monotonic() - t0)
+        return results
+
+
+def generate_candidates(requests: Sequence[CandidateRequest], deadline: float = DEADLINE,
+                        max_concurrency: int = MAX_CONCURRENCY) -> list[CandidateResult]:
+    """Synchronous `AsyncGeminiClient.gather` for callers without an event loop (Streamlit)."""
+    client = get_client()
+    if not client.configured:
+        return [CandidateResult(r.label, None, "Error: Gemini API key not configured", 0.0) for r in requests]
+    return asyncio.run(AsyncGeminiClient(client, max_concurrency).gather(requests, deadline))
@@ -0,0 +1,129 @@
+# api_logic/ics_export.py
+"""
+Calendar (.ics) export of a structured schedule.
+
+Each schedule entry (one course meeting pattern, e.g. CS340 MON/WED/FRI
+10:30am-11:20am) becomes a single weekly VEVENT with a BYDAY list, instead
+of one open-ended event per day. Recurrences are bounded by the term's class
+period (UNTIL = last day of classes) and skip the term's holidays (EXDATE),
+both from the term calendar table (data/term_calendar.json). The location
+comes from the catalog section.
+
+Everything is derived from the schedule, the term and the catalog, never
+from the current date, so the same schedule always exports byte-identical
+files (stored per schedule version, see database.save_generated_schedule).
+"""
+
+import hashlib
+from datetime import date, datetime, time, timedelta
+
+import pytz
+from icalendar import Calendar, Event
+
+from data.catalog import CourseCatalog
+from data.data_processing import DAYS, parse_clock
+from data.term_store import Term, TermDates, active_term, term_dates
+
+TIMEZONE = "Asia/Yerevan"
+PRODID = "-//University Course Planner//Schedule Export//EN"
+UID_DOMAIN = "c-planner"
+_BYDAY = {"MON": "MO", "TUE": "TU", "WED": "WE", "THU": "TH", "FRI": "FR", "SAT": "SA", "SUN": "SU"}
+
+
+def catalog_term(catalog: CourseCatalog | None) -> Term | None:
+    """The term a catalog snapshot belongs to (its rows' year/semester), else the active term."""
+    if catalog is not None and len(catalog.df) and {"year", "semester"} <= set(catalog.df.columns):
+        return Term(int(catalog.df["year"].iloc[0]), int(catalog.df["semester"].iloc[0]))
+    return active_term()
+
+
+def section_location(catalog: CourseCatalog | None, entry: dict) -> str:
+    """Room of the catalog section an entry refers to (matched on section, then start time)."""
+    if catalog is None:
+        return ""
+    rows = [int(i) for i in catalog.sections_of(entry["code"])]
+    start = parse_clock(entry["start"])
+    by_section = [i for i in rows if str(catalog.sections[i].section) == entry["section"]]
+    by_time = [i for i in rows if any(s == start for _, s, _ in catalog.meetings.meetings(i))]
+    for i in [*by_section, *by_time, *rows]:
+        location = catalog.sections[i].location
+        if isinstance(location, str) and location.strip():
+            return location.strip()
+    return ""
+
+
+def _first_meeting(first_day: date, days: list[str]) -> date:
+    """Earliest date on or after `first_day` that falls on one of `days`."""
+    wanted = {DAYS.index(d) for d in days}
+    return next(first_day + timedelta(n) for n in range(7) if (first_day.weekday() + n) % 7 in wanted)
+
+
+def _clock_time(clock: str) -> time:
+    return time(*divmod(parse_clock(clock), 60))
+
+
+def _uid(term: Term, entry: dict) -> str:
+    key = "|".join([term.key, entry["code"], entry["section"], *entry["days"], entry["start"]])
+    return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}@{UID_DOMAIN}"
+
+
+def course_event(entry: dict, term: Term, dates: TermDates, location: str = "") -> Event:
+    """One weekly VEVENT for a schedule entry, bounded to the term and skipping its holidays."""
+    tz = pytz.timezone(TIMEZONE)
+    start, end = _clock_time(entry["start"]), _clock_time(entry["end"])
+    first = _first_meeting(dates.first_day, entry["days"])
+    weekdays = {DAYS.index(d) for d in entry["days"]}
+
+    event = Event()
+    name = f"{entry['code']} {entry['title'].title()}".strip()
+    event.add("summary", name)
+    event.add("uid", _uid(term, entry))
+    # fixed stamp (start of the term), so exports are reproducible
+    event.add("dtstamp", datetime.combine(dates.first_day, time(), tzinfo=pytz.utc))
+    event.add("dtstart", tz.localize(datetime.combine(first, start)))
+    event.add("dtend", tz.localize(datetime.combine(first, end)))
+    # UNTIL is in UTC when DTSTART has a time zone (RFC 5545 §3.3.10)
+    until = tz.localize(datetime.combine(dates.last_day, time(23, 59, 59))).astimezone(pytz.utc)
+    event.add("rrule", {"freq": "weekly", "byday": [_BYDAY[d] for d in entry["days"]], "until": until})
+    skipped = [
+        tz.localize(datetime.combine(day, start))
+        for day in dates.holidays
+        if first <= day <= dates.last_day and day.weekday() in weekdays
+    ]
+    if skipped:
+        event.add("exdate", skipped)
+    details = [f"Instructor: {entry['instructor']}" if entry["instructor"] else "",
+               f"Section: {entry['section']}" if entry["section"] else "",
+               entry["category"]]
+    event.add("description", "\n".join(d for d in details if d))
+    if location:
+        event.add("location", location)
+    return event
+
+
+def build_calendar(schedule: dict, term: Term, dates: TermDates | None = None,
+                   catalog: CourseCatalog | None = None) -> Calendar:
+    """VCALENDAR with one event per entry of a structured schedule."""
+    dates = dates or term_dates(term)
+    cal = Calendar()
+    cal.add("prodid", PRODID)
+    cal.add("version", "2.0")
+    cal.add("calscale", "GREGORIAN")
+    cal.add("x-wr-calname", f"{term.label} schedule")
+    for entry in schedule["courses"]:
+        cal.add_component(course_event(entry, term, dates, section_location(catalog, entry)))
+    cal.add_missing_timezones(first_date=dates.first_day, last_date=dates.last_day + timedelta(1))
+    return cal
+
+
+def schedule_ics(schedule: dict, catalog: CourseCatalog | None = None, term: Term | None = None) -> bytes:
+    """
+    .ics bytes of a structured schedule for `term` (default: the catalog's term).
+
+    Raises:
+        ValueError: no term is known (empty term store and no catalog).
+    """
+    term = term or catalog_term(catalog)
+    if term is None:
+        raise ValueError("no term to bound the calendar to")
+    return build_calendar(schedule, term, catalog=catalog).to_ical()
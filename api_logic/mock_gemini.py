@@ -0,0 +1,220 @@
+# api_logic/mock_gemini.py
+"""
+Local stand-in for the Gemini REST API, for trying the app and the client
+without an API key or network access.
+
+Serves POST {base}/{model}:generateContent and
+POST {base}/{model}:streamGenerateContent?alt=sse. The answer echoes the
+first line of the prompt followed by a fixed sample schedule (as JSON when
+the request asks for responseMimeType application/json). The streaming
+endpoint sends it word group by word group as server-sent events over a
+chunked response, after a configurable first-token delay, like the real API
+(raw UTF-8 JSON, and no charset on the event stream).
+
+Faults can be injected to exercise the client's retries, hedging and circuit
+breaker: the first N requests fail, a random share fails with a given status
+(optionally with Retry-After), and the first N / a random share answer slowly.
+
+Run:  python -m api_logic.mock_gemini [--port 8765] [--first-token 0.8] [--chunk-delay 0.05]
+          [--fail-first N] [--error-rate 0.2] [--error-status 503] [--slow-first N] [--slow-rate 0.1]
+          [--slow-seconds 5]
+then: GEMINI_BASE_URL=http://127.0.0.1:8765/v1beta/models GEMINI_API_KEY=mock streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_SCHEDULE_JSON = {
+    "courses": [
+        {"code": "CS310", "title": "Theory of Computing", "section": "A", "days": ["TUE", "THU"],
+         "start": "10:30am", "end": "11:50am", "instructor": "Suren Khachatryan", "category": "Core"},
+        {"code": "CS340", "title": "Machine Learning", "section": "A", "days": ["MON", "WED", "FRI"],
+         "start": "10:30am", "end": "11:20am", "instructor": "Monika Stepanyan", "category": "Core"},
+        {"code": "CHSS102", "title": "Armenian Language and Literature 2", "section": "B",
+         "days": ["MON", "WED", "FRI"], "start": "1:30pm", "end": "2:20pm", "instructor": "Staff",
+         "category": "General Education"},
+    ],
+    "factors": ["Fulfils degree requirements", "Ensures no time conflicts between selected courses"],
+    "notes": "Mock answer.",
+}
+SAMPLE_SCHEDULE = """1. **Your Recommended Schedule**
+2. **Factors Considered:**
+* Fulfils degree requirements
+* Ensures no time conflicts between selected courses
+
+3. **Schedule**
+* CS310 Theory of Computing (TUE/THU, 10:30am-11:50am, Suren Khachatryan) - Core
+* CS340 Machine Learning (MON/WED/FRI, 10:30am-11:20am, Monika Stepanyan) - Core
+* CHSS102 Armenian Language and Literature 2 (MON/WED/FRI, 1:30pm-2:20pm, Staff) - General Education
+"""
+WORDS_PER_CHUNK = 4
+
+
+@dataclass
+class Faults:
+    """
+    Injected failures; shared by all handler threads.
+
+    Attributes:
+        fail_first:    The first N requests fail with `error_status`.
+        error_rate:    Share of the remaining requests that fail.
+        error_status:  Status of injected failures.
+        retry_after:   Retry-After header (seconds) sent with failures, if set.
+        slow_first:    The first N requests are delayed by `slow_seconds`.
+        slow_rate:     Share of requests delayed by `slow_seconds` before answering.
+        slow_seconds:  Extra delay of slow requests.
+        seed:          Random seed, for repeatable runs.
+    """
+    fail_first: int = 0
+    error_rate: float = 0.0
+    error_status: int = 503
+    retry_after: float | None = None
+    slow_first: int = 0
+    slow_rate: float = 0.0
+    slow_seconds: float = 5.0
+    seed: int = 0
+    requests: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def draw(self) -> tuple[bool, float]:
+        """(fail this request?, extra delay) for the next request."""
+        with self._lock:
+            self.requests += 1
+            fail = self.requests <= self.fail_first or self._rng.random() < self.error_rate
+            slow = self.requests <= self.slow_first or self._rng.random() < self.slow_rate
+        return fail, self.slow_seconds if slow else 0.0
+
+
+def _response(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+
+
+def _chunks(text: str, words: int = WORDS_PER_CHUNK) -> list[str]:
+    """Split `text` into pieces of a few words, keeping all whitespace."""
+    pieces, out = text.split(" "), []
+    for i in range(0, len(pieces), words):
+        out.append(" ".join(pieces[i:i + words]) + (" " if i + words < len(pieces) else ""))
+    return out
+
+
+def make_handler(first_token: float, chunk_delay: float,
+                 faults: Faults | None = None) -> type[BaseHTTPRequestHandler]:
+    faults = faults or Faults()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.headers.get("x-goog-api-key"):
+                return self._json(403, {"error": {"code": 403, "message": "API key missing"}})
+            try:
+                prompt = body["contents"][0]["parts"][0]["text"]
+            except (KeyError, IndexError, TypeError):
+                return self._json(400, {"error": {"code": 400, "message": "Invalid request"}})
+            fail, delay = faults.draw()
+            time.sleep(delay)
+            if fail:
+                headers = {"Retry-After": f"{faults.retry_after:g}"} if faults.retry_after is not None else {}
+                return self._json(faults.error_status, {"error": {"code": faults.error_status,
+                                                                  "message": "Injected failure"}}, headers)
+            first_line = next((line for line in prompt.splitlines() if line.strip()), "")
+            if (body.get("generationConfig") or {}).get("responseMimeType") == "application/json":
+                answer = json.dumps(SAMPLE_SCHEDULE_JSON, indent=1)
+            else:
+                answer = f"Mock answer to: {first_line.strip()[:80]}\n\n{SAMPLE_SCHEDULE}"
+
+            path = self.path.split("?", 1)[0]
+            if path.endswith(":streamGenerateContent"):
+                return self._sse(answer)
+            if path.endswith(":generateContent"):
+                time.sleep(first_token + chunk_delay * len(_chunks(answer)))
+                return self._json(200, _response(answer))
+            return self._json(404, {"error": {"code": 404, "message": f"Unknown method {path}"}})
+
+        def _json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+            out = json.dumps(payload, ensure_ascii=False).encode()
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def _sse(self, answer: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(first_token)
+            for i, piece in enumerate(_chunks(answer)):
+                if i:
+                    time.sleep(chunk_delay)
+                # raw UTF-8, like the real API (not \u escapes)
+                event = f"data: {json.dumps(_response(piece), ensure_ascii=False)}\r\n\r\n".encode()
+                self.wfile.write(f"{len(event):X}\r\n".encode() + event + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+        def handle(self):
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                pass        # the client gave up (timeout, hedge lost)
+
+    return Handler
+
+
+def serve(port: int = 0, first_token: float = 0.8, chunk_delay: float = 0.05,
+          faults: Faults | None = None) -> ThreadingHTTPServer:
+    """Start the mock server on a background thread; its base URL is `base_url(server)`."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(first_token, chunk_delay, faults))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_port}/v1beta/models"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token", type=float, default=0.8, help="seconds before the first chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="seconds between chunks")
+    parser.add_argument("--fail-first", type=int, default=0, help="fail the first N requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds on failures")
+    parser.add_argument("--slow-first", type=int, default=0, help="answer the first N requests slowly")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="share of requests answered slowly")
+    parser.add_argument("--slow-seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = Faults(fail_first=args.fail_first, error_rate=args.error_rate, error_status=args.error_status,
+                    retry_after=args.retry_after, slow_first=args.slow_first, slow_rate=args.slow_rate,
+                    slow_seconds=args.slow_seconds, seed=args.seed)
+    server = serve(args.port, args.first_token, args.chunk_delay, faults)
+    print(f"Mock Gemini at {base_url(server)} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# api_logic/preferences.py
+"""
+Turn the questionnaire's free-text answers into structured constraints the
+local scheduler and the candidate filters can use.
+
+Answers are looked up by keywords in the question text rather than by the
+exact QUESTIONS strings, so emoji/wording tweaks in views/gemini.py don't
+break parsing. Given the catalog, the "hoping to take" answer is also resolved
+through the course search index ("something on machine learning" → CS340 …).
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from api_logic.course_search import resolve_courses
+from data.catalog import CourseCatalog, codes_in_text
+from data.data_processing import DAY_BITS
+
+MWF = DAY_BITS["MON"] | DAY_BITS["WED"] | DAY_BITS["FRI"]
+TTH = DAY_BITS["TUE"] | DAY_BITS["THU"]
+
+# (label, first minute, last minute) of each part of the day
+TIME_WINDOWS = {
+    "morning":   (0, 12 * 60),
+    "afternoon": (12 * 60, 17 * 60),
+    "evening":   (17 * 60, 24 * 60),
+}
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "freshman": 1, "sophomore": 2, "junior": 3, "senior": 4,
+}
+_NONE_ANSWERS = {"", "no", "none", "nope", "n/a", "na", "not provided", "no preference", "nothing", "-"}
+# answers made only of these words decline ("No, thanks", "None in particular", "Open to anything")
+_NONE_WORDS = {
+    "no", "none", "nope", "nothing", "not", "thanks", "thank", "you", "in", "particular",
+    "specific", "anything", "anyone", "open", "to", "i", "am", "i'm", "im", "sure", "really",
+    "preference", "preferences", "idea", "yet", "for", "now", "all", "good", "fine",
+    "whatever", "n/a", "na", "any", "is", "ok", "okay", "don't", "dont", "know",
+}
+
+
+@dataclass
+class Preferences:
+    program: str | None = None
+    study_year: int | None = None
+    wanted_codes: set[str] = field(default_factory=set)
+    wanted_text: str = ""
+    avoid_instructors: list[str] = field(default_factory=list)
+    excluded_codes: set[str] = field(default_factory=set)
+    time_of_day: str | None = None
+    course_count: int | None = None
+    day_pattern: int | None = None
+
+    @property
+    def is_graduate(self) -> bool:
+        return bool(self.program) and self.program.startswith("Master")
+
+
+def _answer(preferences: dict, *keywords: str) -> str:
+    for question, answer in preferences.items():
+        q = question.lower()
+        if all(k in q for k in keywords):
+            return (answer or "").strip()
+    return ""
+
+
+def _is_none(text: str) -> bool:
+    text = text.strip().lower().strip(".!")
+    words = re.findall(r"[a-z/']+", text)
+    return text in _NONE_ANSWERS or bool(words) and all(w in _NONE_WORDS for w in words)
+
+
+def _first_number(text: str) -> int | None:
+    m = re.search(r'\d+', text)
+    if m:
+        return int(m.group(0))
+    for word in re.findall(r'[a-z]+', text.lower()):
+        if word in _NUMBER_WORDS:
+            return _NUMBER_WORDS[word]
+    return None
+
+
+def parse_preferences(preferences: dict, catalog: CourseCatalog | None = None) -> Preferences:
+    """
+    Args:
+        preferences: {question: answer} as stored in the `preferences` table.
+        catalog:     When given, free-text course wishes are matched against
+                     the catalog's search index, not only explicit codes.
+    """
+    prefs = Preferences()
+
+    program = _answer(preferences, "academic program")
+    prefs.program = program or None
+
+    year = _answer(preferences, "year of your studies")
+    prefs.study_year = _first_number(year) if year else None
+
+    wanted = _answer(preferences, "hoping to take")
+    if not _is_none(wanted):
+        if catalog is not None:
+            prefs.wanted_codes = set(resolve_courses(catalog, wanted))
+        else:
+            prefs.wanted_codes = codes_in_text(wanted.upper())
+        prefs.wanted_text = wanted
+
+    avoid = _answer(preferences, "instructors")
+    if not _is_none(avoid):
+        names = re.split(r'\s*(?:,|;|/|\band\b|\n)\s*', avoid)
+        prefs.avoid_instructors = [n.lower() for n in names if n and not _is_none(n)]
+
+    excluded = _answer(preferences, "don", "want to take")
+    if not _is_none(excluded):
+        prefs.excluded_codes = codes_in_text(excluded.upper())
+
+    time_pref = _answer(preferences, "time of day").lower()
+    for label in TIME_WINDOWS:
+        if label in time_pref:
+            prefs.time_of_day = label
+            break
+    else:
+        if "noon" in time_pref and "before" in time_pref:
+            prefs.time_of_day = "morning"
+        elif "late" in time_pref or "night" in time_pref:
+            prefs.time_of_day = "evening"
+
+    count = _answer(preferences, "how many courses")
+    n = _first_number(count) if count else None
+    prefs.course_count = n if n and 0 < n <= 8 else None
+
+    days = _answer(preferences, "mwf or tth").upper()
+    has_mwf, has_tth = "MWF" in days, bool(re.search(r'\bTT(H|R)?\b|TUE|THU', days))
+    if has_mwf != has_tth:
+        prefs.day_pattern = MWF if has_mwf else TTH
+
+    return prefs
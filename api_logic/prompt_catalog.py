@@ -0,0 +1,196 @@
+# api_logic/prompt_catalog.py
+"""
+Token-efficient catalog serialization for Gemini prompts.
+
+`DataFrame.to_csv` repeats every column for every section: the same long
+description, course type and restriction sentences, campus, term… This
+serializer keeps the same scheduling data in a fraction of the tokens:
+
+  - sections are grouped under their course; fields that are identical
+    across a course's sections (title, credits, prerequisites, themes,
+    restriction, level, type) are written once on the course line; one
+    that differs is marked VARIES there and given on each section line
+  - values identical for every listed section (campus, year, semester) go
+    into the header
+  - long repeated values (course types, restrictions, prerequisite and theme
+    sentences) are replaced by short legend keys defined once
+  - meeting times are folded ("MON/WED/FRI 10:30am-11:20am")
+  - descriptions are cut to their first sentence(s), DESCRIPTION_CHARS max
+
+Token counts are estimates (~4 characters per token for Gemini models); the
+before/after numbers are logged for every prompt.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from data.catalog import CourseCatalog
+from data.data_processing import format_clock, format_days
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+DESCRIPTION_CHARS = 160
+LEGEND_MIN_LENGTH = 12          # shorter values are cheaper inline than as a key
+VARIES = "*"                    # course-line placeholder for a field that differs per section
+
+# course-level fields, in output order, with their legend key prefix (None = inline)
+COURSE_FIELDS = {
+    "course_title": None,
+    "credits": None,
+    "course_level": "L",
+    "course_type": "T",
+    "prerequisites": "P",
+    "themes": "H",
+    "restriction": "R",
+}
+SECTION_FIELDS = ("section", "instructor", "location", "session")
+HEADER_FIELDS = ("campus", "year", "semester")
+
+
+@dataclass(frozen=True)
+class PromptCatalog:
+    text: str
+    tokens_before: int      # estimated tokens of the plain CSV of the same rows
+    tokens_after: int
+
+    @property
+    def saved(self) -> float:
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _value(v) -> str:
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v).strip()
+
+
+def _short_description(text: str) -> str:
+    text = re.sub(r'\s+', ' ', _value(text))
+    if text in ("", "Not specified") or len(text) <= DESCRIPTION_CHARS:
+        return text
+    out = ""
+    for sentence in re.split(r'(?<=[.?!])\s+', text):
+        if out and len(out) + len(sentence) + 1 > DESCRIPTION_CHARS:
+            break
+        out = f"{out} {sentence}".strip()
+    return out if len(out) <= DESCRIPTION_CHARS else out[:DESCRIPTION_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def _times(catalog: CourseCatalog, i: int, raw: str) -> str:
+    meetings = catalog.meetings.meetings(i)
+    if not meetings:
+        return _value(raw) or "TBD"
+    return ", ".join(
+        f"{'/'.join(format_days(days))} {format_clock(start)}-{format_clock(end)}"
+        for days, start, end in meetings
+    )
+
+
+_row_chars: dict[str, tuple[int, np.ndarray]] = {}
+
+
+def _csv_chars(catalog: CourseCatalog, rows: Sequence[int]) -> int:
+    """
+    Approximate length of `catalog.df.iloc[rows].to_csv()` (quoting ignored),
+    from per-row value lengths computed once per catalog version.
+    """
+    cached = _row_chars.get(catalog.version)
+    if cached is None:
+        df = catalog.df
+        lengths = sum(df[c].astype(str).str.len().where(df[c].notna(), 0).to_numpy() for c in df.columns)
+        header = sum(len(str(c)) for c in df.columns) + len(df.columns)
+        cached = (header, lengths + len(df.columns))        # + separators and newline
+        _row_chars.clear()      # only the current catalog version is needed
+        _row_chars[catalog.version] = cached
+    header, lengths = cached
+    return header + int(lengths[list(rows)].sum())
+
+
+def serialize_sections(catalog: CourseCatalog, rows: Sequence[int]) -> str:
+    """Compact text form of the given catalog rows (section IDs), for prompts."""
+    df = catalog.df
+    rows = [int(i) for i in rows]
+    if not rows:
+        return ""
+    cols = {c: df[c].to_numpy() for c in df.columns}
+
+    header = {}
+    for c in HEADER_FIELDS:
+        if c in cols:
+            values = {_value(cols[c][i]) for i in rows}
+            if len(values) == 1:
+                header[c] = values.pop()
+
+    by_course: dict[int, list[int]] = {}
+    for i in rows:
+        by_course.setdefault(int(catalog.course_ids[i]), []).append(i)
+
+    # legend: long values of legend fields that more than one course uses
+    legend: dict[tuple[str, str], str] = {}
+    for c, prefix in COURSE_FIELDS.items():
+        if prefix is None or c not in cols:
+            continue
+        counts = Counter(v for secs in by_course.values() for v in {_value(cols[c][i]) for i in secs})
+        n_keys = 0
+        for value, n in counts.most_common():
+            if n > 1 and len(value) >= LEGEND_MIN_LENGTH:
+                n_keys += 1
+                legend[(c, value)] = f"{prefix}{n_keys}"
+
+    def field(c: str, i: int) -> str:
+        v = _value(cols[c][i])
+        return legend.get((c, v), v)
+
+    course_fields = [c for c in COURSE_FIELDS if c in cols]
+    lines = []
+    for cid, secs in by_course.items():
+        # fields that differ between this course's sections move to the section lines;
+        # the course line keeps their column as VARIES so the others stay aligned
+        varying = [c for c in course_fields if len({_value(cols[c][i]) for i in secs}) > 1]
+        head = [catalog.sections[secs[0]].code]
+        head += [VARIES if c in varying else field(c, secs[0]) for c in course_fields]
+        lines.append(" | ".join(head))
+        desc = _short_description(cols["course_description"][secs[0]]) if "course_description" in cols else ""
+        if desc and desc != "Not specified":
+            lines.append(f"  desc: {desc}")
+        for i in secs:
+            parts = [_times(catalog, i, cols["times"][i])]
+            parts += [_value(cols[c][i]) for c in SECTION_FIELDS[1:] if c in cols]
+            parts += [f"{c}={field(c, i)}" for c in varying]
+            parts += [f"{c}={_value(cols[c][i])}" for c in HEADER_FIELDS if c in cols and c not in header]
+            lines.append(f"  {_value(cols['section'][i]) or '-'}: " + " | ".join(parts))
+
+    out = []
+    if header:
+        out.append("All sections: " + ", ".join(f"{c}={v}" for c, v in header.items()))
+    out.append("Course line: code | " + " | ".join(c for c in course_fields)
+               + "; section line: section: times | " + " | ".join(SECTION_FIELDS[1:])
+               + f"; {VARIES} = differs per section, given as field=value on the section lines")
+    if legend:
+        out.append("Legend:")
+        out += [f"  {key} = {value}" for (_, value), key in legend.items()]
+    out.append("Courses:")
+    return "\n".join(out + lines)
+
+
+def catalog_prompt(catalog: CourseCatalog, rows: Sequence[int]) -> PromptCatalog:
+    """Serialize `rows` and log the estimated token savings over plain CSV."""
+    text = serialize_sections(catalog, rows)
+    before = math.ceil(_csv_chars(catalog, rows) / CHARS_PER_TOKEN)
+    result = PromptCatalog(text=text, tokens_before=before, tokens_after=estimate_tokens(text))
+    logger.info("Prompt catalog: %d sections, ~%d → ~%d tokens (%.0f%% smaller)",
+                len(rows), result.tokens_before, result.tokens_after, result.saved * 100)
+    return result
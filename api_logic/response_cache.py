@@ -0,0 +1,178 @@
+# api_logic/response_cache.py
+"""
+Content-addressed cache for Gemini responses.
+
+Entries are keyed on sha256(model + prompt), so the same prompt sent to the
+same model (a rerun of the final view's formatter prompt, a re-uploaded
+transcript, a regeneration with unchanged inputs) is answered locally.
+
+Two tiers:
+  - memory: a size-bounded LRU shared by every Streamlit session
+  - disk (optional): a SQLite table, so answers survive a restart; also
+    bounded, least recently used rows are pruned first
+
+Both tiers expire entries after `ttl` seconds. Only successful answers are
+stored; errors are never cached.
+
+Configuration (environment / .env):
+    GEMINI_CACHE_SIZE   entries kept in memory (0 disables the cache)
+    GEMINI_CACHE_TTL    seconds an answer stays valid
+    GEMINI_CACHE_DB     SQLite file for the disk tier; empty disables it
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / ".cache"
+DEFAULT_DB = CACHE_DIR / "gemini-responses.sqlite3"
+MEMORY_ENTRIES = 256
+DISK_ENTRIES = 5000
+TTL_SECONDS = 24 * 3600
+
+
+def cache_key(model: str, prompt: str, *extra: str) -> str:
+    """sha256 over the model, the prompt and any request options that change the answer."""
+    h = hashlib.sha256()
+    for part in (model, prompt, *extra):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU + TTL response cache with an optional SQLite tier.
+
+    Args:
+        max_entries:       Entries kept in memory.
+        ttl:               Seconds an entry stays valid.
+        db_path:           SQLite file for the disk tier, or None.
+        max_disk_entries:  Rows kept on disk.
+    """
+
+    def __init__(self, max_entries: int = MEMORY_ENTRIES, ttl: float = TTL_SECONDS,
+                 db_path: str | Path | None = None, max_disk_entries: int = DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL,"
+                    " stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used_at)")
+                self._db.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Response cache: disk tier disabled (%s)", exc)
+                self._db = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> str | None:
+        """The cached response for `key`, or None (counted as a miss)."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT response, stored_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and now - row[1] <= self.ttl:
+                        self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, row[1], row[0])
+                        self.disk_hits += 1
+                        return row[0]
+                    if row is not None:
+                        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._db.commit()
+                except sqlite3.Error as exc:
+                    logger.warning("Response cache: disk read failed (%s)", exc)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, stored_at, used_at)"
+                    " VALUES (?, ?, ?, ?, ?)", (key, model, response, now, now)
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE stored_at < ? OR key IN ("
+                    " SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (now - self.ttl, self.max_disk_entries),
+                )
+                self._db.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Response cache: disk write failed (%s)", exc)
+
+    def _remember(self, key: str, stored_at: float, response: str) -> None:
+        self._memory[key] = (stored_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+def cache_from_env() -> ResponseCache:
+    """A cache configured from GEMINI_CACHE_SIZE / GEMINI_CACHE_TTL / GEMINI_CACHE_DB."""
+    return ResponseCache(
+        max_entries=int(os.getenv("GEMINI_CACHE_SIZE", MEMORY_ENTRIES)),
+        ttl=float(os.getenv("GEMINI_CACHE_TTL", TTL_SECONDS)),
+        db_path=os.getenv("GEMINI_CACHE_DB", str(DEFAULT_DB)) or None,
+    )
@@ -0,0 +1,202 @@
+# api_logic/schedule_engine.py
+"""
+Deterministic local schedule engine.
+
+Branch-and-bound search over catalog sections that returns the top-k
+conflict-free schedules in milliseconds. Candidates come from the shared
+pruning stage (api_logic.candidates), sections are scored against the parsed
+questionnaire preferences and the degree requirements, and conflicts come
+from the catalog's precomputed conflict matrix (as Python int bitsets).
+
+Used to serve an instant schedule, and as a verified draft that Gemini only
+has to explain or polish.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from api_logic.candidates import candidate_mask
+from api_logic.degree_audit import DegreeAudit, course_clusters
+from api_logic.preferences import TIME_WINDOWS, Preferences
+from data.catalog import CourseCatalog, codes_in_text
+
+DEFAULT_COURSE_COUNT = 5
+MAX_SECTIONS_PER_COURSE = 4   # branching cap per course
+NODE_BUDGET = 50_000          # hard stop so a solve always stays in the ms range
+CONFLICT_PENALTY = 20         # per overlapping pair in a scored free-text schedule
+TAKEN_PENALTY = 10            # per already-completed course in a scored free-text schedule
+
+
+@dataclass(frozen=True)
+class ScheduleOption:
+    score: float
+    sections: tuple[int, ...]
+
+
+def _prefix(code: str) -> str:
+    m = re.match(r'[A-Z]+', code)
+    return m.group(0) if m else code
+
+
+def _section_scores(catalog: CourseCatalog, sections: list[int], prefs: Preferences,
+                    required: set[str], program_codes: set[str],
+                    clusters: set[str] = frozenset()) -> dict[int, float]:
+    """Preference/requirement score of each candidate section."""
+    section_days = catalog.meetings.section_days
+    program_prefixes = {_prefix(c) for c in program_codes}
+    clusters_of = course_clusters(catalog) if clusters else {}
+    window = TIME_WINDOWS.get(prefs.time_of_day)
+
+    scores = {}
+    for i in sections:
+        sec = catalog.sections[i]
+        code = sec.code
+        score = 0.0
+
+        if code in prefs.wanted_codes:
+            score += 10
+        if code in required:
+            score += 5
+        elif _prefix(code) in program_prefixes:
+            score += 2
+        if sec.course_type == "General Education course" and not prefs.is_graduate:
+            score += 1
+        if clusters_of.get(code, frozenset()) & clusters:
+            score += 3
+
+        if prefs.study_year and not prefs.is_graduate:
+            if (prefs.study_year <= 2) == (sec.course_level == "Lower level"):
+                score += 1
+
+        if prefs.day_pattern is not None:
+            score += 1 if int(section_days[i]) & ~prefs.day_pattern == 0 else -1
+
+        if window:
+            lo, hi = window
+            for _, start, end in catalog.meetings.meetings(i):
+                score += 0.5 if lo <= start and end <= hi else -0.5
+
+        scores[i] = score
+    return scores
+
+
+def candidate_sections(catalog: CourseCatalog, completed: set[str], prefs: Preferences,
+                       degree_requirements: str = "") -> list[int]:
+    """Pruned candidates that also have a concrete meeting time."""
+    mask = candidate_mask(catalog, completed, prefs, degree_requirements)
+    return np.flatnonzero(mask & catalog.meetings.has_time).tolist()
+
+
+def solve(catalog: CourseCatalog, completed: set[str], prefs: Preferences,
+          degree_requirements: str = "", top_k: int = 3,
+          audit: DegreeAudit | None = None) -> list[ScheduleOption]:
+    """
+    Return up to `top_k` conflict-free schedules, best first.
+
+    Args:
+        catalog:             Shared catalog snapshot.
+        completed:           Canonical codes of courses already taken.
+        prefs:               Parsed questionnaire answers.
+        degree_requirements: Requirement text; its course codes are prioritised.
+        top_k:               Number of alternative schedules to return.
+        audit:               Degree audit of the transcript; when given, only
+                             courses and GE clusters that still count towards
+                             an unsatisfied requirement are prioritised.
+    """
+    program_codes = codes_in_text(degree_requirements)
+    required = audit.remaining_codes if audit else program_codes
+    clusters = audit.remaining_clusters if audit else frozenset()
+    target = prefs.course_count or DEFAULT_COURSE_COUNT
+
+    # group scored sections by course, best section first
+    sections = candidate_sections(catalog, completed, prefs, degree_requirements)
+    scores = _section_scores(catalog, sections, prefs, required, program_codes, clusters)
+    by_course: dict[int, list[tuple[float, int]]] = {}
+    for i in sections:
+        by_course.setdefault(int(catalog.course_ids[i]), []).append((scores[i], i))
+    courses = []
+    for options in by_course.values():
+        options.sort(key=lambda t: (-t[0], t[1]))
+        courses.append(options[:MAX_SECTIONS_PER_COURSE])
+    courses.sort(key=lambda opts: -opts[0][0])
+
+    target = min(target, len(courses))
+    if target == 0:
+        return []
+
+    best = [opts[0][0] for opts in courses]
+    masks = {i: catalog.conflicts.row_mask(i) for opts in courses for _, i in opts}
+
+    heap: list[tuple[float, tuple[int, ...]]] = []   # min-heap of the current top-k
+    nodes = 0
+
+    def bound(pos: int, need: int) -> float:
+        # courses are sorted by best score, so the next `need` ones are optimistic
+        return sum(best[pos:pos + need])
+
+    def dfs(pos: int, chosen: list[int], blocked: int, score: float) -> None:
+        nonlocal nodes
+        nodes += 1
+        need = target - len(chosen)
+        if need == 0:
+            item = (score, tuple(sorted(chosen)))
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+            return
+        if nodes > NODE_BUDGET or len(courses) - pos < need:
+            return
+        if len(heap) == top_k and score + bound(pos, need) <= heap[0][0]:
+            return
+
+        for sec_score, i in courses[pos]:
+            if not (blocked >> i) & 1:
+                chosen.append(i)
+                dfs(pos + 1, chosen, blocked | masks[i], score + sec_score)
+                chosen.pop()
+        dfs(pos + 1, chosen, blocked, score)
+
+    dfs(0, [], 0, 0.0)
+    return [ScheduleOption(score, secs) for score, secs in sorted(heap, reverse=True)]
+
+
+def score_schedule_text(catalog: CourseCatalog, text: str, completed: set[str], prefs: Preferences,
+                        degree_requirements: str = "", audit: DegreeAudit | None = None) -> ScheduleOption:
+    """
+    Score a free-text schedule (e.g. a Gemini answer) with the same section
+    scores `solve` uses, so alternatives can be ranked locally. Time
+    conflicts and courses already completed are penalised.
+    """
+    sections = catalog.sections_in_text(text)
+    program_codes = codes_in_text(degree_requirements)
+    required = audit.remaining_codes if audit else program_codes
+    clusters = audit.remaining_clusters if audit else frozenset()
+    scores = _section_scores(catalog, sections, prefs, required, program_codes, clusters)
+    score = sum(scores.values())
+    score -= TAKEN_PENALTY * sum(catalog.sections[i].code in completed for i in sections)
+    score -= CONFLICT_PENALTY * len(catalog.conflicts.conflicting_pairs(sections))
+    return ScheduleOption(score, tuple(sections))
+
+
+def format_schedule(catalog: CourseCatalog, option: ScheduleOption,
+                    degree_requirements: str = "") -> str:
+    """Render a solved schedule in the same bullet format the Gemini prompt asks for."""
+    required = codes_in_text(degree_requirements)
+    lines = ["**Your Recommended Schedule**", "", "**Schedule**"]
+    for i in option.sections:
+        sec = catalog.sections[i]
+        if sec.code in required:
+            tag = "Core"
+        elif sec.course_type == "General Education course":
+            tag = "General Education"
+        else:
+            tag = "Elective"
+        lines.append(
+            f"* {sec.code} {str(sec.title).title()} "
+            f"({sec.times}, {sec.instructor}) - {tag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,210 @@
+# api_logic/schedule_parser.py
+"""
+Local parser for schedule text.
+
+Turns the bullet lines of a generated (or hand-edited) schedule, e.g.
+
+    * CS340 Machine Learning (MWF, 10:30am-11:20am, Monika Stepanyan) - Core
+    * CS310 Theory of Computing (TT, 10:30am-11:50am) - Core
+    CS101 Intro (MON 3:30pm-4:20pm, WED 3:30pm-4:20pm, Staff)
+
+into the structured schedule shape of api_logic.structured_schedule, so the
+final view can build the calendar without asking Gemini to reformat the text.
+
+Day groups are expanded (MWF, TTH, TT, TR, MON/WED, "Tue and Thu", …) and
+time ranges normalized (10:30 AM - 11:20 AM, 10:30-11:20am). With a catalog,
+each line is resolved to its section, which supplies the title, section and
+instructor, and the meeting times when the text has none or agrees with
+the section on a day and start time.
+"""
+
+import re
+
+from data.catalog import CourseCatalog, canonical_code
+from data.data_processing import DAYS, format_clock, format_days, parse_clock
+from data.prerequisites import CODE_RE
+from api_logic.structured_schedule import CATEGORIES, normalize_entry
+
+_BULLET_RE = re.compile(r'^\s*(?:[*\-•+]|\d+[.)])\s+')
+_TIME_RE = re.compile(
+    r'(\d{1,2})(?::(\d{2}))?\s*([ap])?\.?m?\.?\s*(?:-|–|—|to)\s*(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?',
+    re.IGNORECASE,
+)
+_DAY_NAMES = {
+    **{d: d for d in DAYS},
+    "MONDAY": "MON", "TUESDAY": "TUE", "WEDNESDAY": "WED", "THURSDAY": "THU",
+    "FRIDAY": "FRI", "SATURDAY": "SAT", "SUNDAY": "SUN",
+    "TUES": "TUE", "THUR": "THU", "THURS": "THU",
+    "MO": "MON", "TU": "TUE", "WE": "WED", "TH": "THU", "FR": "FRI", "SA": "SAT", "SU": "SUN",
+}
+# single letters of compact groups (MWF, TR); T is Tuesday, or Thursday when Tuesday is taken (TT)
+_DAY_LETTERS = {"M": "MON", "W": "WED", "R": "THU", "F": "FRI", "S": "SAT", "U": "SUN"}
+
+
+def _compact_days(token: str) -> list[str] | None:
+    """'MWF' → MON, WED, FRI; 'TTH' / 'TT' → TUE, THU; None if it isn't a day group."""
+    days, i = [], 0
+    while i < len(token):
+        pair = token[i:i + 2]
+        if pair in ("TH", "TU", "SA", "SU"):
+            day, i = _DAY_NAMES[pair], i + 2
+        elif token[i] == "T":
+            day, i = ("THU" if "TUE" in days else "TUE"), i + 1
+        elif token[i] in _DAY_LETTERS:
+            day, i = _DAY_LETTERS[token[i]], i + 1
+        else:
+            return None
+        if day in days:
+            return None
+        days.append(day)
+    return days
+
+
+def parse_days(text: str) -> list[str] | None:
+    """Meeting days named in `text`, Monday first; None unless `text` is only day names."""
+    tokens = [t for t in re.split(r'[\s/,&+.]+|\bAND\b', text.strip().upper()) if t]
+    if not tokens:
+        return None
+    found = set()
+    for token in tokens:
+        days = [_DAY_NAMES[token]] if token in _DAY_NAMES else _compact_days(token)
+        if not days:
+            return None
+        found.update(days)
+    return [d for d in DAYS if d in found]
+
+
+def parse_time_range(text: str) -> tuple[int, int] | None:
+    """First time range in `text` as (start, end) minutes after midnight."""
+    m = _TIME_RE.search(text)
+    if not m:
+        return None
+    h1, m1, half1, h2, m2, half2 = m.groups()
+    half2 = half2.lower()
+    try:
+        end = parse_clock(f"{h2}:{m2 or '00'}{half2}m")
+        # '10:30-11:20am': the start shares the end's am/pm unless that puts it after the end
+        start = parse_clock(f"{h1}:{m1 or '00'}{(half1 or half2).lower()}m")
+        if half1 is None and start > end:
+            start = parse_clock(f"{h1}:{m1 or '00'}am")
+    except ValueError:
+        return None
+    return (start, end) if start < end else None
+
+
+def _meetings(details: str) -> tuple[list[tuple[list[str], int, int]], str]:
+    """(days, start, end) meetings and the instructor from a '(…)' detail list."""
+    meetings, pending, instructor = [], [], ""
+    for part in (p.strip() for p in details.split(",")):
+        if not part:
+            continue
+        span = parse_time_range(part)
+        rest = _TIME_RE.sub(" ", part).strip(" -:")
+        days = None
+        if span:
+            # 'Machine Learning MWF 10:30am-11:20am': the day group just before the time
+            words = rest.split()
+            for k in range(len(words)):
+                days = parse_days(" ".join(words[k:]))
+                if days:
+                    rest = " ".join(words[:k])
+                    break
+        elif rest:
+            days = parse_days(rest)
+            rest = "" if days else rest
+        if days:
+            pending += [d for d in days if d not in pending]
+        elif rest and span is None and not instructor and rest.title() not in CATEGORIES:
+            instructor = rest
+        if span and pending:
+            meetings.append((pending, *span))
+            pending = []
+    return meetings, instructor
+
+
+def _category(line: str, catalog: CourseCatalog | None, section: int | None) -> str:
+    tail = line.rsplit(")", 1)[-1].lower()
+    for category in CATEGORIES:
+        if category.lower() in tail:
+            return category
+    if section is not None and catalog.sections[section].course_type == "General Education course":
+        return "General Education"
+    return "Elective"
+
+
+def parse_line(line: str, catalog: CourseCatalog | None = None) -> list[dict] | None:
+    """
+    Entries (one per meeting pattern) for one schedule line.
+
+    Returns:
+        [] if the line is not a course line (headings, factors, notes), or
+        None if it names a course whose meetings can't be determined.
+    """
+    text = _BULLET_RE.sub("", line).replace("**", "").strip()
+    m = CODE_RE.match(text)
+    if not m:
+        return []
+    code = canonical_code(m.group(1) + m.group(2))
+    rest = text[m.end():]
+    title, _, details = rest.partition("(")
+    details = details.rsplit(")", 1)[0] if details else rest
+    title = title.strip(" -:") if details is not rest else ""
+    meetings, instructor = _meetings(details)
+
+    section = None
+    if catalog is not None and len(catalog.sections_of(code)):
+        section = catalog.sections_in_text(text)[0]
+        sec = catalog.sections[section]
+        known = [(format_days(d), s, e) for d, s, e in catalog.meetings.meetings(section)]
+        # the catalog's meetings are authoritative when the text agrees on a day and start time
+        said = {(day, s) for days, s, _ in meetings for day in days}
+        if known and (not meetings or said & {(day, s) for days, s, _ in known for day in days}):
+            meetings = known
+        title = title or str(sec.title or "")
+        instructor = instructor or str(sec.instructor or "")
+    if not meetings:
+        return None
+    # 'MON 3:30pm-4:20pm, WED 3:30pm-4:20pm' is one MON/WED meeting
+    spans: dict[tuple[int, int], list[str]] = {}
+    for days, start, end in meetings:
+        spans.setdefault((start, end), []).extend(days)
+
+    category = _category(text, catalog, section)
+    entries = []
+    for (start, end), days in spans.items():
+        entry = normalize_entry({
+            "code": code,
+            "title": title,
+            "section": str(catalog.sections[section].section or "") if section is not None else "",
+            "days": days,
+            "start": format_clock(start),
+            "end": format_clock(end),
+            "instructor": instructor,
+            "category": category,
+        })
+        if entry:
+            entries.append(entry)
+    return entries or None
+
+
+def parse_schedule_text(text: str, catalog: CourseCatalog | None = None) -> dict:
+    """
+    Parse schedule text into a structured schedule.
+
+    Raises:
+        ValueError: no course lines, or a course line whose meetings can't be
+            determined (the caller may fall back to Gemini).
+    """
+    courses, seen = [], set()
+    for line in (text or "").splitlines():
+        entries = parse_line(line, catalog)
+        if entries is None:
+            raise ValueError(f"could not parse schedule line: {line.strip()[:80]!r}")
+        for entry in entries:
+            key = (entry["code"], tuple(entry["days"]), entry["start"])
+            if key not in seen:
+                seen.add(key)
+                courses.append(entry)
+    if not courses:
+        raise ValueError("no course lines found in the schedule")
+    return {"courses": courses, "factors": [], "notes": ""}
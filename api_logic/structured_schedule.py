@@ -0,0 +1,222 @@
+# api_logic/structured_schedule.py
+"""
+Structured (JSON) schedules.
+
+Schedule generation asks Gemini for JSON that follows SCHEDULE_SCHEMA
+(`responseMimeType` / `responseSchema`): one entry per course meeting pattern
+with code, title, section, days, start/end time, instructor and category,
+plus the factors considered and free-form notes. The human-readable text
+shown to the student is rendered locally from that JSON, and both are stored
+together, so the final view can build the calendar straight from the entries
+instead of asking Gemini to reformat the text.
+
+`ScheduleStream` renders a streamed JSON answer progressively: each course
+line appears as soon as its object is complete.
+"""
+
+import json
+import re
+from typing import Iterable, Iterator
+
+from data.catalog import CourseCatalog, canonical_code, codes_in_text
+from data.data_processing import DAYS, format_clock, format_days
+
+CATEGORIES = ("Core", "General Education", "Elective")
+
+_ENTRY_FIELDS = ["code", "title", "section", "days", "start", "end", "instructor", "category"]
+SCHEDULE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "courses": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "code": {"type": "STRING", "description": "Catalog course code, e.g. CS340"},
+                    "title": {"type": "STRING"},
+                    "section": {"type": "STRING", "description": "Section as listed in the catalog"},
+                    "days": {"type": "ARRAY", "items": {"type": "STRING", "enum": list(DAYS)}},
+                    "start": {"type": "STRING", "description": "12-hour start time, e.g. 10:30am"},
+                    "end": {"type": "STRING", "description": "12-hour end time, e.g. 11:20am"},
+                    "instructor": {"type": "STRING"},
+                    "category": {"type": "STRING", "enum": list(CATEGORIES)},
+                },
+                "required": ["code", "days", "start", "end"],
+                "propertyOrdering": _ENTRY_FIELDS,
+            },
+        },
+        "factors": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "notes": {"type": "STRING"},
+    },
+    "required": ["courses"],
+    # courses first, so a streamed answer can be shown course by course
+    "propertyOrdering": ["courses", "factors", "notes"],
+}
+STRUCTURED_CONFIG = {"responseMimeType": "application/json", "responseSchema": SCHEDULE_SCHEMA}
+
+_CLOCK_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?$', re.IGNORECASE)
+_COURSES_RE = re.compile(r'"courses"\s*:\s*\[')
+
+
+def _clock(value) -> str | None:
+    """'10:30 AM' → '10:30am'; None if it isn't a 12-hour time."""
+    m = _CLOCK_RE.match(str(value or "").strip())
+    if not m:
+        return None
+    hour, minute, half = int(m.group(1)), int(m.group(2) or 0), m.group(3).lower()
+    if not (1 <= hour <= 12 and minute < 60):
+        return None
+    return f"{hour}:{minute:02d}{half}m"
+
+
+def normalize_entry(entry: dict) -> dict | None:
+    """A cleaned-up course entry, or None if it lacks a code, days or times."""
+    if not isinstance(entry, dict):
+        return None
+    code = canonical_code(entry.get("code") or "")
+    days = [d for d in DAYS if d in {str(x).strip().upper()[:3] for x in entry.get("days") or []}]
+    start, end = _clock(entry.get("start")), _clock(entry.get("end"))
+    if not code or not days or not start or not end:
+        return None
+    category = str(entry.get("category") or "").strip()
+    return {
+        "code": code,
+        "title": str(entry.get("title") or "").strip(),
+        "section": str(entry.get("section") or "").strip(),
+        "days": days,
+        "start": start,
+        "end": end,
+        "instructor": str(entry.get("instructor") or "").strip(),
+        "category": category if category in CATEGORIES else "Elective",
+    }
+
+
+def parse_schedule_json(text: str) -> dict:
+    """
+    Parse and normalize a JSON schedule answer.
+
+    Raises:
+        ValueError: not JSON, or not a schedule object.
+    """
+    data = json.loads(text) if isinstance(text, str) else text
+    if not isinstance(data, dict):
+        raise ValueError("schedule JSON must be an object")
+    courses = [e for e in map(normalize_entry, data.get("courses") or []) if e]
+    factors = [str(f).strip() for f in data.get("factors") or [] if str(f).strip()]
+    return {"courses": courses, "factors": factors, "notes": str(data.get("notes") or "").strip()}
+
+
+def render_entry(entry: dict) -> str:
+    title = f" {entry['title'].title()}" if entry["title"] else ""
+    instructor = f", {entry['instructor']}" if entry["instructor"] else ""
+    return (f"* {entry['code']}{title} ({'/'.join(entry['days'])}, {entry['start']}-{entry['end']}"
+            f"{instructor}) - {entry['category']}")
+
+
+_HEADER = "1. **Your Recommended Schedule**\n\n**Schedule**\n"
+
+
+def _render_tail(schedule: dict) -> str:
+    out = ""
+    if schedule["factors"]:
+        out += "\n**Factors Considered:**\n" + "".join(f"* {f}\n" for f in schedule["factors"])
+    if schedule["notes"]:
+        out += f"\nNotes: {schedule['notes']}\n"
+    return out
+
+
+def render_schedule(schedule: dict) -> str:
+    """The human-readable schedule text (same lines ScheduleStream produces)."""
+    return (_HEADER + "".join(render_entry(e) + "\n" for e in schedule["courses"])
+            + _render_tail(schedule)).strip()
+
+
+class ScheduleStream:
+    """
+    Render a streamed JSON schedule as text while it arrives.
+
+    Iterate it (e.g. with `st.write_stream`) to get text pieces; afterwards
+    `schedule` holds the normalized schedule and `text` its full rendering.
+    Raises ValueError at the end if the answer is not a valid schedule.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = chunks
+        self.schedule: dict | None = None
+        self.text = ""
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = json.JSONDecoder()
+        buf, pos, shown = "", None, 0
+        for chunk in self.chunks:
+            buf += chunk
+            if pos is None:
+                m = _COURSES_RE.search(buf)
+                if not m:
+                    continue
+                pos = m.end()
+            # emit every course object that is complete so far
+            while pos is not None:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buf) or buf[pos] == "]":
+                    break
+                try:
+                    obj, pos = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                entry = normalize_entry(obj)
+                if entry:
+                    yield from self._emit((_HEADER if not shown else "") + render_entry(entry) + "\n")
+                    shown += 1
+
+        self.schedule = parse_schedule_json(buf)
+        if not shown:
+            yield from self._emit(_HEADER + "".join(render_entry(e) + "\n" for e in self.schedule["courses"]))
+        yield from self._emit(_render_tail(self.schedule))
+        self.text = self.text.strip()
+
+    def _emit(self, piece: str) -> Iterator[str]:
+        if piece:
+            self.text += piece
+            yield piece
+
+
+def schedule_from_sections(catalog: CourseCatalog, sections: Iterable[int],
+                           degree_requirements: str = "") -> dict:
+    """Structured schedule of catalog sections (e.g. the local engine's answer)."""
+    required = codes_in_text(degree_requirements)
+    courses = []
+    for i in sections:
+        sec = catalog.sections[i]
+        if sec.code in required:
+            category = "Core"
+        elif sec.course_type == "General Education course":
+            category = "General Education"
+        else:
+            category = "Elective"
+        for days, start, end in catalog.meetings.meetings(i):
+            courses.append({
+                "code": sec.code,
+                "title": str(sec.title or ""),
+                "section": str(sec.section or ""),
+                "days": format_days(days),
+                "start": format_clock(start),
+                "end": format_clock(end),
+                "instructor": str(sec.instructor or ""),
+                "category": category,
+            })
+    return {"courses": courses, "factors": [], "notes": ""}
+
+
+def calendar_courses(schedule: dict) -> list[dict]:
+    """Per-course display rows: name, sessions [(day, 'start-end')], instructor."""
+    out = []
+    for e in schedule["courses"]:
+        name = f"{e['code']} {e['title'].title()}".strip()
+        out.append({
+            "name": name,
+            "sessions": [(day, f"{e['start']}-{e['end']}") for day in e["days"]],
+            "instructor": e["instructor"],
+        })
+    return out
@@ -0,0 +1,129 @@
+# api_logic/transcript_parser.py
+"""
+Local parser for AUA / Jenzabar transcript PDFs (after PyPDF2 text extraction).
+
+Pulls course code, title, credits, grade and term from each course row and
+reports a confidence score. Only when confidence is low does the upload fall
+back to the Gemini extractor, so the common case needs no LLM round trip.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from api_logic.gemini_api import process_pdf_with_gemini
+
+MIN_CONFIDENCE = 0.8
+
+_TERM_RE = re.compile(
+    r'\b(?:(?P<season>Fall|Spring|Summer)\s+(?:Semester\s+|Term\s+)?,?\s*(?P<year>\d{4})'
+    r'|(?P<y1>\d{4})\s*[-/]\s*(?P<y2>\d{2,4})\s+(?P<season2>Fall|Spring|Summer))\b',
+    re.IGNORECASE,
+)
+_COURSE_RE = re.compile(r'^\s*(?P<prefix>[A-Z]{2,6})\s?(?P<num>\d{3}[A-Z]?)\b\s*(?P<rest>.*)$')
+_GRADE_RE = re.compile(r'^(?:A|A-|B\+|B|B-|C\+|C|C-|D\+|D|D-|F|P|NP|W|WF|WP|I|IP|TR|CR|AU)$')
+# credits / quality points are printed with decimals ("3.00"); bare integers belong to titles
+_NUMBER_RE = re.compile(r'^\d+\.\d+$')
+
+# grades that do not count as a completed (or in-progress) course
+NOT_COMPLETED = {"F", "NP", "W", "WF", "WP", "I", "AU"}
+
+
+@dataclass
+class TranscriptCourse:
+    code: str
+    title: str
+    grade: str | None
+    credits: float | None
+    term: str | None
+
+    @property
+    def completed(self) -> bool:
+        return self.grade not in NOT_COMPLETED
+
+
+@dataclass
+class TranscriptParse:
+    courses: list[TranscriptCourse] = field(default_factory=list)
+    course_lines: int = 0      # lines that start with a course code
+    parsed_lines: int = 0      # ... of which yielded a full course row
+    confidence: float = 0.0
+
+    def as_list(self) -> str:
+        """Numbered list in the same shape the Gemini extractor returns."""
+        out = []
+        for n, c in enumerate((c for c in self.courses if c.completed), start=1):
+            extra = ", ".join(x for x in (c.grade, c.term) if x)
+            out.append(f"{n}. {c.code} {c.title}" + (f" ({extra})" if extra else ""))
+        return "\n".join(out)
+
+
+def _parse_row(m: re.Match, term: str | None) -> TranscriptCourse | None:
+    tokens = m.group("rest").split()
+    # trailing columns are credits / grade / quality points in any order
+    grade, credits = None, None
+    cut = len(tokens)
+    while cut > 0 and (_NUMBER_RE.match(tokens[cut - 1]) or _GRADE_RE.match(tokens[cut - 1])):
+        cut -= 1
+    for tok in tokens[cut:]:
+        if _GRADE_RE.match(tok) and grade is None:
+            grade = tok
+        elif _NUMBER_RE.match(tok) and credits is None:
+            credits = float(tok)
+
+    title = " ".join(tokens[:cut]).strip(" -–:")
+    if not title or (grade is None and credits is None):
+        return None
+    return TranscriptCourse(
+        code=m.group("prefix") + m.group("num"),
+        title=title.title() if title.isupper() else title,
+        grade=grade,
+        credits=credits,
+        term=term,
+    )
+
+
+def parse_transcript(text: str) -> TranscriptParse:
+    result = TranscriptParse()
+    term = None
+    seen: dict[str, int] = {}
+
+    for line in (text or "").splitlines():
+        t = _TERM_RE.search(line)
+        if t and not _COURSE_RE.match(line):
+            if t.group("season"):
+                term = f"{t.group('season').title()} {t.group('year')}"
+            else:
+                term = f"{t.group('season2').title()} {t.group('y1')}-{t.group('y2')}"
+            continue
+
+        m = _COURSE_RE.match(line)
+        if not m:
+            continue
+        result.course_lines += 1
+        course = _parse_row(m, term)
+        if course is None:
+            continue
+        result.parsed_lines += 1
+        # a retaken course keeps its latest attempt
+        if course.code in seen:
+            result.courses[seen[course.code]] = course
+        else:
+            seen[course.code] = len(result.courses)
+            result.courses.append(course)
+
+    if result.course_lines:
+        coverage = result.parsed_lines / result.course_lines
+        # a couple of matched rows in a long document is not a transcript
+        result.confidence = coverage * min(1.0, len(result.courses) / 3)
+    return result
+
+
+def extract_transcript_courses(pdf_text: str) -> str:
+    """
+    Completed courses from transcript text: parsed locally when confident,
+    otherwise extracted by Gemini.
+    """
+    parsed = parse_transcript(pdf_text)
+    if parsed.confidence >= MIN_CONFIDENCE:
+        return parsed.as_list()
+    return process_pdf_with_gemini(pdf_text)
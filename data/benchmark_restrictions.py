@@ -0,0 +1,142 @@
+"""
+benchmark_restrictions.py
+
+Golden check and benchmark for the vectorized `extract_restrictions`.
+
+  1. Golden check: the vectorized function must reproduce, row for row, the
+     original per-row loop on the descriptions in courses.csv (and on the
+     synthetic catalog below).
+  2. Benchmark: both implementations on a synthetic 50k-section catalog built
+     by resampling real descriptions and splicing in restriction phrases.
+
+Run from the repository root:  python -m data.benchmark_restrictions [--rows N]
+"""
+
+import argparse
+import re
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.data_processing import (
+    NO_RESTRICTION,
+    RESTRICTION_EXCLUSIONS,
+    extract_restrictions,
+    output_csv,
+)
+
+# The patterns as originally written (unanchored first pattern)
+LEGACY_PATTERNS = [
+    re.compile(r'([^.]*\bnot as [^.\)\]]+\b[^.]*)', re.IGNORECASE),
+    re.compile(r'(Not open to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE),
+    re.compile(r'(Not available to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE),
+    re.compile(r'\[([^\]]*not open to[^\]]*)\]', re.IGNORECASE),
+]
+
+SPLICES = [
+    "Not open to students who have completed {code}.",
+    "[not open to freshmen]",
+    "This course does not count as a general education course for majors.",
+    "It is not available to graduate students.",
+    "Students may not take this course as a general education course.",
+    "Not specified.",
+    "This is not necessarily a lab course.",
+]
+
+
+def extract_restrictions_loop(df: pd.DataFrame) -> pd.DataFrame:
+    """The original row-by-row implementation, kept as the golden reference."""
+    out = df.copy()
+    has_not = out['course_description'].str.contains(
+        r'\bnot\b', flags=re.IGNORECASE, na=False, regex=True
+    )
+    excl_pattern = "|".join(RESTRICTION_EXCLUSIONS)
+    is_false_positive = out['course_description'].str.contains(
+        excl_pattern, flags=re.IGNORECASE, na=False, regex=True
+    )
+    mask = has_not & ~is_false_positive
+
+    restrictions: list[Optional[str]] = []
+    for desc, keep in zip(out['course_description'].fillna(""), mask):
+        if not keep:
+            restrictions.append(None)
+            continue
+
+        snippet: Optional[str] = None
+        for pat in LEGACY_PATTERNS:
+            m = pat.search(desc)
+            if m:
+                snippet = m.group(1) if m.lastindex else m.group(0)
+                snippet = snippet.strip()
+                break
+
+        if snippet is None:
+            for sentence in re.split(r'(?<=[.?!])\s+', desc):
+                if (re.search(r'\bnot\b', sentence, flags=re.IGNORECASE)
+                    and not re.search(excl_pattern, sentence, flags=re.IGNORECASE)):
+                    snippet = sentence.strip()
+                    break
+
+        restrictions.append(snippet)
+
+    out['restriction'] = restrictions
+    out['restriction'] = out['restriction'].fillna(NO_RESTRICTION)
+    return out
+
+
+def synthetic_catalog(base: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Resample real descriptions and splice restriction phrases into ~half of them."""
+    rng = np.random.default_rng(seed)
+    descs = base['course_description'].to_numpy()[rng.integers(0, len(base), rows)]
+    codes = base['course_code'].to_numpy()[rng.integers(0, len(base), rows)]
+    picks = rng.integers(0, len(SPLICES) * 2, rows)
+    out = []
+    for desc, code, pick in zip(descs, codes, picks):
+        if pick < len(SPLICES):
+            phrase = SPLICES[pick].format(code=code)
+            desc = f"{phrase} {desc}" if pick % 2 else f"{desc} {phrase}"
+        out.append(desc)
+    return pd.DataFrame({'course_code': codes, 'course_description': out})
+
+
+def _timed(fn, df: pd.DataFrame) -> tuple[pd.Series, float]:
+    t0 = time.perf_counter()
+    result = fn(df)['restriction']
+    return result, time.perf_counter() - t0
+
+
+def _check(name: str, expected: pd.Series, actual: pd.Series) -> bool:
+    diff = np.flatnonzero(expected.to_numpy() != actual.to_numpy())
+    if len(diff):
+        i = diff[0]
+        print(f"{name}: {len(diff)} mismatches, first at row {i}:\n"
+              f"  loop:       {expected.iloc[i]!r}\n  vectorized: {actual.iloc[i]!r}")
+        return False
+    print(f"{name}: identical ({len(expected)} rows)")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000, help="synthetic catalog size")
+    args = parser.parse_args()
+
+    courses = pd.read_csv(output_csv, usecols=['course_code', 'course_description'])
+    ok = _check("golden courses.csv",
+                extract_restrictions_loop(courses)['restriction'],
+                extract_restrictions(courses)['restriction'])
+
+    synth = synthetic_catalog(courses, args.rows)
+    expected, loop_s = _timed(extract_restrictions_loop, synth)
+    actual, vec_s = _timed(extract_restrictions, synth)
+    ok &= _check(f"synthetic {args.rows:,}", expected, actual)
+
+    print(f"loop:       {loop_s * 1000:8.1f} ms")
+    print(f"vectorized: {vec_s * 1000:8.1f} ms  ({loop_s / vec_s:.1f}x)")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
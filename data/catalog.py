@@ -0,0 +1,389 @@
+"""
+catalog.py
+
+Process-wide course catalog service.
+
+The catalog is parsed once per process and shared read-only by every
+Streamlit session. By default it is the active term's partition from the term
+store (data/terms/, see data.term_store), falling back to courses.csv when the
+store is empty; other terms are loaded on demand with `get_catalog(term=…)`.
+Its serialized forms are computed at load time, and a file is only re-read
+when its mtime changes *and* its content hash differs from the snapshot
+already in memory.
+
+Consumers must treat `CourseCatalog.df` as read-only; take a `.copy()` before
+mutating it.
+
+The snapshot is kept compact: repeated strings (course types, restrictions,
+themes, descriptions shared by sections of one course…) are stored as pandas
+categoricals, every course code gets a dense integer ID with a CSR index of
+its sections, and row access goes through `__slots__` Section records instead
+of materializing a pandas row.
+"""
+
+import dataclasses
+import hashlib
+import io
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.data_processing import ConflictMatrix, MeetingTimes, compile_meeting_times, parse_clock
+from data.prerequisites import CODE_RE, PREREQ_JSON, PrerequisiteGraph
+from data.term_store import Term, active_term, partition_path, prerequisites_path
+
+DATA_DIR = Path(__file__).resolve().parent
+COURSES_CSV = DATA_DIR / "courses.csv"
+# conflict matrices are cached here per catalog version and memory-mapped back
+CACHE_DIR = DATA_DIR / ".cache"
+# snapshots kept in memory at once (the active term plus a few on-demand terms)
+MAX_SNAPSHOTS = 3
+
+_TIME_RANGE_RE = re.compile(r'(\d{1,2}:\d{2}\s*[ap]m)\s*-\s*(\d{1,2}:\d{2}\s*[ap]m)', re.IGNORECASE)
+
+
+def canonical_code(code: str) -> str:
+    """'cs 340' → 'CS340' (the form used in courses.csv)."""
+    return re.sub(r'\s+', '', str(code)).upper()
+
+
+def codes_in_text(text: str) -> set[str]:
+    """All canonical course codes mentioned in free text (transcripts, requirements)."""
+    return {a + b for a, b in CODE_RE.findall(text or "")}
+
+logger = logging.getLogger(__name__)
+
+
+class Section:
+    """One catalog row (section), with its dense section and course IDs."""
+
+    __slots__ = ("id", "course_id", "code", "title", "section", "instructor", "times",
+                 "location", "themes", "course_type", "course_level")
+
+    def __init__(self, id, course_id, code, title, section, instructor, times,
+                 location, themes, course_type, course_level):
+        self.id = id
+        self.course_id = course_id
+        self.code = code
+        self.title = title
+        self.section = section
+        self.instructor = instructor
+        self.times = times
+        self.location = location
+        self.themes = themes
+        self.course_type = course_type
+        self.course_level = course_level
+
+    def __repr__(self) -> str:
+        return f"Section({self.id}, {self.code} {self.section!r}, {self.times!r})"
+
+
+@dataclass(frozen=True)
+class CourseCatalog:
+    """
+    One immutable snapshot of the course catalog.
+
+    Attributes:
+        df:           The parsed catalog (shared, do not mutate).
+        csv_text:     Precomputed `df.to_csv(index=False)` used in prompts.
+        meetings:     Compiled meeting times, one entry per row of df.
+        conflicts:    Pairwise section time-overlap matrix (packed bitsets).
+        sections:     One Section record per row of df (section ID = row index).
+        course_codes: Canonical course code per dense course ID.
+        code_ids:     Canonical course code → course ID.
+        course_ids:   Course ID of every section (int32, one per row).
+        course_index: CSR offsets; sections of course c are
+                      course_rows[course_index[c]:course_index[c + 1]].
+        course_rows:  Section IDs grouped by course.
+        prereqs:      Compiled prerequisite DAG (bitsets over interned course IDs).
+        path:         File the snapshot was loaded from.
+        mtime:        Modification time of `path` when last checked.
+        sha256:       Content hash of the raw file.
+        loaded_at:    Wall-clock time (epoch seconds) of the load.
+        load_seconds: Time spent reading, parsing and serializing.
+        nbytes:       Approximate in-memory footprint of the snapshot.
+    """
+    df: pd.DataFrame
+    csv_text: str
+    meetings: MeetingTimes
+    conflicts: ConflictMatrix
+    sections: tuple[Section, ...]
+    course_codes: tuple[str, ...]
+    code_ids: dict[str, int]
+    course_ids: np.ndarray
+    course_index: np.ndarray
+    course_rows: np.ndarray
+    prereqs: PrerequisiteGraph
+    path: Path
+    mtime: float
+    sha256: str
+    loaded_at: float
+    load_seconds: float
+    nbytes: int
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying this catalog version."""
+        return self.sha256[:12]
+
+    def course_id(self, code: str) -> int | None:
+        return self.code_ids.get(canonical_code(code))
+
+    def sections_of(self, code: str) -> np.ndarray:
+        """Section IDs of a course (empty if the code is not in the catalog)."""
+        cid = self.course_id(code)
+        if cid is None:
+            return self.course_rows[:0]
+        return self.course_rows[self.course_index[cid]:self.course_index[cid + 1]]
+
+    def sections_in_text(self, text: str) -> list[int]:
+        """
+        Resolve the course sections a free-text schedule refers to.
+
+        Each line's course code is looked up in the catalog; when the course has
+        several sections, the one whose start time (then instructor) appears on
+        the same line is chosen.
+        """
+        found: list[int] = []
+        for line in text.splitlines():
+            m = CODE_RE.search(line)
+            if not m:
+                continue
+            rows = self.sections_of(m.group(1) + m.group(2))
+            if not len(rows):
+                continue
+            found.append(self._pick_section(rows, line))
+        return list(dict.fromkeys(found))
+
+    def _pick_section(self, rows, line: str) -> int:
+        if len(rows) == 1:
+            return int(rows[0])
+        t = _TIME_RANGE_RE.search(line)
+        if t:
+            start = parse_clock(t.group(1))
+            for i in rows:
+                if any(s == start for _, s, _ in self.meetings.meetings(i)):
+                    return int(i)
+        lowered = line.lower()
+        for i in rows:
+            instructor = self.sections[i].instructor
+            if isinstance(instructor, str) and instructor.lower() in lowered:
+                return int(i)
+        return int(rows[0])
+
+    def describe_section(self, i: int) -> str:
+        sec = self.sections[i]
+        return f"{sec.code} ({sec.times})"
+
+    def schedule_conflicts(self, text: str) -> list[tuple[int, int]]:
+        """Overlapping section pairs in a free-text schedule (empty ⇒ conflict-free)."""
+        return self.conflicts.conflicting_pairs(self.sections_in_text(text))
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "sections": len(self.df),
+            "courses": len(self.course_codes),
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_seconds * 1000, 2),
+            "memory_bytes": self.nbytes,
+        }
+
+
+_lock = threading.Lock()
+_snapshots: OrderedDict[Path, CourseCatalog] = OrderedDict()
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Store each text column as a categorical when that is smaller."""
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype != object:
+            continue
+        cat = out[col].astype("category")
+        if cat.memory_usage(deep=True) < out[col].memory_usage(deep=True):
+            out[col] = cat
+    return out
+
+
+def _sections(df: pd.DataFrame, course_ids: np.ndarray,
+              course_codes: tuple[str, ...]) -> tuple[Section, ...]:
+    cols = [np.asarray(df[c], dtype=object) for c in (
+        "course_title", "section", "instructor", "times", "location", "themes",
+        "course_type", "course_level")]
+    return tuple(
+        Section(i, int(cid), course_codes[cid], *values)
+        for i, (cid, *values) in enumerate(zip(course_ids, *cols))
+    )
+
+
+def _build(path: Path, raw: bytes, digest: str, mtime: float, read_seconds: float) -> CourseCatalog:
+    t0 = time.perf_counter()
+    if path.suffix == ".parquet":
+        parsed = pd.read_parquet(io.BytesIO(raw))
+    else:
+        parsed = pd.read_csv(io.BytesIO(raw))
+    csv_text = parsed.to_csv(index=False)
+    df = _compact(parsed)
+    meetings = compile_meeting_times(df["times"])
+    conflicts = _load_or_build_conflicts(meetings, digest)
+
+    # dense course IDs (categorical codes over canonical course codes) + CSR index
+    keys = pd.Categorical(df["course_code"].astype(str).map(canonical_code))
+    course_codes = tuple(sys.intern(c) for c in keys.categories)
+    course_ids = keys.codes.astype(np.int32)
+    course_rows = np.argsort(course_ids, kind="stable").astype(np.int32)
+    course_index = np.zeros(len(course_codes) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(course_ids, minlength=len(course_codes)), out=course_index[1:])
+    sections = _sections(df, course_ids, course_codes)
+
+    prereqs = _load_or_build_prereqs(df, digest, path)
+    load_seconds = read_seconds + time.perf_counter() - t0
+
+    df_bytes = int(df.memory_usage(deep=True).sum())
+    nbytes = (
+        df_bytes
+        + sys.getsizeof(csv_text)
+        + sum(a.nbytes for a in (meetings.offsets, meetings.section, meetings.day_mask,
+                                 meetings.start_min, meetings.end_min))
+        + conflicts.bits.nbytes
+        + sum(sys.getsizeof(s) for s in sections)
+        + course_ids.nbytes + course_rows.nbytes + course_index.nbytes
+    )
+    logger.info("Compacted catalog columns %d → %d bytes",
+                int(parsed.memory_usage(deep=True).sum()), df_bytes)
+    catalog = CourseCatalog(
+        df=df,
+        csv_text=csv_text,
+        meetings=meetings,
+        conflicts=conflicts,
+        sections=sections,
+        course_codes=course_codes,
+        code_ids={code: i for i, code in enumerate(course_codes)},
+        course_ids=course_ids,
+        course_index=course_index,
+        course_rows=course_rows,
+        prereqs=prereqs,
+        path=path,
+        mtime=mtime,
+        sha256=digest,
+        loaded_at=time.time(),
+        load_seconds=load_seconds,
+        nbytes=nbytes,
+    )
+    logger.info("Loaded course catalog %s", catalog.stats())
+    return catalog
+
+
+def _load_or_build_conflicts(meetings: MeetingTimes, digest: str) -> ConflictMatrix:
+    """Memory-map the cached matrix for this catalog version, or build and cache it."""
+    cache = CACHE_DIR / f"conflicts-{digest[:12]}.npy"
+    if cache.exists():
+        try:
+            matrix = ConflictMatrix.load(cache)
+            if matrix.n == len(meetings):
+                return matrix
+        except (OSError, ValueError) as err:
+            logger.warning("Ignoring unreadable conflict cache %s: %s", cache, err)
+
+    matrix = ConflictMatrix.build(meetings)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        matrix.save(cache)
+    except OSError as err:
+        logger.warning("Could not cache conflict matrix: %s", err)
+    return matrix
+
+
+def _load_or_build_prereqs(df: pd.DataFrame, digest: str, path: Path) -> PrerequisiteGraph:
+    """
+    Use the persisted prerequisite graph if it was compiled from this file:
+    prerequisites.json for courses.csv, the graph next to a term partition.
+    A missing or stale partition graph is compiled and written back.
+    """
+    graph_path = prerequisites_path(path) if path.suffix == ".parquet" else PREREQ_JSON
+    if graph_path.exists():
+        try:
+            graph = PrerequisiteGraph.load(graph_path)
+            if graph.source_sha256 == digest:
+                return graph
+        except (OSError, ValueError, KeyError) as err:
+            logger.warning("Ignoring unreadable prerequisite graph %s: %s", graph_path, err)
+    logger.warning("Prerequisite graph %s missing or stale; compiling it from the catalog", graph_path.name)
+    graph = PrerequisiteGraph.build(df, digest)
+    if path.suffix == ".parquet":
+        try:
+            graph.save(graph_path)
+        except OSError as err:
+            logger.warning("Could not save prerequisite graph: %s", err)
+    return graph
+
+
+def default_catalog_path() -> Path:
+    """The active term's partition, or courses.csv if the term store is empty."""
+    term = active_term()
+    return partition_path(term) if term is not None else COURSES_CSV
+
+
+def get_catalog(path: Path | None = None, term: Term | str | None = None) -> CourseCatalog:
+    """
+    Return the shared catalog snapshot, reloading it only if the file changed.
+
+    A cheap `stat()` is done on every call; the file is hashed only when its
+    mtime moved, and re-parsed only when the hash differs.
+
+    Args:
+        path: Catalog file to load (CSV or Parquet); overrides `term`.
+        term: Term to load from the term store, e.g. Term(202425, 1) or
+              "202425-1". Defaults to the active term.
+
+    Raises:
+        FileNotFoundError: if the catalog file (or term partition) does not exist.
+    """
+    if path is None:
+        if term is not None:
+            path = partition_path(Term.parse(term) if isinstance(term, str) else term)
+        else:
+            path = default_catalog_path()
+    path = Path(path)
+    mtime = path.stat().st_mtime
+
+    cur = _snapshots.get(path)
+    if cur is not None and cur.mtime == mtime:
+        return cur
+
+    with _lock:
+        cur = _snapshots.get(path)
+        if cur is not None and cur.mtime == mtime:
+            _snapshots.move_to_end(path)
+            return cur
+
+        t0 = time.perf_counter()
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        read_seconds = time.perf_counter() - t0
+
+        if cur is not None and cur.sha256 == digest:
+            # touched but unchanged → keep the parsed snapshot
+            snapshot = dataclasses.replace(cur, mtime=mtime)
+        else:
+            snapshot = _build(path, raw, digest, mtime, read_seconds)
+        _snapshots[path] = snapshot
+        _snapshots.move_to_end(path)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+        return snapshot
+
+
+def catalog_stats() -> dict:
+    """Load time and memory footprint of every snapshot in memory, by file."""
+    return {str(path): cat.stats() for path, cat in list(_snapshots.items())}
@@ -0,0 +1,96 @@
+"""
+course_classification.py
+
+Course-code classification shared by every pipeline that writes a schedule
+CSV (data/data_processing.py and the Authomating scripts):
+
+  - course level from the first digit in the code
+      0 → "Other", 1 → "Lower level", 2 → "Upper level", 3 → "Masters level",
+      "Corequisite" → "Corequisite level", anything else → "Unknown level"
+  - course type from the alphabetic prefix, via MAJOR_MAP
+      "Corequisite" → "Corequisite course", an unmapped prefix → the prefix
+      itself, a missing / non-text code → "Unknown major"
+
+Both work on a whole Series with `str.extract` and return categorical
+columns; the scalar helpers are thin wrappers for one-off lookups.
+"""
+
+import pandas as pd
+
+MAJOR_MAP = {
+    "BSN": "Nursing Program's core or track elective course",
+    "BUS": "Business Program's core or track elective course",
+    "CHSS": "General Education course",
+    "CS": "Computer Science Program's core or track elective course",
+    "DS": "Data Science Program's core or track elective course",
+    "CSE": "General Education course",
+    "EC": "English and Communications Program's core or track elective course",
+    "ECM": "ECM Program's core or track elective course",
+    "ECON": "Economics Program's core or track elective course",
+    "ENGS": "Engineering Sciences Program's core or track elective course",
+    "ENV": "Environmental and Sustainability Sciences Program's core or track elective course",
+    "ESS": "Environmental and Sustainability Sciences Program's core or track elective course",
+    "FND": "General Education course",
+    "HHM": "HHM Program's core or track elective course",
+    "HRSJ": "Human Rights and Social Justice Program's core or track elective course",
+    "IESM": "Industrial Engineering and Systems Management Program's core or track elective course",
+    "IRD": "International Relations and Diplomacy Program's core or track elective course",
+    "LAW": "Laws Program's core or track elective course",
+    "MGMT": "MGMT Program's core or track elective course",
+    "PA": "Public Affairs Program's core or track elective course",
+    "PEER": "Peer Mentoring course",
+    "PG": "Politics and Governance Program's core or track elective course",
+    "PH": "Public Health Program's core or track elective course",
+    "PSIA": "Political Science and International Affairs Program's core or track elective course",
+    "TEFL": "Teaching English as a Foreign Language Program's core or track elective course",
+    "CBE": "CBE Program's core or track elective course"
+}
+
+LEVEL_BY_DIGIT = {
+    '0': "Other",
+    '1': "Lower level",
+    '2': "Upper level",
+    '3': "Masters level",
+}
+COREQUISITE_LEVEL = "Corequisite level"
+UNKNOWN_LEVEL = "Unknown level"
+COREQUISITE_TYPE = "Corequisite course"
+UNKNOWN_TYPE = "Unknown major"
+
+LEVEL_DTYPE = pd.CategoricalDtype(
+    [*LEVEL_BY_DIGIT.values(), COREQUISITE_LEVEL, UNKNOWN_LEVEL]
+)
+
+
+def _text(codes: pd.Series) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """Codes as text (NaN for non-strings), the is-text mask, and the corequisite mask."""
+    is_text = codes.map(lambda v: isinstance(v, str)).astype(bool)
+    text = codes.where(is_text).astype(object)
+    coreq = text.str.strip().str.lower().eq("corequisite").fillna(False).astype(bool)
+    return text, is_text, coreq
+
+
+def course_levels(codes: pd.Series) -> pd.Series:
+    """Categorical course level for every code in `codes`."""
+    text, _, coreq = _text(codes)
+    level = text.str.extract(r'(\d)', expand=False).map(LEVEL_BY_DIGIT)
+    level = level.mask(coreq, COREQUISITE_LEVEL).fillna(UNKNOWN_LEVEL)
+    return level.astype(LEVEL_DTYPE)
+
+
+def course_types(codes: pd.Series) -> pd.Series:
+    """Categorical course type (owning program) for every code in `codes`."""
+    text, is_text, coreq = _text(codes)
+    upper = text.str.upper()
+    prefix = text.str.extract(r'^([A-Za-z]+)', expand=False).str.upper().fillna(upper)
+    ctype = prefix.map(MAJOR_MAP).fillna(prefix)
+    ctype = ctype.mask(coreq, COREQUISITE_TYPE).where(is_text, UNKNOWN_TYPE)
+    return ctype.astype("category")
+
+
+def course_level(code) -> str:
+    return str(course_levels(pd.Series([code], dtype=object)).iloc[0])
+
+
+def course_type(code) -> str:
+    return str(course_types(pd.Series([code], dtype=object)).iloc[0])
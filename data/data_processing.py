@@ -8,30 +8,62 @@ Loads raw course data from JSON, cleans and transforms it, and enriches with:
   - Mapping of course codes to full course-type descriptions
 
 Finally, writes the fully enriched table out to courses.csv.
+
+The result is also published into the term-partitioned store
+(data/terms/<year>-<semester>.parquet, see data/term_store.py), which is what
+the app loads.
+
+Rebuilds are incremental: every source record is fingerprinted, a manifest of
+(section key, fingerprint) per CSV row is kept in data/.cache, and only new or
+changed records go through the pipeline again. The merged CSV is published
+with an atomic rename, so the catalog never sees a half-written file, and the
+run reports a change set of added / removed / modified sections.
+
+Also compiles the free-text `times` column into a compact array-backed
+meeting model (day bitmask + start/end minutes) that the catalog builds once
+per load, so nothing in the request path has to re-parse time strings.
+
+Run from the repository root:  python -m data.data_processing [--full]
 """
 
+import argparse
+import hashlib
+import io
 import json
+import os
+import numpy as np
 import pandas as pd
 import re
 import ast
+from collections import Counter
+from dataclasses import dataclass, field
 from typing import List, Optional
 from pathlib import Path
 
+from data.course_classification import course_levels, course_types
+
 DATA_DIR = Path(__file__).resolve().parent
 json_path = DATA_DIR / "courses.json"
 
+def load_course_records(json_path: str) -> list[dict]:
+    """Load the raw course records (one per section) from the scraped JSON."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def load_and_clean_courses(json_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Load courses from a JSON file, compute missing-value summary,
-    fill default texts, drop unwanted columns, transform themes into
-    human-readable sentences (in-place), and return cleaned DataFrame
-    plus the missing-value summary DataFrame.
+    Load courses from a JSON file and clean them (see clean_courses).
     """
-    # load & normalize
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    df = pd.json_normalize(data)
+    return clean_courses(pd.json_normalize(load_course_records(json_path)))
 
+
+def clean_courses(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute missing-value summary, fill default texts, drop unwanted columns,
+    transform themes into human-readable sentences (in-place), and return
+    cleaned DataFrame plus the missing-value summary DataFrame.
+    """
     # empty strings → NA
     df = df.replace('', pd.NA)
 
@@ -81,185 +113,415 @@ def load_and_clean_courses(json_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
 
 
 
+# Generic 'not' phrases that aren't real restrictions
+RESTRICTION_EXCLUSIONS = [
+    r'\bNot specified\b',
+    r'Note:',
+    r'\bnot limited\b',
+    r'\bnot covered by other\b',
+    r'\bnot necessarily\b',
+    r'\bshaped not\b',
+    r'does not meet'
+]
+
+# Usual restriction patterns, in priority order (first match wins). Each is
+# paired with a literal phrase it cannot match without, used as a cheap
+# case-insensitive prefilter so the regex only runs on candidate rows.
+RESTRICTION_PATTERNS = [
+    # full clause around "not as a general education course", etc. The clause
+    # is anchored to a sentence start: same match as an unanchored search, but
+    # without retrying `[^.]*` from every position (quadratic per sentence).
+    ("not as ", re.compile(r'(?:^|(?<=\.))([^.]*\bnot as [^.\)\]]+\b[^.]*)', re.IGNORECASE)),
+    # classic "Not open to …" or "Not available to …"
+    ("not open to ", re.compile(r'(Not open to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE)),
+    ("not available to ", re.compile(r'(Not available to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE)),
+    # bracketed "[not open to …]"
+    ("not open to", re.compile(r'\[([^\]]*not open to[^\]]*)\]', re.IGNORECASE)),
+]
+
+NO_RESTRICTION = "No restrictions, except that any prerequisites must already be completed"
+
+
 def extract_restrictions(df: pd.DataFrame) -> pd.DataFrame:
     """
     Scans df['course_description'] for true restriction clauses (e.g. "Not open to…",
     "[not open to…]", or full sentences containing 'not'), filters out false-positives,
     extracts the relevant snippet into a new column 'restriction', and fills in
     'No restriction' where nothing was found.
+
+    Vectorized: each pattern runs once over the whole column with
+    `Series.str.extract`, and the sentence fallback explodes the remaining
+    descriptions into sentences instead of looping row by row.
     """
     # 1) Work on a copy so we don’t modify the original
     out = df.copy()
-
-    # 2) Build mask of rows that contain a standalone "not"
-    has_not = out['course_description'].str.contains(
-        r'\bnot\b', flags=re.IGNORECASE, na=False, regex=True
-    )
-
-    # 3) Exclude generic 'not' phrases that aren’t real restrictions
-    exclusions = [
-        r'\bNot specified\b',
-        r'Note:',
-        r'\bnot limited\b',
-        r'\bnot covered by other\b',
-        r'\bnot necessarily\b',
-        r'\bshaped not\b',
-        r'does not meet'
-    ]
-    excl_pattern = "|".join(exclusions)
-    is_false_positive = out['course_description'].str.contains(
-        excl_pattern, flags=re.IGNORECASE, na=False, regex=True
-    )
-
-    # 4) Final boolean mask of rows to examine
-    mask = has_not & ~is_false_positive
-
-    # 5) Define regexes to capture the usual restriction patterns
-    patterns = [
-        # full clause around "not as a general education course", etc.
-        re.compile(r'([^.]*\bnot as [^.\)\]]+\b[^.]*)', re.IGNORECASE),
-        # classic "Not open to …" or "Not available to …"
-        re.compile(r'(Not open to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE),
-        re.compile(r'(Not available to [^.\)\]]+)(?:[.\)\]]|$)', re.IGNORECASE),
-        # bracketed "[not open to …]"
-        re.compile(r'\[([^\]]*not open to[^\]]*)\]', re.IGNORECASE),
-    ]
-
-    # 6) Loop through each description, extract the first matching snippet
-    restrictions: list[Optional[str]] = []
-    for desc, keep in zip(out['course_description'].fillna(""), mask):
-        if not keep:
-            restrictions.append(None)
-            continue
-
-        snippet: Optional[str] = None
-        # 6a) Try each pattern in turn
-        for pat in patterns:
-            m = pat.search(desc)
-            if m:
-                # Prefer the first capture group if present
-                snippet = m.group(1) if m.lastindex else m.group(0)
-                snippet = snippet.strip()
-                break
-
-        # 6b) Fallback: grab the entire sentence containing ' not ' if nothing matched
-        if snippet is None:
-            for sentence in re.split(r'(?<=[.?!])\s+', desc):
-                if (re.search(r'\bnot\b', sentence, flags=re.IGNORECASE)
-                    and not re.search(excl_pattern, sentence, flags=re.IGNORECASE)):
-                    snippet = sentence.strip()
-                    break
-
-        restrictions.append(snippet)
-
-    # 7) Append to DataFrame
-    out['restriction'] = restrictions
-
-    # 8) Fill all None/NaN with "No restriction"
-    out['restriction'] = out['restriction'].fillna("No restrictions, except that any prerequisites must already be completed")
+    # positional index, so duplicate labels in `df` can't mis-align the merge below
+    desc = pd.Series(out['course_description'].fillna("").astype(str).to_numpy())
+
+    # 2) Rows that contain a standalone "not" and none of the generic phrases.
+    #    Every exclusion starts with n/s/d; the lookahead lets the regex skip
+    #    all other positions without trying each alternative.
+    excl_pattern = "|".join(RESTRICTION_EXCLUSIONS)
+    has_not = desc.str.contains(r'\bnot\b', flags=re.IGNORECASE, regex=True)
+    todo = desc[has_not]
+    is_false_positive = todo.str.contains(f'(?=[nsd])(?:{excl_pattern})', flags=re.IGNORECASE, regex=True)
+    todo = todo[~is_false_positive]
+
+    # 3) First matching pattern per row (earlier patterns take priority)
+    snippet = pd.Series(np.nan, index=todo.index, dtype=object)
+    for literal, pat in RESTRICTION_PATTERNS:
+        pending = todo[snippet.isna()]
+        pending = pending[pending.str.contains(literal, case=False, regex=False)]
+        if not pending.empty:
+            snippet = snippet.fillna(pending.str.extract(pat, expand=False))
+    snippet = snippet.str.strip()
+
+    # 4) Fallback: the first sentence containing 'not' (and no generic phrase)
+    rest = todo[snippet.isna()]
+    if not rest.empty:
+        sentences = rest.str.split(r'(?<=[.?!])\s+', regex=True).explode()
+        keep = (sentences.str.contains(r'\bnot\b', flags=re.IGNORECASE, regex=True)
+                & ~sentences.str.contains(excl_pattern, flags=re.IGNORECASE, regex=True))
+        first = sentences[keep].groupby(level=0).first().str.strip()
+        snippet = snippet.fillna(first)
+
+    # 5) Append to DataFrame; everything unmatched gets the default text
+    out['restriction'] = snippet.reindex(desc.index).fillna(NO_RESTRICTION).to_numpy()
 
     return out
 
 
 
 
-def assign_course_level(code: str) -> str:
+def enrich_courses(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Determine the Course Level based on the first digit in the course code:
-      - "Lower level"   if the first digit is 1
-      - "Upper level"   if the first digit is 2
-      - "Masters level" if the first digit is 3
-      - "Other"         if the first digit is 0
-      - "Corequisite level" if the code equals "Corequisite" (case-insensitive)
-      - "Unknown level" otherwise
+    Takes a cleaned DataFrame, appends 'restriction', 'Course Level', and 'Major',
+    and returns the enriched copy.
     """
-    if not isinstance(code, str):
-        return "Unknown level"
+    df2 = extract_restrictions(df)
+    df2['course_level']  = course_levels(df2['course_code'])
+    df2['course_type']   = course_types(df2['course_code'])
+    return df2
+
+
+# ─── Meeting-time model ─────────────────────────────────────────────
+DAYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+DAY_BITS = {day: 1 << i for i, day in enumerate(DAYS)}
 
-    # Special case: Corequisite
-    if code.strip().lower() == "corequisite":
-        return "Corequisite level"
+_MEETING_RE = re.compile(
+    r'\b(MON|TUE|WED|THU|FRI|SAT|SUN)\s+'
+    r'(\d{1,2}:\d{2}\s*[ap]m)\s*-\s*(\d{1,2}:\d{2}\s*[ap]m)',
+    re.IGNORECASE,
+)
 
-    # Find the first digit in the code
-    m = re.search(r'\d', code)
+
+def parse_clock(text: str) -> int:
+    """Convert a 12-hour clock string like '10:30am' to minutes after midnight."""
+    m = re.fullmatch(r'\s*(\d{1,2}):(\d{2})\s*([ap]m)\s*', text, re.IGNORECASE)
     if not m:
-        return "Unknown level"
-    first_digit = m.group(0)
+        raise ValueError(f"Unrecognised clock time: {text!r}")
+    hour, minute, ampm = int(m.group(1)) % 12, int(m.group(2)), m.group(3).lower()
+    return (hour + (12 if ampm == "pm" else 0)) * 60 + minute
 
-    # Map first digit to level
-    level_map = {
-        '0': "Other",
-        '1': "Lower level",
-        '2': "Upper level",
-        '3': "Masters level"
-    }
-    return level_map.get(first_digit, "Unknown level")
 
+def format_clock(minutes: int) -> str:
+    """Inverse of parse_clock: 630 → '10:30am'."""
+    hour, minute = divmod(int(minutes), 60)
+    suffix = "am" if hour < 12 else "pm"
+    return f"{(hour % 12) or 12}:{minute:02d}{suffix}"
 
-def assign_course_type(code: str) -> str:
-    """
-    Extract the alphabetic prefix of the course code and map it to its full major name.
-    If the prefix is not in the mapping, return the prefix itself.
+
+def format_days(mask: int) -> list[str]:
+    """Expand a day bitmask into its three-letter day names, Monday first."""
+    return [day for day in DAYS if mask & DAY_BITS[day]]
+
+
+@dataclass(frozen=True)
+class MeetingTimes:
     """
-    if not isinstance(code, str):
-        return "Unknown major"
-
-    # ── Handle Corequisite explicitly ──────────────────────
-    if code.strip().lower() == "corequisite":
-        return "Corequisite course"
-    
-    # Extract leading letters
-    m = re.match(r'^([A-Za-z]+)', code)
-    prefix = m.group(1).upper() if m else code.upper()
-
-    # Mapping of prefix → full major name
-    major_map = {
-        "BSN": "Nursing Program's core or track elective course",
-        "BUS": "Business Program's core or track elective course",
-        "CHSS": "General Education course",
-        "CS": "Computer Science Program's core or track elective course",
-        "DS": "Data Science Program's core or track elective course",
-        "CSE": "General Education course",
-        "EC": "English and Communications Program's core or track elective course",
-        "ECM": "ECM Program's core or track elective course",
-        "ECON": "Economics Program's core or track elective course",
-        "ENGS": "Engineering Sciences Program's core or track elective course",
-        "ENV": "Environmental and Sustainability Sciences Program's core or track elective course",
-        "ESS": "Environmental and Sustainability Sciences Program's core or track elective course",
-        "FND": "General Education course",
-        "HHM": "HHM Program's core or track elective course",
-        "HRSJ": "Human Rights and Social Justice Program's core or track elective course",
-        "IESM": "Industrial Engineering and Systems Management Program's core or track elective course",
-        "IRD": "International Relations and Diplomacy Program's core or track elective course",
-        "LAW": "Laws Program's core or track elective course",
-        "MGMT": "MGMT Program's core or track elective course",
-        "PA": "Public Affairs Program's core or track elective course",
-        "PEER": "Peer Mentoring course",
-        "PG": "Politics and Governance Program's core or track elective course",
-        "PH": "Public Health Program's core or track elective course",
-        "PSIA": "Political Science and International Affairs Program's core or track elective course",
-        "TEFL": "Teaching English as a Foreign Language Program's core or track elective course",
-        "CBE": "CBE Program's core or track elective course"
-    }
-
-    return major_map.get(prefix, prefix)
+    Struct-of-arrays view of every section's weekly meetings.
 
+    Meetings of section i are rows offsets[i]:offsets[i+1] of the per-meeting
+    arrays. Days that share a time range are folded into one meeting with a
+    combined bitmask, so "MON/WED/FRI 10:30am-11:20am" is a single row.
+    Sections with no parseable time ("TBD", "Not specified") have no rows.
+    """
+    offsets: np.ndarray     # int32, len = n_sections + 1
+    section: np.ndarray     # int32, section index of each meeting
+    day_mask: np.ndarray    # uint8, DAY_BITS union
+    start_min: np.ndarray   # int16, minutes after midnight
+    end_min: np.ndarray     # int16, minutes after midnight
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def has_time(self) -> np.ndarray:
+        """Boolean per section: False for TBD / unspecified times."""
+        return np.diff(self.offsets) > 0
+
+    @property
+    def section_days(self) -> np.ndarray:
+        """Union of meeting days per section (uint8 bitmask, 0 if TBD)."""
+        days = np.zeros(len(self), dtype=np.uint8)
+        np.bitwise_or.at(days, self.section, self.day_mask)
+        return days
+
+    def meetings(self, i: int) -> list[tuple[int, int, int]]:
+        """(day_mask, start_min, end_min) tuples for section i."""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return [
+            (int(d), int(s), int(e))
+            for d, s, e in zip(self.day_mask[lo:hi], self.start_min[lo:hi], self.end_min[lo:hi])
+        ]
+
+
+def compile_meeting_times(times: pd.Series) -> MeetingTimes:
+    """
+    Parse a `times` column ("MON 10:30am-11:20am, WED 10:30am-11:20am", "TBD", …)
+    into a MeetingTimes table. Each distinct string is parsed only once.
+    """
+    parsed: dict[str, list[tuple[int, int, int]]] = {}
+    offsets = [0]
+    section, day_mask, start_min, end_min = [], [], [], []
+
+    for i, cell in enumerate(times.astype(object).fillna("").astype(str)):
+        rows = parsed.get(cell)
+        if rows is None:
+            slots: dict[tuple[int, int], int] = {}
+            for day, start, end in _MEETING_RE.findall(cell):
+                key = (parse_clock(start), parse_clock(end))
+                slots[key] = slots.get(key, 0) | DAY_BITS[day.upper()]
+            rows = parsed[cell] = [(mask, s, e) for (s, e), mask in slots.items()]
+
+        for mask, s, e in rows:
+            section.append(i)
+            day_mask.append(mask)
+            start_min.append(s)
+            end_min.append(e)
+        offsets.append(len(section))
+
+    return MeetingTimes(
+        offsets=np.asarray(offsets, dtype=np.int32),
+        section=np.asarray(section, dtype=np.int32),
+        day_mask=np.asarray(day_mask, dtype=np.uint8),
+        start_min=np.asarray(start_min, dtype=np.int16),
+        end_min=np.asarray(end_min, dtype=np.int16),
+    )
 
 
-def enrich_courses(df: pd.DataFrame) -> pd.DataFrame:
+class ConflictMatrix:
     """
-    Takes a cleaned DataFrame, appends 'restriction', 'Course Level', and 'Major',
-    and returns the enriched copy.
+    Pairwise "these two sections overlap in time" matrix, stored as packed
+    little-endian bitsets: bit j of row i is set when sections i and j meet on
+    a common day with overlapping time ranges. Rows can be memory-mapped.
     """
-    df2 = extract_restrictions(df)
-    df2['course_level']  = df2['course_code'].apply(assign_course_level)
-    df2['course_type']   = df2['course_code'].apply(assign_course_type)
-    return df2
+    __slots__ = ("bits", "n")
+
+    def __init__(self, bits: np.ndarray):
+        self.bits = bits
+        self.n = bits.shape[0]
+
+    @classmethod
+    def build(cls, meetings: MeetingTimes, block: int = 1024) -> "ConflictMatrix":
+        """Vectorized meeting × meeting overlap test, folded to sections."""
+        n = len(meetings)
+        dense = np.zeros((n, n), dtype=bool)
+        days, start, end, sec = (
+            meetings.day_mask, meetings.start_min, meetings.end_min, meetings.section
+        )
+        # compare meetings in row blocks so memory stays bounded on big catalogs
+        for lo in range(0, len(days), block):
+            hi = lo + block
+            overlap = (
+                ((days[lo:hi, None] & days[None, :]) != 0)
+                & (start[lo:hi, None] < end[None, :])
+                & (start[None, :] < end[lo:hi, None])
+            )
+            a, b = np.nonzero(overlap)
+            dense[sec[lo + a], sec[b]] = True
+        np.fill_diagonal(dense, False)
+        return cls(np.packbits(dense, axis=1, bitorder="little"))
+
+    def save(self, path: Path) -> None:
+        np.save(path, self.bits)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "ConflictMatrix":
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def row(self, i: int) -> np.ndarray:
+        """Boolean vector of the sections that conflict with section i."""
+        return np.unpackbits(self.bits[i], count=self.n, bitorder="little").astype(bool)
+
+    def row_mask(self, i: int) -> int:
+        """Row i as a Python int bitset (bit j ⇔ conflict with section j)."""
+        return int.from_bytes(self.bits[i].tobytes(), "little")
+
+    def overlaps(self, i: int, j: int) -> bool:
+        return bool((self.bits[i, j >> 3] >> (j & 7)) & 1)
+
+    def conflicting_pairs(self, sections) -> list[tuple[int, int]]:
+        """All (i, j), i < j, among `sections` whose meetings overlap."""
+        idx = np.asarray(sorted(set(int(s) for s in sections)), dtype=np.intp)
+        if len(idx) < 2:
+            return []
+        sub = (self.bits[idx[:, None], idx[None, :] >> 3] >> (idx[None, :] & 7)) & 1
+        a, b = np.nonzero(np.triu(sub, k=1))
+        return [(int(idx[i]), int(idx[j])) for i, j in zip(a, b)]
+
+    def is_conflict_free(self, sections) -> bool:
+        return not self.conflicting_pairs(sections)
 
 
 output_csv = DATA_DIR / "courses.csv"
 
-df_clean, missing = load_and_clean_courses(json_path)
-df_final = enrich_courses(df_clean)
 
-df_final.to_csv(output_csv, index=False, encoding='utf-8')
\ No newline at end of file
+# ─── Incremental rebuild ────────────────────────────────────────────
+CACHE_DIR = DATA_DIR / ".cache"
+MANIFEST_PATH = CACHE_DIR / "courses-manifest.json"
+KEY_FIELDS = ("course_code", "section", "year", "semester")
+
+
+@dataclass
+class ChangeSet:
+    """Section keys ("CODE|section|year|semester") touched by a rebuild."""
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.modified)} modified, {self.unchanged} unchanged")
+
+
+def record_keys(records: list[dict]) -> list[str]:
+    """Stable section key per record; repeated keys get an occurrence suffix."""
+    seen: Counter = Counter()
+    keys = []
+    for record in records:
+        base = "|".join(str(record.get(f, "")) for f in KEY_FIELDS)
+        seen[base] += 1
+        keys.append(base if seen[base] == 1 else f"{base}#{seen[base]}")
+    return keys
+
+
+def record_fingerprint(record: dict) -> str:
+    blob = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Write to a temp file next to `path`, then rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def process_records(records: list[dict]) -> pd.DataFrame:
+    """
+    Run the clean/enrich pipeline on a batch of raw records and return the
+    rows exactly as they are serialized in courses.csv (all strings), so
+    fresh rows can be merged with rows read back from the previous CSV.
+    """
+    df_clean, _ = clean_courses(pd.json_normalize(records))
+    df_final = enrich_courses(df_clean)
+    return pd.read_csv(io.StringIO(df_final.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+
+def _read_manifest(manifest_path: Path, csv_path: Path) -> Optional[list[tuple[str, str]]]:
+    """(key, fingerprint) per CSV row, or None if the CSV no longer matches it."""
+    if not manifest_path.exists() or not csv_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("csv_sha256") != hashlib.sha256(csv_path.read_bytes()).hexdigest():
+        return None  # CSV was rebuilt or edited outside this pipeline
+    return [tuple(row) for row in manifest["rows"]]
+
+
+def rebuild_catalog(json_path: Path = json_path, csv_path: Path = output_csv,
+                    manifest_path: Path = MANIFEST_PATH, full: bool = False) -> ChangeSet:
+    """
+    Bring courses.csv up to date with the scraped JSON.
+
+    Only records whose fingerprint changed since the last run are re-processed;
+    every other row is copied from the current CSV. Without a usable manifest
+    (first run, `full=True`, or a CSV changed by hand) everything is rebuilt.
+
+    Returns:
+        The change set; the CSV and manifest are only rewritten when it is
+        non-empty (or on a full rebuild).
+    """
+    records = load_course_records(json_path)
+    keys = record_keys(records)
+    prints = [record_fingerprint(r) for r in records]
+
+    previous = None if full else _read_manifest(manifest_path, csv_path)
+    old = dict(previous or [])
+    changed = [i for i, (k, fp) in enumerate(zip(keys, prints)) if old.get(k) != fp]
+    current = set(keys)
+    changes = ChangeSet(
+        added=[keys[i] for i in changed if keys[i] not in old],
+        modified=[keys[i] for i in changed if keys[i] in old],
+        removed=[k for k in old if k not in current],
+        unchanged=len(records) - len(changed),
+    )
+    if previous is not None and not changes:
+        return changes
+
+    fresh = process_records([records[i] for i in changed]) if changed else None
+    if previous is None:
+        table = fresh if fresh is not None else pd.DataFrame()
+    else:
+        old_rows = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        if fresh is None:
+            fresh = old_rows.iloc[0:0]
+        fresh = fresh.reindex(columns=old_rows.columns, fill_value="")
+        # source order: unchanged rows from the old CSV, changed rows from `fresh`
+        old_pos = {k: i for i, (k, _) in enumerate(previous)}
+        fresh_pos = {i: len(old_rows) + j for j, i in enumerate(changed)}
+        order = [fresh_pos[i] if i in fresh_pos else old_pos[k] for i, k in enumerate(keys)]
+        table = pd.concat([old_rows, fresh], ignore_index=True).iloc[order]
+
+    text = table.to_csv(index=False)
+    atomic_write(csv_path, text)
+    atomic_write(manifest_path, json.dumps({
+        "csv_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "rows": [[k, fp] for k, fp in zip(keys, prints)],
+    }))
+    return changes
+
+
+def main() -> None:
+    from data.prerequisites import compile_catalog_prerequisites
+    from data.term_store import write_partitions
+
+    parser = argparse.ArgumentParser(description="Rebuild data/courses.csv from courses.json.")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every row")
+    args = parser.parse_args()
+
+    changes = rebuild_catalog(full=args.full)
+    print(f"courses.csv: {changes.summary()}")
+    for label, keys in (("+", changes.added), ("-", changes.removed), ("~", changes.modified)):
+        for key in keys:
+            print(f"  {label} {key}")
+
+    # compile the prerequisite DAG against exactly the bytes just published
+    if changes or args.full:
+        compile_catalog_prerequisites(output_csv)
+
+    # publish the scraped term(s) into the term-partitioned store
+    for term in write_partitions(output_csv):
+        print(f"terms/{term.key}.parquet updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+prerequisites.py
+
+Compiles the free-text `prerequisites` column into a prerequisite DAG keyed by
+canonical course code, with every code interned to a dense integer ID.
+
+Accepted shapes:
+  - "No prerequisite(s) for this course" / "None"     → no requirement
+  - "FND101,FND102"                                    → FND101 AND FND102
+  - "CS101: Calculus 2; CS104: Linear Algebra"         → Jenzabar detail rows (AND)
+  - "CS101 or CS102", "CS101/CS102"                    → OR group
+
+Only real course codes constrain eligibility; placement codes (EQCALC1) and
+free-text names are kept as notes. Each course's requirement is stored as an
+AND-mask plus a list of OR-masks over interned IDs, so an eligibility query is
+a couple of big-int operations regardless of the transcript's length.
+
+The compiled graph is persisted next to courses.csv (prerequisites.json) with
+the hash of the catalog it was built from.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from data.data_processing import atomic_write
+
+DATA_DIR = Path(__file__).resolve().parent
+COURSES_CSV = DATA_DIR / "courses.csv"
+PREREQ_JSON = DATA_DIR / "prerequisites.json"
+
+CODE_RE = re.compile(r'\b([A-Z]{2,6})\s?(\d{3}[A-Z]?)\b')
+_OR_RE = re.compile(r'\s+or\s+|/', re.IGNORECASE)
+_NONE_TEXTS = ("", "none", "n/a", "nan")
+
+
+def parse_prerequisites(text) -> tuple[list[list[str]], list[str]]:
+    """
+    Parse one prerequisite cell.
+
+    Returns:
+        (clauses, notes): clauses is an AND-list of OR-groups of canonical codes;
+        notes are the fragments that named no course code.
+    """
+    if not isinstance(text, str):
+        return [], []
+    lowered = text.strip().lower()
+    if lowered in _NONE_TEXTS or lowered.startswith("no prerequisite"):
+        return [], []
+
+    clauses, notes = [], []
+    for part in re.split(r'[;,]', text):
+        part = part.strip()
+        if not part:
+            continue
+        # "CS101: Calculus 2" → only the code before the colon counts
+        head = part.split(":", 1)[0]
+        group = sorted({a + b for alt in _OR_RE.split(head) for a, b in CODE_RE.findall(alt.upper())})
+        if group:
+            clauses.append(group)
+        else:
+            notes.append(part)
+    return clauses, notes
+
+
+@dataclass
+class PrerequisiteGraph:
+    """
+    Attributes:
+        codes:   Interned course codes; the index is the course ID.
+        ids:     Code → ID.
+        all_of:  Course ID → bitmask of prerequisites that are all required.
+        any_of:  Course ID → tuple of bitmasks, at least one bit of each required.
+        notes:   Course code → unparsed prerequisite fragments.
+        source_sha256: Hash of the catalog file the graph was compiled from.
+    """
+    codes: list[str] = field(default_factory=list)
+    ids: dict[str, int] = field(default_factory=dict)
+    all_of: dict[int, int] = field(default_factory=dict)
+    any_of: dict[int, tuple[int, ...]] = field(default_factory=dict)
+    notes: dict[str, list[str]] = field(default_factory=dict)
+    source_sha256: str = ""
+
+    # ── building ───────────────────────────────────────────────────
+    def intern(self, code: str) -> int:
+        cid = self.ids.get(code)
+        if cid is None:
+            cid = self.ids[code] = len(self.codes)
+            self.codes.append(code)
+        return cid
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, source_sha256: str = "") -> "PrerequisiteGraph":
+        graph = cls(source_sha256=source_sha256)
+        parsed_cache: dict[str, tuple[list[list[str]], list[str]]] = {}
+
+        for code, text in zip(df["course_code"], df["prerequisites"]):
+            if not isinstance(code, str) or not CODE_RE.fullmatch(code):
+                continue  # e.g. "Corequisite" lab rows
+            cid = graph.intern(code)
+            key = text if isinstance(text, str) else ""
+            if key not in parsed_cache:
+                parsed_cache[key] = parse_prerequisites(text)
+            clauses, notes = parsed_cache[key]
+
+            # sections of the same course are combined conservatively (AND)
+            for group in clauses:
+                mask = 0
+                for req in group:
+                    mask |= 1 << graph.intern(req)
+                if len(group) == 1:
+                    graph.all_of[cid] = graph.all_of.get(cid, 0) | mask
+                elif mask not in graph.any_of.get(cid, ()):
+                    graph.any_of[cid] = graph.any_of.get(cid, ()) + (mask,)
+            if notes:
+                graph.notes.setdefault(code, [])
+                graph.notes[code] += [n for n in notes if n not in graph.notes[code]]
+        return graph
+
+    # ── queries ────────────────────────────────────────────────────
+    def mask_of(self, completed) -> int:
+        """Bitset of the interned IDs of `completed` (unknown codes are ignored)."""
+        mask = 0
+        for code in completed:
+            cid = self.ids.get(code)
+            if cid is not None:
+                mask |= 1 << cid
+        return mask
+
+    def eligible(self, code: str, done: int) -> bool:
+        """Can `code` be taken given the completed-course bitset `done`?"""
+        cid = self.ids.get(code)
+        if cid is None:
+            return True
+        if self.all_of.get(cid, 0) & ~done:
+            return False
+        return all(group & done for group in self.any_of.get(cid, ()))
+
+    def missing(self, code: str, done: int) -> list[str]:
+        """Human-readable unmet prerequisites of `code`."""
+        cid = self.ids.get(code)
+        if cid is None:
+            return []
+        out = [self.codes[i] for i in _bits(self.all_of.get(cid, 0) & ~done)]
+        for group in self.any_of.get(cid, ()):
+            if not group & done:
+                out.append(" or ".join(self.codes[i] for i in _bits(group)))
+        return out
+
+    def prerequisites_of(self, code: str) -> list[str]:
+        """Direct prerequisite codes of `code` (the DAG's incoming edges)."""
+        cid = self.ids.get(code)
+        if cid is None:
+            return []
+        mask = self.all_of.get(cid, 0)
+        for group in self.any_of.get(cid, ()):
+            mask |= group
+        return [self.codes[i] for i in _bits(mask)]
+
+    # ── persistence ────────────────────────────────────────────────
+    def to_json(self) -> dict:
+        return {
+            "source_sha256": self.source_sha256,
+            "codes": self.codes,
+            "all_of": {str(k): v for k, v in self.all_of.items()},
+            "any_of": {str(k): list(v) for k, v in self.any_of.items()},
+            "notes": self.notes,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PrerequisiteGraph":
+        codes = list(data["codes"])
+        return cls(
+            codes=codes,
+            ids={c: i for i, c in enumerate(codes)},
+            all_of={int(k): int(v) for k, v in data["all_of"].items()},
+            any_of={int(k): tuple(int(m) for m in v) for k, v in data["any_of"].items()},
+            notes=data.get("notes", {}),
+            source_sha256=data.get("source_sha256", ""),
+        )
+
+    def save(self, path: Path = PREREQ_JSON) -> None:
+        atomic_write(path, json.dumps(self.to_json(), indent=1))
+
+    @classmethod
+    def load(cls, path: Path = PREREQ_JSON) -> "PrerequisiteGraph":
+        return cls.from_json(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _bits(mask: int):
+    i = 0
+    while mask:
+        if mask & 1:
+            yield i
+        mask >>= 1
+        i += 1
+
+
+def compile_catalog_prerequisites(csv_path: Path = COURSES_CSV,
+                                  out_path: Path = PREREQ_JSON) -> PrerequisiteGraph:
+    """Build the graph for a published catalog file and persist it alongside."""
+    raw = csv_path.read_bytes()
+    graph = PrerequisiteGraph.build(pd.read_csv(csv_path), hashlib.sha256(raw).hexdigest())
+    graph.save(out_path)
+    return graph
+
+
+if __name__ == "__main__":
+    g = compile_catalog_prerequisites()
+    print(f"Wrote {PREREQ_JSON.name}: {len(g.codes)} courses, "
+          f"{sum(len(g.prerequisites_of(c)) for c in g.codes)} edges")
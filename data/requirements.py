@@ -0,0 +1,284 @@
+"""
+requirements.py
+
+Compiles the hand-maintained program files in `data/Degree Requirements/` into
+a structured requirement tree per program:
+
+  - named requirement groups, nested (e.g. General Education → Foundation)
+  - "(N courses)" / "choose at least N" / "N of these M courses" counts
+  - explicit course codes, with "or" alternatives
+  - cluster rules such as GE-QS / GE-AH / GE-SS
+  - course titles listed without codes, and free-text notes
+
+The whole index is written once to `degree_requirements.json` and loaded at
+startup; users reference a program by ID (the file stem, e.g.
+"BS_in_Computer_Science") instead of storing their own copy of the text.
+
+Rebuild after editing any program file:  python -m data.requirements
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent
+DEGREE_DIR = DATA_DIR / "Degree Requirements"
+REQUIREMENTS_JSON = DATA_DIR / "degree_requirements.json"
+
+_CODE_RE = re.compile(r'\b([A-Z]{2,6})\s?(\d{3}[A-Z]?)\b')
+_LEADING_CODE_RE = re.compile(r'^(?:[*•\-]\s*)?(?:or\s+)?([A-Z]{2,6})\s?(\d{3}[A-Z]?)\b\s*[–\-:]?\s*(.*)$')
+_ALT_RE = re.compile(r'\bor\s+([A-Z]{2,6})\s?(\d{3}[A-Z]?)\b')
+_COUNT_RES = (
+    re.compile(r'\((?:minimum|min\.?)?\s*(\d+)\s+courses?\b', re.IGNORECASE),
+    re.compile(r'\b(?:minimum|min\.?)\s+(\d+)\s+courses?\b', re.IGNORECASE),
+    re.compile(r'\bchoose\s+(?:at\s+least\s+|any\s+)?(\d+)\b', re.IGNORECASE),
+    re.compile(r'^\s*(\d+)\s+of\s+these\s+\d+\s+courses', re.IGNORECASE),
+    re.compile(r'^\s*\(?\s*(\d+)\s+courses?\b', re.IGNORECASE),
+)
+# "(15 courses)", "15 courses / 45 credits / + 6 non-credit courses"
+_COUNT_ONLY_RE = re.compile(r'\(?\s*\d+\s+courses?\b[^a-zA-Z]*(?:credits?)?[^()]*\)?', re.IGNORECASE)
+_CLUSTER_RE = re.compile(r'\bGE-(QS|AH|SS)\b')
+_CLUSTER_KEYWORDS = {
+    "GE-QS": re.compile(r'quantitative scien', re.IGNORECASE),
+    "GE-AH": re.compile(r'arts\s*(?:&|and)\s*humanities', re.IGNORECASE),
+    "GE-SS": re.compile(r'social scien', re.IGNORECASE),
+}
+_HEADING_WORDS = re.compile(
+    r'requirement|track|elective|core|courses|area|concentration|education|'
+    r'foundation|breadth|semester|fundamentals|offerings|capstone',
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class RequirementGroup:
+    """
+    Attributes:
+        name:     Heading text, e.g. "CS Core Requirements".
+        count:    How many courses the group asks for, if stated.
+        courses:  Each entry is a list of interchangeable course codes
+                  (usually one; "BUS 109 … or CS 100" gives two).
+        clusters: Cluster rules that satisfy the group, e.g. ["GE-QS"].
+        titles:   Courses listed by name only (no code in the source file).
+        notes:    Remaining free-text lines.
+        children: Nested sub-groups.
+    """
+    name: str
+    count: int | None = None
+    courses: list[list[str]] = field(default_factory=list)
+    clusters: list[str] = field(default_factory=list)
+    titles: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+    children: list["RequirementGroup"] = field(default_factory=list)
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self.courses or self.clusters or self.titles)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RequirementGroup":
+        return cls(
+            name=d["name"],
+            count=d.get("count"),
+            courses=[list(c) for c in d.get("courses", [])],
+            clusters=list(d.get("clusters", [])),
+            titles=list(d.get("titles", [])),
+            notes=list(d.get("notes", [])),
+            children=[cls.from_dict(c) for c in d.get("children", [])],
+        )
+
+
+@dataclass
+class Program:
+    id: str
+    name: str
+    title: str
+    groups: list[RequirementGroup]
+    text: str
+
+    def walk(self):
+        for g in self.groups:
+            yield from g.walk()
+
+    @property
+    def codes(self) -> set[str]:
+        """Every course code the program names explicitly."""
+        return {code for g in self.walk() for option in g.courses for code in option}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Program":
+        return cls(
+            id=d["id"], name=d["name"], title=d["title"], text=d["text"],
+            groups=[RequirementGroup.from_dict(g) for g in d["groups"]],
+        )
+
+
+def program_id(name: str) -> str:
+    """'BS in Computer Science' → 'BS_in_Computer_Science' (the file stem)."""
+    return name.replace(" ", "_").replace("/", "_")
+
+
+def _count(line: str) -> int | None:
+    for pat in _COUNT_RES:
+        m = pat.search(line)
+        if m:
+            return int(m.group(1))
+    return None
+
+
+def _is_heading(line: str, count: int | None) -> bool:
+    body = re.sub(r'^\(?[A-Z0-9]\)\s+', '', line.lstrip("*•- ").strip())
+    if _CODE_RE.search(body) or not body[:1].isupper() and not body[:1].isdigit():
+        return False
+    lead = re.split(r'[(:]', body, 1)[0].strip()
+    if not lead or len(lead) > 70 or re.match(r'(?i)(choose|any|\d+\s)', lead):
+        return False
+    # headings are Title Case; wrapped sentence fragments are not
+    words = [w for w in re.findall(r"[A-Za-z][\w'&-]*", lead) if len(w) > 3]
+    if not all(w[0].isupper() for w in words):
+        return False
+    if count is not None:
+        return True
+    if line.lstrip().startswith(("*", "•")):
+        return False
+    return not body.endswith(".") and bool(_HEADING_WORDS.search(body))
+
+
+def _is_title(line: str) -> bool:
+    """A bare course title line such as "Cell & Molecular Biology"."""
+    words = [w for w in re.findall(r"[A-Za-z][\w'&-]*", line) if len(w) > 3]
+    return (len(line) <= 60 and not line.rstrip().endswith((".", ":"))
+            and bool(words) and all(w[0].isupper() for w in words))
+
+
+def _last_word(name: str) -> str:
+    words = re.findall(r'[A-Za-z]+', name)
+    return words[-1].lower() if words else ""
+
+
+def parse_program(pid: str, text: str) -> Program:
+    lines = []
+    for ln in text.splitlines():
+        ln = ln.replace("﻿", "").rstrip()
+        if not ln.strip():
+            continue
+        # a count printed on its own line belongs to the heading above it
+        if lines and _COUNT_ONLY_RE.fullmatch(ln.strip()) and not _CODE_RE.search(lines[-1]):
+            lines[-1] = f"{lines[-1]} ({ln.strip().strip('()')})"
+            continue
+        lines.append(ln)
+    title = lines[0].strip() if lines else pid
+
+    roots: list[RequirementGroup] = []
+    stack: list[RequirementGroup] = []
+    current: RequirementGroup | None = None
+
+    def open_group(name: str, count: int | None) -> RequirementGroup:
+        group = RequirementGroup(name=name, count=count)
+        # leaves (groups that already list courses) never take children
+        while stack and stack[-1].has_content:
+            stack.pop()
+        # "Applied Computer Science Track" closes "Mathematical Modeling Track"
+        last = _last_word(name)
+        for depth in range(len(stack) - 1, -1, -1):
+            if _last_word(stack[depth].name) == last:
+                del stack[depth:]
+                break
+        while stack:
+            top = stack[-1]
+            if not top.children and not top.notes:
+                break                                    # consecutive headings nest
+            if top.count is not None and count is not None:
+                used = sum(c.count or 0 for c in top.children)
+                if count < top.count and used + count <= top.count:
+                    break                                # room left in the container
+            elif top.count is None and top.children and count is None:
+                break
+            stack.pop()
+        (stack[-1].children if stack else roots).append(group)
+        stack.append(group)
+        return group
+
+    for raw in lines[1:]:
+        line = raw.strip()
+        m = _LEADING_CODE_RE.match(line)
+        if m:
+            if current is None:
+                current = open_group("Courses", None)
+            code = m.group(1) + m.group(2)
+            if line.lower().startswith("or ") and current.courses:
+                current.courses[-1].append(code)
+            else:
+                option = [code] + [a + b for a, b in _ALT_RE.findall(m.group(3))]
+                current.courses.append(list(dict.fromkeys(option)))
+            continue
+
+        count = _count(line)
+        if _is_heading(line, count):
+            name = re.sub(r'^\(?[A-Z0-9]\)\s+', '', line.lstrip("*•- "))
+            name = re.sub(r'\s*\((?:minimum|min\.?)?\s*\d+\s+courses?[^)]*\)', '', name,
+                          flags=re.IGNORECASE).strip(" :")
+            current = open_group(name or line, count)
+            for cluster, pat in _CLUSTER_KEYWORDS.items():
+                if pat.search(name):
+                    current.clusters.append(cluster)
+            continue
+
+        if current is None:
+            current = open_group("General", None)
+        if count is not None and current.count is None:
+            current.count = count
+        explicit = ["GE-" + c for c in _CLUSTER_RE.findall(line)]
+        if explicit:
+            current.clusters = list(dict.fromkeys(current.clusters + explicit))
+        if not explicit and (line.startswith(("*", "•")) and len(line) <= 90
+                             and not line.endswith(".") or _is_title(line)):
+            current.titles.append(re.split(r'\s+[–-]\s+\d', line.lstrip("*• "), 1)[0].strip())
+        elif not _COUNT_ONLY_RE.fullmatch(line) and not re.fullmatch(r'\(?[^a-z]*\)?', line):
+            current.notes.append(line)
+
+    return Program(id=pid, name=pid.replace("_", " "), title=title, groups=roots, text=text)
+
+
+def build_index(directory: Path = DEGREE_DIR) -> dict[str, Program]:
+    return {
+        fp.stem: parse_program(fp.stem, fp.read_text("utf-8"))
+        for fp in sorted(directory.glob("*.txt"))
+    }
+
+
+def write_index(path: Path = REQUIREMENTS_JSON, directory: Path = DEGREE_DIR) -> dict[str, Program]:
+    index = build_index(directory)
+    path.write_text(
+        json.dumps({pid: asdict(p) for pid, p in index.items()}, ensure_ascii=False, indent=1),
+        encoding="utf-8",
+    )
+    return index
+
+
+@lru_cache(maxsize=1)
+def load_index(path: Path = REQUIREMENTS_JSON) -> dict[str, Program]:
+    """The precompiled requirements index (read once per process)."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {pid: Program.from_dict(d) for pid, d in data.items()}
+
+
+def get_program(name_or_id: str | None) -> Program | None:
+    """Look a program up by display name ("BS in Computer Science") or ID."""
+    if not name_or_id:
+        return None
+    return load_index().get(program_id(name_or_id))
+
+
+if __name__ == "__main__":
+    idx = write_index()
+    for pid, prog in idx.items():
+        groups = list(prog.walk())
+        print(f"{pid}: {len(groups)} groups, {len(prog.codes)} codes")
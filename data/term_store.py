@@ -0,0 +1,183 @@
+"""
+term_store.py
+
+Term-partitioned catalog store: one Parquet file per (year, semester) under
+data/terms/, e.g. data/terms/202425-1.parquet. courses.csv only ever holds the
+latest scrape; publishing it into the store adds or refreshes the partitions
+for the terms it contains and leaves older terms untouched, so history
+accumulates without making the active term any slower to load.
+
+Each partition has its compiled prerequisite graph next to it
+(data/terms/202425-1.prerequisites.json), keyed by the partition's hash, so
+loading a term never re-parses the prerequisite text.
+
+Nothing here reads a partition until asked: the term list comes from file
+names, and the catalog service loads only the active term (the latest one)
+unless another term is requested explicitly.
+
+Publish after rebuilding courses.csv:  python -m data.term_store
+"""
+
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from data.prerequisites import PrerequisiteGraph
+
+DATA_DIR = Path(__file__).resolve().parent
+COURSES_CSV = DATA_DIR / "courses.csv"
+TERMS_DIR = DATA_DIR / "terms"
+# class periods and holidays per term
+TERM_CALENDAR_JSON = DATA_DIR / "term_calendar.json"
+
+SEMESTER_NAMES = {1: "Fall", 2: "Spring", 3: "Summer"}
+
+
+@dataclass(frozen=True, order=True)
+class Term:
+    """An academic term; `year` is the school-year code, e.g. 202425."""
+    year: int
+    semester: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}-{self.semester}"
+
+    @property
+    def label(self) -> str:
+        start = str(self.year)[:4]
+        return f"{SEMESTER_NAMES.get(self.semester, self.semester)} {start}-{str(self.year)[4:]}"
+
+    @classmethod
+    def parse(cls, key: str) -> "Term":
+        """'202425-1' → Term(202425, 1)."""
+        year, semester = key.split("-")
+        return cls(int(year), int(semester))
+
+
+def partition_path(term: Term, directory: Path = TERMS_DIR) -> Path:
+    return directory / f"{term.key}.parquet"
+
+
+def prerequisites_path(partition: Path) -> Path:
+    """The compiled prerequisite graph stored next to a partition file."""
+    return partition.with_name(f"{partition.stem}.prerequisites.json")
+
+
+def available_terms(directory: Path = TERMS_DIR) -> list[Term]:
+    """Terms present in the store, oldest first (from file names only)."""
+    if not directory.is_dir():
+        return []
+    terms = []
+    for fp in directory.glob("*.parquet"):
+        try:
+            terms.append(Term.parse(fp.stem))
+        except ValueError:
+            continue
+    return sorted(terms)
+
+
+def active_term(directory: Path = TERMS_DIR) -> Term | None:
+    """The term schedules are planned for: the latest one in the store."""
+    terms = available_terms(directory)
+    return terms[-1] if terms else None
+
+
+@dataclass(frozen=True)
+class TermDates:
+    """Class period of a term: first and last day of classes, and no-class holidays."""
+    first_day: date
+    last_day: date
+    holidays: tuple[date, ...] = ()
+
+    @classmethod
+    def estimate(cls, term: Term) -> "TermDates":
+        """
+        Dates for a term missing from the calendar table: 15 weeks from the
+        first Monday of September (Fall), January's third Monday (Spring) or
+        the first Monday of June (Summer, 6 weeks).
+        """
+        year = int(str(term.year)[:4]) + (term.semester != 1)
+        month, monday, weeks = {1: (9, 1, 15), 2: (1, 3, 15), 3: (6, 1, 6)}.get(term.semester, (9, 1, 15))
+        first = date(year, month, 1)
+        first += timedelta(days=(0 - first.weekday()) % 7 + 7 * (monday - 1))
+        return cls(first, first + timedelta(weeks=weeks, days=-3))
+
+
+@lru_cache(maxsize=None)
+def _calendar_table(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("terms", {})
+    except FileNotFoundError:
+        return {}
+
+
+def term_dates(term: Term, path: Path = TERM_CALENDAR_JSON) -> TermDates:
+    """The term's class period from the calendar table, or an estimate if it isn't listed."""
+    row = _calendar_table(path).get(term.key)
+    if row is None:
+        return TermDates.estimate(term)
+    return TermDates(
+        date.fromisoformat(row["first_day"]),
+        date.fromisoformat(row["last_day"]),
+        tuple(sorted(date.fromisoformat(h["date"]) for h in row.get("holidays", []))),
+    )
+
+
+def load_term(term: Term, directory: Path = TERMS_DIR) -> pd.DataFrame:
+    """Read one term's sections.
+
+    Raises:
+        FileNotFoundError: if the term is not in the store.
+    """
+    return pd.read_parquet(partition_path(term, directory))
+
+
+def _publish(path: Path, payload: bytes) -> bool:
+    """Atomically replace `path` with `payload`; skip identical content."""
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(payload).digest():
+        return False
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return True
+
+
+def write_partitions(csv_path: Path = COURSES_CSV, directory: Path = TERMS_DIR) -> list[Term]:
+    """
+    Split courses.csv by (year, semester) into the store, each partition with
+    its prerequisite graph (rewritten when the partition changes or it is
+    missing).
+
+    Returns:
+        The terms whose partition was created or changed.
+    """
+    df = pd.read_csv(csv_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    changed = []
+    for (year, semester), part in df.groupby(["year", "semester"], sort=True):
+        term = Term(int(year), int(semester))
+        part = part.reset_index(drop=True)
+        buf = io.BytesIO()
+        part.to_parquet(buf, index=False)
+        payload = buf.getvalue()
+        path = partition_path(term, directory)
+        if _publish(path, payload):
+            changed.append(term)
+        graph_path = prerequisites_path(path)
+        if term in changed or not graph_path.exists():
+            PrerequisiteGraph.build(part, hashlib.sha256(payload).hexdigest()).save(graph_path)
+    return changed
+
+
+if __name__ == "__main__":
+    updated = write_partitions()
+    for t in available_terms():
+        print(f"{t.key} ({t.label}){'  [updated]' if t in updated else ''}")
@@ -1,4 +1,5 @@
 # database.py
+import hashlib
 import os
 import time
 import logging
@@ -130,13 +131,15 @@ def save_transcript(user_id: int, transcript_text: str) -> bool:
 
 
 
-def save_degree_requirements(user_id: int, major: str, text: str) -> None:
+def save_degree_requirements(user_id: int, major: str, program_id: str) -> None:
     """
-    Ensure exactly one row per user: delete any existing, then insert the new major & requirements.
+    Ensure exactly one row per user: delete any existing, then insert the new major.
+    Only the program ID is stored; the requirements themselves live in the
+    precompiled index (data/degree_requirements.json).
     """
     delete_sql = "DELETE FROM degreqs WHERE user_id = %s"
     insert_sql = """
-      INSERT INTO degreqs (user_id, major, requirements)
+      INSERT INTO degreqs (user_id, major, program_id)
       VALUES (%s, %s, %s)
     """
     try:
@@ -145,7 +148,7 @@ def save_degree_requirements(user_id: int, major: str, text: str) -> None:
             # remove old
             cur.execute(delete_sql, (user_id,))
             # insert new
-            cur.execute(insert_sql, (user_id, major, text))
+            cur.execute(insert_sql, (user_id, major, program_id))
             conn.commit()
     except mysql.connector.Error as err:
         logging.error(f"Error saving degree requirements: {err}")
@@ -279,10 +282,19 @@ def get_transcript_text(user_id: int) -> str:
         return ""
 
 
-def save_generated_schedule(user_id: int, schedule_text: str) -> bool:
+def schedule_hash(schedule_text: str) -> str:
+    """Content hash identifying a schedule version (sha256 of its text)."""
+    return hashlib.sha256(schedule_text.encode("utf-8")).hexdigest()
+
+
+def save_generated_schedule(user_id: int, schedule_text: str, schedule_json: str | None = None,
+                            schedule_ics: bytes | None = None) -> bool:
     """
-    Insert or update the generated schedule for this user.
+    Insert or update the generated schedule for this user, with its
+    structured JSON form and calendar export when available. Both are
+    stored under the content hash of the text they were built from.
     """
+    content_hash = schedule_hash(schedule_text)
     try:
         with get_db_connection() as conn:
             cur = conn.cursor()
@@ -296,19 +308,23 @@ def save_generated_schedule(user_id: int, schedule_text: str) -> bool:
                     """
                     UPDATE schedules
                     SET schedule_text = %s,
+                        schedule_json = %s,
+                        content_hash = %s,
+                        schedule_ics = %s,
                         created_at = NOW()
                     WHERE id = %s
                     """,
-                    (schedule_text, sched_id)
+                    (schedule_text, schedule_json, content_hash, schedule_ics, sched_id)
                 )
             else:
                 # insert new
                 cur.execute(
                     """
-                    INSERT INTO schedules (user_id, schedule_text, created_at)
-                    VALUES (%s, %s, NOW())
+                    INSERT INTO schedules (user_id, schedule_text, schedule_json, content_hash,
+                                           schedule_ics, created_at)
+                    VALUES (%s, %s, %s, %s, %s, NOW())
                     """,
-                    (user_id, schedule_text)
+                    (user_id, schedule_text, schedule_json, content_hash, schedule_ics)
                 )
             conn.commit()
         return True
@@ -316,6 +332,32 @@ def save_generated_schedule(user_id: int, schedule_text: str) -> bool:
         logging.error(f"Error saving/updating schedule: {e}")
         return False
 
+
+def save_schedule_artifacts(schedule_id: int, content_hash: str, schedule_json: str | None,
+                            schedule_ics: bytes | None) -> bool:
+    """
+    Store the structured form and calendar export computed for an existing
+    schedule row (e.g. one saved before they existed), without touching its text.
+    """
+    try:
+        with get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE schedules
+                SET schedule_json = %s,
+                    content_hash = %s,
+                    schedule_ics = %s
+                WHERE id = %s
+                """,
+                (schedule_json, content_hash, schedule_ics, schedule_id)
+            )
+            conn.commit()
+        return True
+    except Exception as e:
+        logging.error(f"Error saving schedule artifacts: {e}")
+        return False
+
 def get_schedule(user_id: int) -> str:
     """
     Retrieve the previous schedule for a specific user.
@@ -339,6 +381,27 @@ def get_schedule(user_id: int) -> str:
         print(f"Error retrieving schedule: {e}")
         return ""
 
+def get_schedule_record(user_id: int) -> dict | None:
+    """
+    Retrieve the user's latest schedule row with everything stored alongside it.
+
+    Returns:
+        A dict with id, schedule_text, schedule_json, content_hash and
+        schedule_ics (the last three may be None), or None if not found
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT id, schedule_text, schedule_json, content_hash, schedule_ics FROM schedules "
+                "WHERE user_id = %s ORDER BY created_at DESC LIMIT 1",
+                (user_id,)
+            )
+            return cursor.fetchone()
+    except Exception as e:
+        print(f"Error retrieving schedule record: {e}")
+        return None
+
 # # ─── Onboarding check used in login.py ─────────────────────────────
 # def has_completed_onboarding(user_id: int) -> bool:
 #     """
@@ -13,11 +13,16 @@ CREATE TABLE IF NOT EXISTS transcripts (
   FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Requirements are no longer copied per user: program_id points into the
+-- precompiled index data/degree_requirements.json. Existing databases:
+--   ALTER TABLE degreqs ADD COLUMN program_id VARCHAR(255) NOT NULL DEFAULT '' AFTER major;
+--   UPDATE degreqs SET program_id = REPLACE(REPLACE(major, ' ', '_'), '/', '_');
+--   ALTER TABLE degreqs DROP COLUMN requirements;
 CREATE TABLE IF NOT EXISTS degreqs (
   id           INT AUTO_INCREMENT PRIMARY KEY,
   user_id      INT          NOT NULL,
   major        VARCHAR(255) NOT NULL,
-  requirements MEDIUMTEXT   NOT NULL,
+  program_id   VARCHAR(255) NOT NULL,
   recorded_at  TIMESTAMP    DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
@@ -34,10 +39,20 @@ CREATE TABLE IF NOT EXISTS preferences (
 );
 -- Add this to your db/init.sql file or execute as a separate migration
 
+-- schedule_json holds the structured entries (api_logic/structured_schedule.py)
+-- and schedule_ics the calendar export, both computed once when the schedule
+-- is saved; content_hash is the sha256 of schedule_text they were built from.
+-- NULL for schedules saved before. Existing databases:
+--   ALTER TABLE schedules ADD COLUMN schedule_json MEDIUMTEXT NULL AFTER schedule_text;
+--   ALTER TABLE schedules ADD COLUMN content_hash CHAR(64) NULL AFTER schedule_json,
+--                         ADD COLUMN schedule_ics MEDIUMBLOB NULL AFTER content_hash;
 CREATE TABLE IF NOT EXISTS schedules (
   id             INT AUTO_INCREMENT PRIMARY KEY,
   user_id        INT          NOT NULL,
   schedule_text  MEDIUMTEXT   NOT NULL,
+  schedule_json  MEDIUMTEXT   NULL,
+  content_hash   CHAR(64)     NULL,
+  schedule_ics   MEDIUMBLOB   NULL,
   created_at     TIMESTAMP    DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
\ No newline at end of file
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the app is run from the repository root (streamlit run app.py); import it the same way
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_logic import mock_gemini  # noqa: E402
+from api_logic.gemini_api import GeminiClient  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    """Start a mock Gemini server: mock_server(faults=..., first_token=...) → base URL."""
+    servers = []
+
+    def start(faults: mock_gemini.Faults | None = None, first_token: float = 0.0, chunk_delay: float = 0.0):
+        server = mock_gemini.serve(first_token=first_token, chunk_delay=chunk_delay, faults=faults)
+        servers.append(server)
+        return mock_gemini.base_url(server)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def make_client():
+    """A GeminiClient without cache or hedging unless asked, closed after the test."""
+    clients = []
+
+    def make(base_url: str, **kwargs) -> GeminiClient:
+        kwargs.setdefault("cache", None)
+        kwargs.setdefault("hedge", False)
+        client = GeminiClient(api_key="mock", base_url=base_url, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
@@ -0,0 +1,70 @@
+import pytest
+
+from api_logic.candidates import blocked_requests, candidate_mask
+from api_logic.preferences import Preferences, parse_preferences
+from data.catalog import get_catalog
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    try:
+        return get_catalog()
+    except FileNotFoundError:
+        pytest.skip("no course catalog")
+
+
+def _rows(catalog, mask, code):
+    return mask[catalog.sections_of(code)]
+
+
+def _course(catalog, level: str, prereqs: bool):
+    """A course at `level` whose prerequisites an empty transcript does (not) meet."""
+    done = catalog.prereqs.mask_of(set())
+    for code in catalog.course_codes:
+        rows = catalog.sections_of(code)
+        if (catalog.prereqs.eligible(code, done) != prereqs
+                and all(catalog.sections[i].course_level == level for i in rows)):
+            return code
+    pytest.skip(f"no {level} course {'with' if prereqs else 'without'} prerequisites")
+
+
+def test_requested_course_outside_program_is_kept(catalog):
+    code = _course(catalog, "Lower level", prereqs=False)
+    prefs = Preferences(program="BS in Computer Science", wanted_codes={code})
+
+    assert _rows(catalog, candidate_mask(catalog, set(), prefs, "ZZZ100"), code).all()
+    assert blocked_requests(catalog, set(), prefs) == {}
+
+
+def test_requested_course_needs_prerequisites(catalog):
+    code = _course(catalog, "Lower level", prereqs=True)
+    prefs = Preferences(program="BS in Computer Science", wanted_codes={code})
+
+    assert not _rows(catalog, candidate_mask(catalog, set(), prefs), code).any()
+    assert blocked_requests(catalog, set(), prefs) == {code: "prerequisites not completed"}
+
+
+def test_requested_course_at_wrong_level(catalog):
+    code = _course(catalog, "Masters level", prereqs=False)
+    prefs = Preferences(program="BS in Computer Science", wanted_codes={code})
+
+    assert not _rows(catalog, candidate_mask(catalog, set(), prefs), code).any()
+    assert blocked_requests(catalog, set(), prefs) == {code: "not offered at your level"}
+
+
+def test_requested_course_by_avoided_instructors(catalog):
+    code = _course(catalog, "Lower level", prereqs=False)
+    instructors = sorted({str(catalog.sections[i].instructor) for i in catalog.sections_of(code)})
+    prefs = Preferences(program="BS in Computer Science", wanted_codes={code}, avoid_instructors=instructors)
+
+    assert not _rows(catalog, candidate_mask(catalog, set(), prefs), code).any()
+    assert blocked_requests(catalog, set(), prefs) == {code: "only taught by instructors you asked to avoid"}
+
+
+@pytest.mark.parametrize("answer", ["No, thanks", "None in particular", "Open to anything"])
+def test_declined_request_blocks_nothing(catalog, answer):
+    question = "👉 Are there any specific courses you’re hoping to take this semester?"
+    prefs = parse_preferences({question: answer, "👉 What is your current academic program?": "BS in Computer Science"},
+                              catalog=catalog)
+
+    assert blocked_requests(catalog, set(), prefs) == {}
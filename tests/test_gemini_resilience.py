@@ -0,0 +1,138 @@
+import random
+import time
+
+import pytest
+
+from api_logic import gemini_api
+from api_logic.gemini_api import CircuitBreaker, CircuitOpenError, GeminiError, backoff_delay
+from api_logic.mock_gemini import Faults
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Record backoff delays instead of sleeping them."""
+    delays = []
+
+    def record(attempt, *args, **kwargs):
+        delays.append(attempt)
+        return 0.0
+
+    monkeypatch.setattr(gemini_api, "backoff_delay", record)
+    return delays
+
+
+def test_backoff_delay_is_full_jitter():
+    random.seed(1)
+    for attempt in range(6):
+        cap = min(gemini_api.BACKOFF_CAP, gemini_api.BACKOFF_BASE * 2 ** attempt)
+        assert all(0 <= backoff_delay(attempt) <= cap for _ in range(200))
+
+
+def test_retries_transient_errors(mock_server, make_client, no_backoff):
+    faults = Faults(fail_first=2)
+    client = make_client(mock_server(faults), retries=3)
+
+    assert "Mock answer to: hello" in client.generate("hello", timeout=10)
+    assert faults.requests == 3
+    assert client.stats.retries == 2
+    assert no_backoff == [0, 1]     # exponential backoff by attempt number
+
+
+def test_gives_up_after_retries(mock_server, make_client, no_backoff):
+    faults = Faults(fail_first=10)
+    client = make_client(mock_server(faults), retries=2)
+
+    with pytest.raises(GeminiError) as exc:
+        client.generate("hello", timeout=10)
+    assert exc.value.status == 503 and exc.value.retryable
+    assert faults.requests == 3
+
+
+def test_does_not_retry_client_errors(mock_server, make_client, no_backoff):
+    faults = Faults(fail_first=1, error_status=400)
+    client = make_client(mock_server(faults), retries=3)
+
+    with pytest.raises(GeminiError) as exc:
+        client.generate("hello", timeout=10)
+    assert exc.value.status == 400 and not exc.value.retryable
+    assert faults.requests == 1
+    assert client.breaker.state == "closed"
+
+
+def test_honours_retry_after(mock_server, make_client):
+    faults = Faults(fail_first=1, retry_after=0.4)
+    client = make_client(mock_server(faults), retries=1)
+
+    t0 = time.monotonic()
+    client.generate("hello", timeout=10)
+    assert time.monotonic() - t0 >= 0.4
+
+
+def test_breaker_opens_then_half_opens(mock_server, make_client):
+    faults = Faults(fail_first=2)
+    client = make_client(mock_server(faults), retries=0, breaker=CircuitBreaker(failures=2, reset=0.3))
+
+    for _ in range(2):
+        with pytest.raises(GeminiError):
+            client.generate("hello", timeout=10)
+    assert client.breaker.state == "open"
+
+    # open: fails fast without reaching the server
+    with pytest.raises(CircuitOpenError):
+        client.generate("hello", timeout=10)
+    assert faults.requests == 2
+    assert client.stats.rejected == 1
+
+    # half-open: one trial call goes through, and its success closes the breaker
+    time.sleep(0.35)
+    assert client.breaker.state == "half-open"
+    assert client.generate("hello", timeout=10)
+    assert client.breaker.state == "closed"
+
+
+def test_failed_trial_reopens_breaker(mock_server, make_client):
+    faults = Faults(fail_first=3)
+    client = make_client(mock_server(faults), retries=0, breaker=CircuitBreaker(failures=2, reset=0.3))
+
+    for _ in range(2):
+        with pytest.raises(GeminiError):
+            client.generate("hello", timeout=10)
+    time.sleep(0.35)
+    with pytest.raises(GeminiError) as exc:
+        client.generate("hello", timeout=10)
+    assert not isinstance(exc.value, CircuitOpenError)
+    assert faults.requests == 3
+    assert client.breaker.state == "open"
+
+
+def test_hedges_a_slow_request(mock_server, make_client, monkeypatch):
+    monkeypatch.setattr(gemini_api, "HEDGE_MIN_DELAY", 0.1)
+    faults = Faults(slow_first=1, slow_seconds=3.0)
+    client = make_client(mock_server(faults), hedge=True)
+    for _ in range(gemini_api.HEDGE_MIN_SAMPLES):
+        client.latency.add(0.05)
+
+    t0 = time.monotonic()
+    assert "Mock answer to: hello" in client.generate("hello", timeout=10)
+    assert time.monotonic() - t0 < 2.0
+    assert client.stats.hedges == 1
+    assert client.stats.hedge_wins == 1
+
+
+def test_no_hedge_without_latency_history(mock_server, make_client):
+    client = make_client(mock_server(), hedge=True)
+
+    client.generate("hello", timeout=10)
+    assert client.stats.hedges == 0
+
+
+def test_slow_stream_counts_as_failure(mock_server, make_client):
+    client = make_client(mock_server(chunk_delay=0.2), retries=0, breaker=CircuitBreaker(failures=1, reset=30))
+
+    with pytest.raises(GeminiError) as exc:
+        "".join(client.stream("hello", timeout=0.5))
+    assert exc.value.retryable
+    assert client.stats.errors == 1
+    assert client.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        "".join(client.stream("hello", timeout=0.5))
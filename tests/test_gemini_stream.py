@@ -0,0 +1,23 @@
+from api_logic.gemini_api import _event_text
+
+
+def test_stream_decodes_utf8(mock_server, make_client):
+    client = make_client(mock_server())
+    name = "Mónika — Ստեփանյան"
+
+    text = "".join(client.stream(f"Schedule for {name}\nrest of the prompt"))
+
+    assert f"Mock answer to: Schedule for {name}" in text
+    assert "Ã" not in text
+
+
+def test_stream_matches_generate(mock_server, make_client):
+    client = make_client(mock_server())
+    prompt = "Կարգացուցակ, café"
+
+    assert "".join(client.stream(prompt)).strip() == client.generate(prompt)
+
+
+def test_event_text_joins_parts():
+    event = {"candidates": [{"content": {"parts": [{"text": "a"}, {"text": "ö"}]}}]}
+    assert _event_text(event) == "aö"
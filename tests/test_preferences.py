@@ -0,0 +1,35 @@
+import pytest
+
+from api_logic.preferences import parse_preferences
+from data.catalog import get_catalog
+
+WANTED = "👉 Are there any specific courses you’re hoping to take this semester?"
+DECLINED = ["No, thanks", "None in particular", "nothing specific", "Open to anything",
+            "No preference", "Not sure yet", "nope!"]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    try:
+        return get_catalog()
+    except FileNotFoundError:
+        pytest.skip("no course catalog")
+
+
+@pytest.mark.parametrize("answer", DECLINED)
+def test_declined_answer_requests_no_courses(catalog, answer):
+    prefs = parse_preferences({WANTED: answer}, catalog=catalog)
+
+    assert prefs.wanted_codes == set()
+
+
+def test_free_text_answer_resolves_courses(catalog):
+    prefs = parse_preferences({WANTED: "something on machine learning"}, catalog=catalog)
+
+    assert "CS340" in prefs.wanted_codes
+
+
+def test_explicit_code_is_kept(catalog):
+    prefs = parse_preferences({WANTED: "CS340 please"}, catalog=catalog)
+
+    assert prefs.wanted_codes == {"CS340"}
@@ -0,0 +1,42 @@
+import pytest
+
+from api_logic.prompt_catalog import COURSE_FIELDS, VARIES, _csv_chars, serialize_sections
+from data.catalog import get_catalog
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    try:
+        return get_catalog()
+    except FileNotFoundError:
+        pytest.skip("no course catalog")
+
+
+def test_course_lines_keep_every_column(catalog):
+    text = serialize_sections(catalog, range(len(catalog.df)))
+    body = text.split("Courses:\n", 1)[1].splitlines()
+    course_lines = [line for line in body if not line.startswith("  ")]
+    n_fields = 1 + len([c for c in COURSE_FIELDS if c in catalog.df.columns])
+
+    assert course_lines
+    assert all(len(line.split(" | ")) == n_fields for line in course_lines)
+    assert any(f" | {VARIES}" in line for line in course_lines)
+
+
+def test_varying_field_is_given_per_section(catalog):
+    for cid in range(len(catalog.course_codes)):
+        rows = catalog.course_rows[catalog.course_index[cid]:catalog.course_index[cid + 1]]
+        if len(set(catalog.df["course_title"].iloc[rows])) > 1:
+            break
+    else:
+        pytest.skip("no course whose title differs per section")
+    text = serialize_sections(catalog, rows)
+    course_line = text.split("Courses:\n", 1)[1].splitlines()[0]
+    assert course_line.split(" | ")[1] == VARIES
+    assert "course_title=" in text
+
+
+def test_csv_size_estimate(catalog):
+    rows = list(range(0, len(catalog.df), 3))
+    actual = len(catalog.df.iloc[rows].to_csv(index=False))
+    assert abs(_csv_chars(catalog, rows) - actual) / actual < 0.05
@@ -0,0 +1,40 @@
+import pytest
+
+from data import catalog as catalog_module
+from data.catalog import get_catalog
+from data.prerequisites import PrerequisiteGraph
+from data.term_store import COURSES_CSV, available_terms, partition_path, prerequisites_path, write_partitions
+
+
+@pytest.fixture
+def store(tmp_path):
+    if not COURSES_CSV.exists():
+        pytest.skip("no courses.csv")
+    write_partitions(COURSES_CSV, tmp_path)
+    return tmp_path
+
+
+def test_partitions_get_their_prerequisite_graph(store):
+    for term in available_terms(store):
+        graph = PrerequisiteGraph.load(prerequisites_path(partition_path(term, store)))
+        assert graph.codes
+
+
+def test_catalog_uses_the_saved_graph(store, monkeypatch):
+    def no_build(*args, **kwargs):
+        raise AssertionError("prerequisite graph rebuilt from text")
+
+    monkeypatch.setattr(catalog_module.PrerequisiteGraph, "build", no_build)
+    path = partition_path(available_terms(store)[-1], store)
+    catalog = get_catalog(path)
+    assert catalog.prereqs.source_sha256 == catalog.sha256
+
+
+def test_stale_graph_is_rebuilt_and_saved(store):
+    path = partition_path(available_terms(store)[-1], store)
+    graph_path = prerequisites_path(path)
+    PrerequisiteGraph(source_sha256="stale").save(graph_path)
+
+    catalog = get_catalog(path)
+    assert catalog.prereqs.source_sha256 == catalog.sha256
+    assert PrerequisiteGraph.load(graph_path).source_sha256 == catalog.sha256
@@ -2,120 +2,13 @@
 
 
 import streamlit as st
-import re
-from datetime import datetime, timedelta
-from icalendar import Calendar, Event
-import pytz
-from database import get_schedule
-from api_logic.gemini_api import process_with_gemini
-
-def parse_schedule(text):
-    """
-    Parses the AI-generated schedule string into structured course data.
-
-    Args:
-        text (str): Schedule string containing course names, meeting days/times, and instructors.
-
-    Returns:
-        list: A list of dictionaries, each containing:
-            - name (str): Course name.
-            - sessions (list): List of tuples (day, time_range).
-            - instructor (str): Instructor's name.
-    """
-    courses = []
-    lines = text.strip().split('\n')
-
-    for line in lines:
-        if not line.strip():
-            continue  # Skip empty lines
-
-        # Match pattern: Course Name (MON 3:30pm-4:20pm, Instructor Name)
-        match = re.match(r'(.+?)\s\((.+?)\)', line)
-        if not match:
-            continue
-
-        name, details = match.groups()
-        parts = [p.strip() for p in details.split(',')]
-        
-        sessions = []
-        instructor = ""
-
-        for part in parts:
-            if re.match(r'^[A-Z]{3}', part):  # It's a day/time session
-                day, time = part.split(' ', 1)
-                sessions.append((day.upper(), time))
-            else:
-                instructor = part  # Remaining part is instructor
-
-        courses.append({
-            "name": name.strip(),
-            "sessions": sessions,
-            "instructor": instructor.strip()
-        })
-
-    return courses
-
-def time_str_to_datetime(time_str, day):
-    """
-    Converts a time range string and day abbreviation to datetime objects for the upcoming week.
-
-    Args:
-        time_str (str): Time range (e.g., '3:30pm-4:20pm').
-        day (str): Three-letter day abbreviation (e.g., 'MON').
-
-    Returns:
-        tuple: A tuple containing:
-            - start_datetime (datetime): Start time.
-            - end_datetime (datetime): End time.
-    """
-    day_map = {
-        'MON': 0, 'TUE': 1, 'WED': 2,
-        'THU': 3, 'FRI': 4, 'SAT': 5, 'SUN': 6
-    }
-
-    start_time, end_time = time_str.split('-')
-    dt_format = "%I:%M%p"
-    start_dt = datetime.strptime(start_time.strip().lower(), dt_format)
-    end_dt = datetime.strptime(end_time.strip().lower(), dt_format)
-
-    today = datetime.today()
-    # Calculate the next occurrence of the given day
-    start_date = today + timedelta(days=(day_map[day] - today.weekday()) % 7)
-    start_datetime = datetime.combine(start_date.date(), start_dt.time())
-    end_datetime = datetime.combine(start_date.date(), end_dt.time())
-
-    return start_datetime, end_datetime
-
-def create_ics_bytes(courses):
-    """
-    Creates an .ics calendar file in byte format from a list of structured courses.
-
-    Args:
-        courses (list): List of dictionaries with keys 'name', 'sessions', and 'instructor'.
-
-    Returns:
-        bytes: Byte representation of the calendar file (.ics format).
-    """
-    cal = Calendar()
-    cal.add('prodid', '-//University Course Planner//Gemini AI//')
-    cal.add('version', '2.0')
-
-    timezone = pytz.timezone('Asia/Yerevan')
-
-    for course in courses:
-        for day, time in course['sessions']:
-            start_dt, end_dt = time_str_to_datetime(time, day)
-
-            event = Event()
-            event.add('summary', course['name'])
-            event.add('description', f"Instructor: {course['instructor']}")
-            event.add('dtstart', timezone.localize(start_dt))
-            event.add('dtend', timezone.localize(end_dt))
-            event.add('rrule', {'freq': 'weekly'})
-            event.add('location', 'University Campus')
-            cal.add_component(event)
-
-    return cal.to_ical()
+import json
+from database import get_schedule_record, save_schedule_artifacts, schedule_hash
+from api_logic.gemini_api import GeminiError, process_with_gemini
+from api_logic.ics_export import schedule_ics
+from api_logic.schedule_parser import parse_schedule_text
+from api_logic.structured_schedule import calendar_courses, parse_schedule_json
+from data.catalog import get_catalog
 
 def final_view_page():
     st.title("🎓 Your Personalized Semester Plan is Ready!")
@@ -124,7 +17,7 @@ def final_view_page():
 
         Your custom semester schedule has been generated based on your preferences, degree requirements, and academic history.
         
-        Below you’ll find your recommended schedule—and a verified, regex‐friendly version to power the calendar export.
+        Below you’ll find your recommended schedule—and the course meetings that power the calendar export.
     """)
 
     uid = st.session_state.get("user_id")
@@ -132,8 +25,9 @@ def final_view_page():
         st.error("⚠️ Please sign in again.")
         return
 
-    # 1) Fetch the raw saved schedule from the DB
-    raw_schedule = get_schedule(uid) or ""
+    # 1) Fetch the saved schedule (and what was computed from it) from the DB
+    record = get_schedule_record(uid) or {}
+    raw_schedule = record.get("schedule_text") or ""
     if not raw_schedule.strip():
         st.error("No saved schedule found. Please generate one first.")
         if st.button("⬅️ Back to Generation"):
@@ -145,36 +39,37 @@ def final_view_page():
     st.markdown("### Original Schedule Text")
     st.markdown(f"<pre>{raw_schedule}</pre>", unsafe_allow_html=True)
 
-    # 3) Ask Gemini to reformat strictly for our regex parser
-    with st.spinner("🔍 Verifying & reformatting schedule…"):
-        verify_prompt = f"""
-You are a precise formatter. 
-Take the following schedule and output **only** lines in this exact pattern:
-
-Course Name (DAY TIME-RANGE, Instructor)
-
-- DAY must be a three-letter uppercase abbreviation (e.g. MON, TUE, WED, THU, FRI).
-- Keep each day of the class as a seperate record. Do not write for example MWF or TTH.
-- TIME-RANGE in 12-hour format with am/pm, e.g. 3:30pm-4:20pm.
-- Instructor name after the comma.
-- Do NOT add any extra text, numbering, or bullets—just one course per line.
-
-Schedule to reformat:
-{raw_schedule}
-"""
-        verified = process_with_gemini(verify_prompt).strip()
-
-    # 4) Display the Gemini‐verified version
-    st.markdown("### Reformatted Schedule (for parsing)")
-    st.code(verified)
-
-    # 5) Parse and build the .ics file
-    courses = parse_schedule(verified)
-    if not courses:
+    # 3) Course meetings and calendar: stored with this version of the schedule,
+    #    computed (and stored) once otherwise
+    content_hash = schedule_hash(raw_schedule)
+    if record.get("content_hash") == content_hash and record.get("schedule_ics"):
+        structured = json.loads(record["schedule_json"]) if record.get("schedule_json") else None
+        ics_bytes = bytes(record["schedule_ics"])
+    else:
+        structured, ics_bytes = schedule_artifacts(raw_schedule, record.get("schedule_json"))
+        if ics_bytes is None:
+            # Gemini only reformats what the local parser can't read
+            structured = _reformat_legacy_schedule(raw_schedule)
+            ics_bytes = _calendar(structured)
+        if ics_bytes is not None:
+            save_schedule_artifacts(record["id"], content_hash,
+                                    json.dumps(structured) if structured else None, ics_bytes)
+
+    if structured:
+        st.markdown("### Course Meetings")
+        st.table([
+            {
+                "Course": c["name"],
+                "Meetings": ", ".join(f"{day} {time}" for day, time in c["sessions"]),
+                "Instructor": c["instructor"],
+            }
+            for c in calendar_courses(structured)
+        ])
+
+    # 4) Offer the .ics file
+    if ics_bytes is None:
         st.error("Could not parse any courses—please check your schedule format.")
     else:
-        ics_bytes = create_ics_bytes(courses)
-
         st.markdown("---")
         st.download_button(
             label="📥 Import to Calendar",
@@ -183,7 +78,7 @@ Schedule to reformat:
             mime="text/calendar"
         )
 
-        # 6) Navigation
+        # 5) Navigation
     st.markdown("---")
     col1, _ = st.columns(2, gap="small")
 
@@ -192,3 +87,76 @@ Schedule to reformat:
             st.session_state.page = "session_choice"
             st.rerun()
 
+
+def schedule_artifacts(schedule_text, schedule=None):
+    """
+    The structured schedule and .ics bytes for a schedule, computed locally:
+    from `schedule` (dict or JSON text) when given, else parsed from the text.
+    Returns (None, None) if neither yields any course.
+    """
+    try:
+        structured = parse_schedule_json(schedule) if schedule else None
+    except ValueError:
+        structured = None
+    if not structured or not structured["courses"]:
+        try:
+            structured = parse_schedule_text(schedule_text, _catalog())
+        except ValueError:
+            return None, None
+    return structured, _calendar(structured)
+
+
+def _catalog():
+    try:
+        return get_catalog()
+    except FileNotFoundError:
+        return None
+
+
+def _calendar(structured):
+    """.ics bytes of a structured schedule for the catalog's term; None if it has no courses."""
+    if not structured or not structured["courses"]:
+        return None
+    try:
+        return schedule_ics(structured, _catalog())
+    except ValueError:
+        return None
+
+
+def _reformat_legacy_schedule(raw_schedule):
+    """
+    Schedules the local parser can't read: ask Gemini to reformat the text
+    into one line per meeting and parse that. Returns the structured
+    schedule ({} if it still can't be parsed), or None if Gemini could not
+    be reached (the error is shown).
+    """
+    with st.spinner("🔍 Verifying & reformatting schedule…"):
+        verify_prompt = f"""
+You are a precise formatter. 
+Take the following schedule and output **only** lines in this exact pattern:
+
+COURSE-CODE Course Name (DAY TIME-RANGE, Instructor)
+
+- COURSE-CODE as in the schedule, e.g. CS340.
+- DAY must be a three-letter uppercase abbreviation (e.g. MON, TUE, WED, THU, FRI).
+- Keep each day of the class as a seperate record. Do not write for example MWF or TTH.
+- TIME-RANGE in 12-hour format with am/pm, e.g. 3:30pm-4:20pm.
+- Instructor name after the comma.
+- Do NOT add any extra text, numbering, or bullets—just one course per line.
+
+Schedule to reformat:
+{raw_schedule}
+"""
+        try:
+            verified = process_with_gemini(verify_prompt).strip()
+        except GeminiError as exc:
+            st.error(f"Could not reformat the schedule right now. Please try again shortly. ({exc.message[:200]})")
+            return None
+
+    # Display the Gemini‐verified version
+    st.markdown("### Reformatted Schedule (for parsing)")
+    st.code(verified)
+    try:
+        return parse_schedule_text(verified, _catalog())
+    except ValueError:
+        return {}
@@ -1,16 +1,13 @@
 import io
-from pathlib import Path
 from typing import Dict
 
 import PyPDF2
 import streamlit as st
 
-from api_logic.gemini_api import process_pdf_with_gemini
+from api_logic.transcript_parser import extract_transcript_courses
+from data.requirements import get_program
 from database import save_transcript, save_preference, save_degree_requirements
 
-# Directory where degree requirement files are stored
-DEGREE_DIR = Path("data") / "Degree Requirements"
-
 # ──────────────────────────────
 # Utility: Extracts plain text from uploaded PDF
 # ──────────────────────────────
@@ -97,9 +94,9 @@ def _persist_all_answers(uid: str, answers: Dict[int, str]) -> None:
         txt = ans.strip() if ans else None
         save_preference(uid, QUESTIONS[idx], txt)
         if idx == 1 and txt:
-            fp = DEGREE_DIR / (txt.replace(" ", "_").replace("/", "_") + ".txt")
-            if fp.exists():
-                save_degree_requirements(uid, txt, fp.read_text("utf-8"))
+            program = get_program(txt)
+            if program:
+                save_degree_requirements(uid, txt, program.id)
 
 # ──────────────────────────────
 # Final review page after all questions
@@ -143,9 +140,9 @@ def review_page() -> None:
                             txt = s.answers.get(idx, "").strip() or None
                             save_preference(uid, QUESTIONS[idx], txt)
                             if idx == 1 and txt:
-                                fp = DEGREE_DIR / (txt.replace(" ", "_").replace("/", "_") + ".txt")
-                                if fp.exists():
-                                    save_degree_requirements(uid, txt, fp.read_text("utf-8"))
+                                program = get_program(txt)
+                                if program:
+                                    save_degree_requirements(uid, txt, program.id)
                     s.all_submitted = True
                     st.success("🎉 All saved!")
                     st.balloons()
@@ -203,7 +200,7 @@ def gemini_page() -> None:
             def _on_upload():
                 file = s.uploaded_file
                 if file:
-                    txt = process_pdf_with_gemini(extract_text_from_pdf(file))
+                    txt = extract_transcript_courses(extract_text_from_pdf(file))
                     if txt:
                         s.answers[0] = txt
                         st.success("✅ Transcript extracted.")
@@ -1,24 +1,83 @@
 # ─────────────────────────  views/gemini_answer.py  ─────────────────────────
 
+import json
 import streamlit as st
 import re
-import pandas as pd
-from pathlib import Path
 import time
 
+from api_logic.candidates import candidates_text
+from api_logic.gemini_api import GeminiError
+from api_logic.preferences import parse_preferences
+from data.catalog import codes_in_text, get_catalog
+
 # Database helpers
 from database import transcript_exists, fetch_all_preferences, get_schedule
 from views.generation import (
-    generate_schedule,
     get_transcript_text,
-    get_degree_requirements,
+    get_degree_audit,
+    get_degree_program,
     degree_requirements_exists,
+    generate_alternatives,
+    local_schedule,
+    requested_courses,
+    stream_schedule,
+    warn_blocked_requests,
 )
 
 # Constants and utilities
 from views.gemini import QUESTIONS
 from views.gemini import save_preference
 
+def _regeneration_inputs(uid: int) -> dict | None:
+    """Everything a (re)generation prompt needs for this user; None if the catalog is missing."""
+    # Shared course catalog (parsed once per process)
+    try:
+        catalog = get_catalog()
+    except FileNotFoundError:
+        return None
+
+    # Fetch user transcript, if available
+    tr_ok = transcript_exists(uid)
+    transcript_text = get_transcript_text(uid) if tr_ok else ""
+
+    # Fetch degree requirements, if uploaded
+    deg_ok = degree_requirements_exists(uid)
+    program = get_degree_program(uid) if deg_ok else None
+    degree_req = program.text if program else ""
+    audit = get_degree_audit(catalog, program, transcript_text)
+
+    # Load user preferences
+    rows = fetch_all_preferences(uid)
+    preferences = {
+        r["question"]: r.get("answer", "Not provided") for r in rows
+    }
+
+    # Only the sections the student can actually take go into the prompt
+    prefs = parse_preferences(preferences, catalog)
+    courses_text = candidates_text(
+        catalog,
+        codes_in_text(transcript_text),
+        prefs,
+        degree_req,
+    )
+    requested, blocked = requested_courses(catalog, transcript_text, prefs)
+
+    return {
+        "catalog": catalog,
+        "courses_text": courses_text,
+        "transcript_text": transcript_text,
+        "degree_req": degree_req,
+        "preferences": preferences,
+        "audit": audit,
+        "blocked": blocked,
+        "prompt_kwargs": {
+            "draft": local_schedule(catalog, transcript_text, degree_req, preferences, audit),
+            "progress": audit.summary() if audit else None,
+            "requested": requested,
+        },
+    }
+
+
 def gemini_answer_page() -> None:
     """
     Streamlit page: Displays the AI-generated personalized schedule,
@@ -27,7 +86,8 @@ def gemini_answer_page() -> None:
     Flow:
     1. Validates session and generated schedule.
     2. Displays the schedule broken down by day.
-    3. Provides options to regenerate, save, or go back.
+    3. Provides options to regenerate, save, or go back, and to compare
+       three alternatives generated concurrently.
     4. Offers additional input field for user comments/preferences.
     """
     st.title("✨ Your Personalized Schedule")
@@ -51,6 +111,7 @@ def gemini_answer_page() -> None:
 
     # 2) Display schedule broken out by weekday sections
     st.markdown("### Your Recommended Schedule")
+    warn_blocked_requests(st.session_state.get("blocked_requests") or {})
     st.markdown("""
     <style>
     .course-item {
@@ -81,6 +142,22 @@ def gemini_answer_page() -> None:
     if not found_any:
         st.markdown(schedule)
 
+    # 2b) Verify locally that the recommended sections don't overlap
+    try:
+        catalog = get_catalog()
+    except FileNotFoundError:
+        catalog = None
+    if catalog is not None:
+        clashes = catalog.schedule_conflicts(schedule)
+        if clashes:
+            st.warning(
+                "⚠️ Time conflicts detected:\n"
+                + "\n".join(
+                    f"* {catalog.describe_section(a)} overlaps {catalog.describe_section(b)}"
+                    for a, b in clashes
+                )
+            )
+
     # 3) Display notes, rationale, or explanation if included in the schedule
     notes_match = re.search(r"(?i)(notes|explanation|recommendations|rationale):(.*)", schedule, re.DOTALL)
     if notes_match:
@@ -91,6 +168,8 @@ def gemini_answer_page() -> None:
 
     # 4) Action buttons (Back, Regenerate, Save, View Final)
     col1, col2, col3, col4 = st.columns(4, gap="small")
+    # A regenerated schedule is streamed here, below the buttons
+    regen_area = st.container()
 
     # Go back to preferences input page
     with col1:
@@ -101,39 +180,39 @@ def gemini_answer_page() -> None:
     # Regenerate schedule in-place using current data
     with col2:
         if st.button("🔄 Regenerate Schedule"):
-            with st.spinner("🔮 Regenerating your schedule…"):
-                # Load course catalog CSV
-                courses_file = Path("data") / "courses.csv"
-                if not courses_file.exists():
-                    st.error("Courses catalog not found!")
+            with st.spinner("🔮 Preparing your data…"):
+                inputs = _regeneration_inputs(uid)
+            if inputs is None:
+                st.error("Courses catalog not found!")
+                return
+
+            # Re-run the AI schedule generator, showing its answer as it arrives
+            with regen_area:
+                warn_blocked_requests(inputs["blocked"])
+                st.markdown("### 🔮 Regenerating your schedule…")
+                try:
+                    stream = stream_schedule(
+                        inputs["courses_text"],
+                        inputs["transcript_text"],
+                        inputs["degree_req"],
+                        inputs["preferences"],
+                        get_schedule(uid),
+                        **inputs["prompt_kwargs"],
+                    )
+                    st.write_stream(stream)
+                except GeminiError as exc:
+                    # keep the current schedule; never store an error as one
+                    st.error(f"Gemini could not regenerate your schedule right now. Please try again "
+                             f"shortly. ({exc.message[:200]})")
+                    return
+                except ValueError as exc:
+                    st.error(f"Gemini returned a malformed schedule. Please try again. ({exc})")
                     return
-                courses_text = pd.read_csv(courses_file).to_csv(index=False)
-
-                # Fetch user transcript, if available
-                tr_ok = transcript_exists(uid)
-                transcript_text = get_transcript_text(uid) if tr_ok else ""
-
-                # Fetch degree requirements, if uploaded
-                deg_ok = degree_requirements_exists(uid)
-                degree_req = get_degree_requirements(uid) if deg_ok else ""
-
-                # Load user preferences
-                rows = fetch_all_preferences(uid)
-                preferences = {
-                    r["question"]: r.get("answer", "Not provided") for r in rows
-                }
-
-                # Re-run the AI schedule generator
-                new_schedule = generate_schedule(
-                    courses_text,
-                    transcript_text,
-                    degree_req,
-                    preferences,
-                    get_schedule(uid)
-                )
 
-                # Update session with regenerated schedule
-                st.session_state.generated_schedule = new_schedule
+            # Update session with regenerated schedule and its structured form
+            st.session_state.generated_schedule = stream.text
+            st.session_state.generated_schedule_json = stream.schedule
+            st.session_state.blocked_requests = inputs["blocked"]
 
             # Re-render page
             st.rerun()
@@ -145,7 +224,13 @@ def gemini_answer_page() -> None:
                 st.error("Nothing to save.")
             else:
                 from database import save_generated_schedule
-                ok = save_generated_schedule(uid, schedule)
+                from views.final_view import schedule_artifacts
+                # computed once here, so the final view only reads them back
+                structured, ics_bytes = schedule_artifacts(
+                    schedule, st.session_state.get("generated_schedule_json")
+                )
+                ok = save_generated_schedule(uid, schedule, json.dumps(structured) if structured else None,
+                                             ics_bytes)
                 if ok:
                     st.success("🎉 Schedule saved to your account!")
                 else:
@@ -157,6 +242,42 @@ def gemini_answer_page() -> None:
             st.session_state.page = "final_view"
             st.rerun()                
 
+    # 4b) Three alternatives, generated concurrently and ranked locally
+    with st.expander("🎲 Compare three alternatives"):
+        if st.button("Generate alternatives", key="gen_alternatives"):
+            with st.spinner("🎲 Generating three alternatives at once…"):
+                inputs = _regeneration_inputs(uid)
+                if inputs is None:
+                    st.error("Courses catalog not found!")
+                    return
+                st.session_state.alternatives = generate_alternatives(
+                    inputs["catalog"],
+                    inputs["courses_text"],
+                    inputs["transcript_text"],
+                    inputs["degree_req"],
+                    inputs["preferences"],
+                    inputs["audit"],
+                    prev_schedule=get_schedule(uid),
+                    **inputs["prompt_kwargs"],
+                )
+            if not st.session_state.alternatives:
+                st.error("No alternative could be generated. Please try again.")
+
+        alternatives = st.session_state.get("alternatives") or []
+        if alternatives:
+            tabs = st.tabs([
+                f"{'⭐ ' if n == 0 else ''}{label}" for n, (label, *_) in enumerate(alternatives)
+            ])
+            for n, (tab, (label, text, score, structured)) in enumerate(zip(tabs, alternatives)):
+                with tab:
+                    st.caption(f"Local score: {score:.1f}" + (" (best match)" if n == 0 else ""))
+                    st.markdown(text)
+                    if st.button("✅ Use this schedule", key=f"use_alternative_{n}"):
+                        st.session_state.generated_schedule = text
+                        st.session_state.generated_schedule_json = structured
+                        st.session_state.alternatives = []
+                        st.rerun()
+
     st.markdown("---")
 
     # 5) Allow user to submit additional comments or preferences
@@ -1,7 +1,20 @@
 # ──────────────────────────── views/generation.py ───────────────────────────
 import streamlit as st
-import pandas as pd
-from pathlib import Path
+from api_logic.candidates import blocked_requests, candidates_text
+from api_logic.gemini_api import GeminiError
+from api_logic.course_search import describe_courses
+from api_logic.degree_audit import DegreeAudit, degree_audit
+from api_logic.preferences import parse_preferences
+from api_logic.schedule_engine import format_schedule, score_schedule_text, solve
+from api_logic.structured_schedule import (
+    STRUCTURED_CONFIG,
+    ScheduleStream,
+    parse_schedule_json,
+    render_schedule,
+    schedule_from_sections,
+)
+from data.catalog import codes_in_text, get_catalog
+from data.requirements import Program, get_program
 from database import transcript_exists, fetch_all_preferences, get_db_connection
 from views.gemini import QUESTIONS
 
@@ -15,14 +28,20 @@ def degree_requirements_exists(user_id: int) -> bool:
         return cur.fetchone() is not None
 
 
-# Fetch the degree requirement text for a given user
-def get_degree_requirements(user_id: int) -> str:
-    sql = "SELECT requirements FROM degreqs WHERE user_id = %s LIMIT 1"
+# Fetch the user's program from the precompiled requirements index
+def get_degree_program(user_id: int) -> Program | None:
+    sql = "SELECT program_id FROM degreqs WHERE user_id = %s LIMIT 1"
     with get_db_connection() as conn:
         cur = conn.cursor(dictionary=True)
         cur.execute(sql, (user_id,))
         result = cur.fetchone()
-        return result["requirements"] if result else ""
+        return get_program(result["program_id"]) if result else None
+
+
+# Fetch the degree requirement text for a given user
+def get_degree_requirements(user_id: int) -> str:
+    program = get_degree_program(user_id)
+    return program.text if program else ""
 
 
 # Fetch the most recent transcript for the user
@@ -38,6 +57,83 @@ def get_transcript_text(user_id: int) -> str:
         return result["transcript"] if result else ""
 
 
+# Audit the user's program against their transcript (memoized per transcript)
+def get_degree_audit(catalog, program: Program | None, transcript_text: str) -> DegreeAudit | None:
+    if program is None:
+        return None
+    return degree_audit(program, codes_in_text(transcript_text), catalog)
+
+
+# Best conflict-free schedule from the local engine, in the Gemini answer format
+def local_schedule(catalog, transcript_text: str, degree_req: str, preferences: dict,
+                   audit: DegreeAudit | None = None) -> str:
+    options = solve(
+        catalog,
+        codes_in_text(transcript_text),
+        parse_preferences(preferences, catalog),
+        degree_req,
+        top_k=1,
+        audit=audit,
+    )
+    return format_schedule(catalog, options[0], degree_req) if options else ""
+
+
+# Variants of the Gemini prompt offered as alternatives: (label, extra instruction, temperature)
+ALTERNATIVES = (
+    ("Balanced", "", 0.4),
+    ("Degree progress first",
+     "For this version, prioritise the outstanding degree requirements over the other preferences.", 0.7),
+    ("Preferences first",
+     "For this version, prioritise the student's time and course preferences over the pace of degree "
+     "progress.", 0.9),
+)
+
+
+# The requested courses the student can take, described for the prompt, and the
+# ones they can't (code → reason)
+def requested_courses(catalog, transcript_text: str, prefs) -> tuple[str, dict[str, str]]:
+    blocked = blocked_requests(catalog, codes_in_text(transcript_text), prefs)
+    return describe_courses(catalog, sorted(prefs.wanted_codes - blocked.keys())), blocked
+
+
+# Tell the student which of their requested courses won't be scheduled, and why
+def warn_blocked_requests(blocked: dict[str, str]) -> None:
+    if blocked:
+        st.warning(
+            "Some of the courses you asked for can't be scheduled:\n"
+            + "\n".join(f"* {code}: {reason}" for code, reason in blocked.items())
+        )
+
+
+# Generate every alternative concurrently and rank them with the local engine's scores;
+# returns (label, text, score, structured schedule), best first
+def generate_alternatives(catalog, courses_data: str, transcript_text: str, degree_req: str, preferences: dict,
+                          audit: DegreeAudit | None = None, **prompt_kwargs) -> list[tuple[str, str, float, dict]]:
+    from api_logic.gemini_async import CandidateRequest, generate_candidates
+
+    prompt = build_schedule_prompt(courses_data, transcript_text, degree_req, preferences,
+                                   structured=True, **prompt_kwargs)
+    requests = [
+        CandidateRequest(prompt + (f"\n{extra}\n" if extra else ""),
+                         {**STRUCTURED_CONFIG, "temperature": temperature, "seed": n}, label)
+        for n, (label, extra, temperature) in enumerate(ALTERNATIVES)
+    ]
+    completed = codes_in_text(transcript_text)
+    prefs = parse_preferences(preferences, catalog)
+    ranked = []
+    for r in generate_candidates(requests):
+        if not r.ok:
+            continue
+        try:
+            schedule = parse_schedule_json(r.text)
+        except ValueError:
+            continue
+        text = render_schedule(schedule)
+        score = score_schedule_text(catalog, text, completed, prefs, degree_req, audit).score
+        ranked.append((r.label, text, score, schedule))
+    return sorted(ranked, key=lambda t: -t[2])
+
+
 # Main page function to display the generation screen
 def generation_page() -> None:
     uid = st.session_state.get("user_id")
@@ -72,7 +168,9 @@ def generation_page() -> None:
 
     # Navigation columns
     prev = st.session_state.get("prev_page", "gemini")
-    back_col, gen_col = st.columns([1, 1], gap="small")
+    back_col, gen_col, quick_col = st.columns([1, 1, 1], gap="small")
+    # Gemini's answer is streamed here, below the buttons, as it is generated
+    stream_area = st.container()
 
     # Back button logic
     with back_col:
@@ -83,45 +181,105 @@ def generation_page() -> None:
     # Generate button logic
     with gen_col:
         if st.button("🧙‍♂️ Generate my Schedule", key="gen_submit"):
-            with st.spinner("✨ Generating your personalized schedule..."):
-                try:
-                    # Step 1: Load courses.csv file
-                    courses_file = Path("data") / "courses.csv"
-                    if not courses_file.exists():
+            try:
+                with st.spinner("✨ Preparing your data..."):
+                    # Step 1: Get the shared course catalog (parsed once per process)
+                    try:
+                        catalog = get_catalog()
+                    except FileNotFoundError:
                         st.error("Courses data file not found!")
                         return
 
-                    courses_data = pd.read_csv(courses_file)
-                    courses_text = courses_data.to_csv(index=False)
-
                     # Step 2: Fetch transcript (if available)
                     transcript_text = get_transcript_text(uid) if tr_ok else ""
 
-                    # Step 3: Fetch degree requirements (if available)
-                    degree_req = get_degree_requirements(uid) if deg_ok else ""
+                    # Step 3: Fetch degree requirements (if available) and audit progress
+                    program = get_degree_program(uid) if deg_ok else None
+                    degree_req = program.text if program else ""
+                    audit = get_degree_audit(catalog, program, transcript_text)
 
                     # Step 4: Collect user preferences from the questionnaire
                     preferences = {row["question"]: row.get("answer", "Not provided") for row in rows}
 
-                    # Step 5: Generate schedule using Gemini
-                    schedule = generate_schedule(
-                        courses_text,
-                        transcript_text,
+                    # Only the sections the student can actually take go into the prompt;
+                    # free-text course wishes are resolved to codes locally
+                    prefs = parse_preferences(preferences, catalog)
+                    courses_text = candidates_text(
+                        catalog,
+                        codes_in_text(transcript_text),
+                        prefs,
                         degree_req,
-                        preferences
                     )
 
-                    # Step 6: Save schedule and go to next page
-                    st.session_state.generated_schedule = schedule
-                    st.session_state.page = "gemini_answer"
-                    st.rerun()
+                    requested, blocked = requested_courses(catalog, transcript_text, prefs)
 
-                except Exception as e:
-                    st.error(f"Error generating schedule: {e}")
+                    # Step 5: Solve a conflict-free draft locally
+                    draft = local_schedule(catalog, transcript_text, degree_req, preferences, audit)
+
+                # Step 6: Let Gemini polish the draft, showing its answer as it arrives
+                with stream_area:
+                    warn_blocked_requests(blocked)
+                    st.markdown("### ✨ Generating your personalized schedule...")
+                    stream = stream_schedule(
+                        courses_text,
+                        transcript_text,
+                        degree_req,
+                        preferences,
+                        draft=draft,
+                        progress=audit.summary() if audit else None,
+                        requested=requested,
+                    )
+                    st.write_stream(stream)
+
+                # Step 7: Keep the readable text and its structured form, go to next page
+                st.session_state.generated_schedule = stream.text
+                st.session_state.generated_schedule_json = stream.schedule
+                st.session_state.blocked_requests = blocked
+                st.session_state.page = "gemini_answer"
+                st.rerun()
+
+            except GeminiError as e:
+                # nothing is saved; the student can simply try again
+                st.error(f"Gemini could not generate a schedule right now. Please try again shortly. "
+                         f"({e.message[:200]})")
+            except ValueError as e:
+                st.error(f"Gemini returned a malformed schedule. Please try again. ({e})")
+            except Exception as e:
+                st.error(f"Error generating schedule: {e}")
+
+    # Instant schedule from the local engine (no Gemini call)
+    with quick_col:
+        if st.button("⚡ Instant Schedule", key="gen_quick"):
+            try:
+                catalog = get_catalog()
+            except FileNotFoundError:
+                st.error("Courses data file not found!")
+                return
+
+            transcript_text = get_transcript_text(uid) if tr_ok else ""
+            program = get_degree_program(uid) if deg_ok else None
+            degree_req = program.text if program else ""
+            audit = get_degree_audit(catalog, program, transcript_text)
+            preferences = {row["question"]: row.get("answer", "Not provided") for row in rows}
+
+            schedule = local_schedule(catalog, transcript_text, degree_req, preferences, audit)
+            if not schedule:
+                st.error("No conflict-free schedule matches your constraints. Try relaxing them.")
+                return
+            st.session_state.generated_schedule = schedule
+            st.session_state.generated_schedule_json = schedule_from_sections(
+                catalog, catalog.sections_in_text(schedule), degree_req
+            )
+            st.session_state.blocked_requests = requested_courses(
+                catalog, transcript_text, parse_preferences(preferences, catalog)
+            )[1]
+            st.session_state.page = "gemini_answer"
+            st.rerun()
 
 
-# Main function to build prompt and call Gemini API
-def generate_schedule(courses_data, transcript_text, degree_requirements, preferences, prev_schedule=None):
+# Main function to build the Gemini prompt
+def build_schedule_prompt(courses_data, transcript_text, degree_requirements, preferences, prev_schedule=None,
+                          draft=None, progress=None, requested=None, structured=False) -> str:
     """
     This function builds a comprehensive prompt using:
     - The available courses
@@ -129,10 +287,12 @@ def generate_schedule(courses_data, transcript_text, degree_requirements, prefer
     - Degree requirements
     - Student’s time/preferences
     - (Optionally) Previous schedule
-    It sends the prompt to Gemini and returns its response.
+    - (Optionally) A conflict-free draft from the local schedule engine
+    - (Optionally) The degree audit: which requirements are still outstanding
+    - (Optionally) Courses matched locally to the student's free-text wishes
+    With `structured`, the output instructions describe the JSON schedule
+    (used with STRUCTURED_CONFIG) instead of the bullet-text format.
     """
-    from api_logic.gemini_api import process_with_gemini
-
     # Prompt construction for Gemini
     prompt = f"""
 You are an expert academic advisor. Below is all the data you need.
@@ -154,7 +314,26 @@ STUDENT PREFERENCES:
     prompt += "\n"
 
     # Required format and strict instructions for Gemini output
-    prompt += f"""
+    if structured:
+        prompt += """
+IMPORTANT - ANSWER WITH THE JSON SCHEDULE OBJECT ONLY:
+* "courses": one entry per recommended course, using the catalog's code, title, section and instructor.
+  "days" lists the meeting days (MON, TUE, WED, THU, FRI); "start"/"end" are 12-hour times like 10:30am.
+  If a course meets at different times on different days, add one entry per time.
+  "category" is Core, General Education or Elective.
+* "factors": the factors you considered (degree requirements, time preferences, no conflicts, ...).
+* "notes": anything else the student should know, briefly.
+
+General guidelines:
+1. Don't recommend courses already taken.
+2. Prioritize degree requirements.
+3. Respect time preferences and constraints.
+4. Ensure no time conflicts.
+5. Pick one course per requirement and one section per course; no combined choices.
+6. Balance course load appropriately.
+"""
+    else:
+        prompt += f"""
 IMPORTANT - YOUR RESPONSE MUST FOLLOW THIS EXACT FORMAT:
 
 1. **Your Recommended Schedule**
@@ -186,10 +365,49 @@ General guidelines:
 8. Balance course load appropriately.
 """
 
+    # Degree progress is computed locally, so Gemini doesn't have to infer it
+    if progress:
+        prompt += (
+            "\nDEGREE PROGRESS (computed from the transcript; recommend courses for the "
+            "requirements that are still needed):\n"
+            f"{progress}\n"
+        )
+
+    # Courses the student asked for, already resolved against the catalog
+    if requested:
+        prompt += (
+            "\nREQUESTED COURSES (matched from the student's answer; include them "
+            "when they fit):\n"
+            f"{requested}\n"
+        )
+
+    # If the local engine found a verified draft, ask Gemini to start from it
+    if draft:
+        prompt += (
+            "\nA DRAFT schedule was computed locally. It is already conflict-free and "
+            "prerequisite-checked; keep its sections unless a preference clearly requires "
+            "a change, and explain the choices:\n"
+            f"{draft}\n"
+        )
+
     # If there's a previous schedule, ask Gemini to improve on it
     if prev_schedule:
         prompt += f"\nConsider following schedule provided by you.:\n{prev_schedule}\n"
         prompt += f"\nMake sure to follow user preferences to create a new schedule.\n"
 
-    # Call Gemini API with the constructed prompt
-    return process_with_gemini(prompt)
+    return prompt
+
+
+# Build the prompt and return Gemini's full answer
+# (raises GeminiError when no answer could be obtained)
+def generate_schedule(*args, **kwargs) -> str:
+    from api_logic.gemini_api import process_with_gemini
+    return process_with_gemini(build_schedule_prompt(*args, **kwargs))
+
+
+# Ask for the JSON schedule and render it as it is generated: iterate the returned
+# ScheduleStream (e.g. with st.write_stream), then read its .text and .schedule
+def stream_schedule(*args, **kwargs) -> ScheduleStream:
+    from api_logic.gemini_api import stream_with_gemini
+    prompt = build_schedule_prompt(*args, structured=True, **kwargs)
+    return ScheduleStream(stream_with_gemini(prompt, STRUCTURED_CONFIG))
@@ -1,8 +1,9 @@
 # ─────────────────────────  views/resume.py  ─────────────────────────
 import streamlit as st
 
-from api_logic.gemini_api import process_pdf_with_gemini
-from views.gemini         import extract_text_from_pdf, QUESTIONS, PROGRAM_OPTIONS, DEGREE_DIR
+from api_logic.transcript_parser import extract_transcript_courses
+from data.requirements     import get_program
+from views.gemini         import extract_text_from_pdf, QUESTIONS, PROGRAM_OPTIONS
 from database             import (
     transcript_exists,
     fetch_transcript,
@@ -64,7 +65,7 @@ def _transcript_block(uid: int):
         st.info("📋 Edit your transcript below (or upload new PDF):")
         uploaded = st.file_uploader("Replace with PDF (optional)", type="pdf", key="tr_replace_file")
         if uploaded:
-            txt = process_pdf_with_gemini(extract_text_from_pdf(uploaded))
+            txt = extract_transcript_courses(extract_text_from_pdf(uploaded))
             if txt:
                 s.edited_tr = txt
                 st.success("✅ PDF processed; you can edit further below.")
@@ -94,7 +95,7 @@ def _transcript_block(uid: int):
         st.info("📤 Upload your transcript PDF:")
         uploaded = st.file_uploader("Select PDF", type="pdf", key="tr_upload_file")
         if uploaded:
-            txt = process_pdf_with_gemini(extract_text_from_pdf(uploaded))
+            txt = extract_transcript_courses(extract_text_from_pdf(uploaded))
             if txt:
                 s.edited_tr = txt
                 st.success("✅ PDF processed; you can edit below.")
@@ -248,11 +249,9 @@ def resume_page() -> None:
             if prog_q in st.session_state.resume_dirty:
                 new_prog = st.session_state.resume_dirty.pop(prog_q)
                 save_preference(uid, prog_q, new_prog)
-                fp = DEGREE_DIR / (
-                    new_prog.replace(" ", "_").replace("/", "_") + ".txt"
-                )
-                if fp.exists():
-                    save_degree_requirements(uid, new_prog, fp.read_text("utf-8"))
+                program = get_program(new_prog)
+                if program:
+                    save_degree_requirements(uid, new_prog, program.id)
 
             # Save all other edited preferences
             for question, ans in st.session_state.resume_dirty.items():